@@ -10,21 +10,34 @@ Local-first monitoring web app for Clone runs.
 from __future__ import annotations
 
 import argparse
+import bisect
+import contextlib
+import ctypes
 import datetime as dt
+import fcntl
+import functools
+import gzip
+import heapq
 import json
 import os
+import queue
 import re
+import select
 import shutil
 import signal
+import sqlite3
+import struct
 import subprocess
 import sys
 import threading
 import time
-from collections import deque
-from dataclasses import dataclass
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 from urllib.parse import parse_qs, urlparse
 from urllib.request import Request, urlopen
 from urllib.error import HTTPError, URLError
@@ -33,6 +46,8 @@ from urllib.error import HTTPError, URLError
 RUN_STATUS_PATTERN = re.compile(r"run-(\d{8}-\d{6})-status\.txt$")
 CYCLE_PATTERN = re.compile(r"^--- Cycle (\d+) ---$")
 REPO_COUNT_PATTERN = re.compile(r"^Repo count: (\d+)$")
+PARALLEL_REPOS_PATTERN = re.compile(r"^Parallel repos: (\d+)$")
+PARALLEL_LIMIT_FIELD_PATTERN = re.compile(r"\bparallel_limit=(\d+)")
 REPO_FIELD_PATTERN = re.compile(r"\brepo=([^ ]+)")
 PASS_FIELD_PATTERN = re.compile(r"\bpass=([^ ]+)")
 PATH_FIELD_PATTERN = re.compile(r"\bpath=([^ ]+)")
@@ -44,6 +59,73 @@ CYCLE_QUEUE_PATTERN = re.compile(
 LOCK_SWEEP_PATTERN = re.compile(r"^LOCK_SWEEP cycle=(\d+) cleared=(\d+)$")
 NO_WORKERS_PATTERN = re.compile(r"^NO_WORKERS cycle=(\d+)$")
 COMMIT_LINE_PATTERN = re.compile(r"^\[[^\]]+ ([0-9a-f]{7,40})\] (.+)$")
+RUN_EVENTS_READ_BLOCK_BYTES = 1024 * 1024
+# Bump when RunSummary fields or event folding change so stale sidecars are ignored.
+RUN_SUMMARY_SIDECAR_VERSION = 2
+RUN_INDEX_FULL_RESCAN_SECONDS = 60
+PROCESS_TABLE_TTL_SECONDS = 1.0
+CONTROL_CHARS_PATTERN = re.compile(r"[\x00-\x1f\x7f]")
+PID_WAIT_FALLBACK_POLL_SECONDS = 0.05
+RESOURCE_SAMPLE_SECONDS = 5.0
+RESOURCE_SAMPLES_PER_WORKER = 360
+RESOURCE_HOST_SAMPLES = 720
+RESOURCE_RUNS_KEEP = 4
+CAPACITY_HISTORY_RUNS = 60
+CAPACITY_MIN_RUN_SECONDS = 600
+CAPACITY_LOCK_RATIO_HIGH = 0.35
+CAPACITY_CPU_TARGET = 0.85
+CAPACITY_CACHE_SECONDS = 30
+AGENT_PARALLELISM_MIN_CYCLES = 3
+AGENT_IDLE_HOST_CPU_PERCENT = 50.0
+AGENT_IDLE_WORKER_CPU_PERCENT = 25.0
+CONTROL_JOBS_KEEP = 50
+RUN_INDEX_COLD_SECONDS = 3600
+RUN_FILE_PATTERN = re.compile(r"^run-(\d{8}-\d{6})(?:-status\.txt|-events\.log|\.log)$")
+FS_WATCH_DEBOUNCE_SECONDS = 0.25
+FS_WATCH_POLL_SECONDS = 2.0
+TAIL_READ_BLOCK_BYTES = 64 * 1024
+STREAM_REFRESH_ONLINE_SECONDS = 30
+STREAM_REFRESH_IDLE_SECONDS = 300
+COMMIT_INDEX_WINDOW_SECONDS = 30 * 24 * 3600
+COMMIT_INDEX_GIT_TIMEOUT_SECONDS = 60
+GIT_TIMEOUT_SECONDS = 20
+GIT_RESULT_CACHE_ENTRIES = 4096
+LOCAL_REPO_INDEX_MAX_AGE_SECONDS = 60
+TASK_CHANGE_LOG_LIMIT = 20000
+TASK_LEASE_DEFAULT_SECONDS = 900
+TASK_LEASE_MAX_SECONDS = 24 * 3600
+TASK_BULK_MAX_ITEMS = 5000
+TASK_ARCHIVE_TERMINAL_STATUSES = ("DONE", "CANCELED")
+TASK_ARCHIVE_DEFAULT_DAYS = 7
+TASK_ARCHIVE_CHECK_SECONDS = 300
+TASK_BULK_MAX_BODY_BYTES = 16 * 1024 * 1024
+TASK_BULK_PATHS = {
+    "/api/v1/tasks/bulk",
+    "/api/v1/tasks/bulk-update",
+    "/api/task_queue/add_bulk",
+    "/api/task_queue/update_bulk",
+}
+LOCAL_REPO_INDEX_MAX_REPOS = 50000
+SCAN_IGNORED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        ".next",
+        ".cache",
+        "__pycache__",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".venv",
+        "venv",
+        "dist",
+        "build",
+        "target",
+        ".idea",
+        ".vscode",
+    }
+)
 SEVERITY_RANK = {
     "ok": 0,
     "info": 1,
@@ -110,6 +192,24 @@ def read_key_value_file(path: Path) -> dict[str, str]:
     return data
 
 
+def file_stamp(path: Path) -> tuple[int, int]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return (0, -1)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def file_identity_stamp(path: Path) -> tuple[int, int, int]:
+    # Like file_stamp, plus the inode: writers that replace a file via rename can land a
+    # new file with the same mtime and size inside one timestamp tick.
+    try:
+        stat = path.stat()
+    except OSError:
+        return (0, -1, 0)
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
 def safe_int(value: Any, default: int = 0) -> int:
     try:
         return int(value)
@@ -117,6 +217,13 @@ def safe_int(value: Any, default: int = 0) -> int:
         return default
 
 
+def safe_float(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
 def to_bool(value: Any) -> bool:
     if isinstance(value, bool):
         return value
@@ -203,11 +310,30 @@ def with_effective_run_fields(run: dict[str, Any] | None) -> dict[str, Any] | No
 def tail_lines(path: Path, limit: int) -> list[str]:
     if not path.exists() or limit <= 0:
         return []
-    window = deque(maxlen=limit)
-    with path.open("r", encoding="utf-8", errors="replace") as handle:
-        for line in handle:
-            window.append(line.rstrip("\n"))
-    return list(window)
+    chunks: list[bytes] = []
+    newlines = 0
+    try:
+        with path.open("rb") as handle:
+            position = handle.seek(0, os.SEEK_END)
+            # Read backwards until the window holds `limit` lines plus the boundary before them.
+            while position > 0 and newlines <= limit:
+                read_size = min(TAIL_READ_BLOCK_BYTES, position)
+                position -= read_size
+                handle.seek(position)
+                chunk = handle.read(read_size)
+                chunks.append(chunk)
+                newlines += chunk.count(b"\n")
+    except OSError:
+        return []
+    data = b"".join(reversed(chunks))
+    if position > 0:
+        # Drop the leading partial line. Cutting after b"\n" never splits a UTF-8 sequence.
+        data = data[data.index(b"\n") + 1 :]
+    text = data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    return lines[-limit:]
 
 
 def age_seconds(now: dt.datetime, value: str | None) -> int:
@@ -341,17 +467,329 @@ def resolve_default_code_root(clone_root: Path, repos_file: Path) -> Path:
     return (Path.home() / "code").resolve()
 
 
-def git_default_branch(repo_path: Path, fallback: str = "main") -> str:
-    try:
-        proc = subprocess.run(
-            ["git", "-C", str(repo_path), "symbolic-ref", "--short", "refs/remotes/origin/HEAD"],
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=20,
+class GitExecutor:
+    """Shared, bounded runner for git subprocesses used by cross-repo fan-outs."""
+
+    def __init__(self, max_workers: int | None = None, cache_entries: int = GIT_RESULT_CACHE_ENTRIES):
+        if max_workers is None:
+            max_workers = safe_int(os.environ.get("CLONE_GIT_CONCURRENCY"), 0)
+        if max_workers <= 0:
+            max_workers = min(16, os.cpu_count() or 4)
+        self.max_workers = max(1, max_workers)
+        self.cache_entries = max(0, cache_entries)
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+        self._cache_lock = threading.Lock()
+        self._cache: OrderedDict[tuple[str, tuple[str, ...]], tuple[str, subprocess.CompletedProcess[str]]] = OrderedDict()
+        self._stats = {"calls": 0, "timeouts": 0, "errors": 0, "cache_hits": 0}
+
+    def run(
+        self,
+        repo_path: Path,
+        *args: str,
+        timeout: float = GIT_TIMEOUT_SECONDS,
+        cache: bool = False,
+        input_text: str | None = None,
+    ) -> subprocess.CompletedProcess[str] | None:
+        """Run `git -C repo_path args...`; None on timeout or spawn failure.
+
+        With cache=True the result is reused until the repo's HEAD/refs move, so
+        only pass it for output that is a pure function of HEAD (absolute dates).
+        """
+        cache_key = (str(repo_path), tuple(args))
+        stamp = git_refs_stamp(repo_path) if cache and self.cache_entries and input_text is None else None
+        if stamp is not None:
+            with self._cache_lock:
+                cached = self._cache.get(cache_key)
+                if cached and cached[0] == stamp:
+                    self._cache.move_to_end(cache_key)
+                    self._stats["cache_hits"] += 1
+                    return cached[1]
+
+        with self._slots:
+            with self._cache_lock:
+                self._stats["calls"] += 1
+            try:
+                proc = subprocess.run(
+                    ["git", "-C", str(repo_path), *args],
+                    input=input_text,
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                    timeout=timeout,
+                )
+            except subprocess.TimeoutExpired:
+                with self._cache_lock:
+                    self._stats["timeouts"] += 1
+                return None
+            except OSError:
+                with self._cache_lock:
+                    self._stats["errors"] += 1
+                return None
+
+        if stamp is not None:
+            with self._cache_lock:
+                self._cache[cache_key] = (stamp, proc)
+                self._cache.move_to_end(cache_key)
+                while len(self._cache) > self.cache_entries:
+                    self._cache.popitem(last=False)
+        return proc
+
+    def map(self, fn: Callable[[Any], Any], items: list[Any]) -> list[Any]:
+        """Apply fn to items on the shared pool, preserving order."""
+        if len(items) <= 1 or getattr(self._local, "in_pool", False):
+            # Nested fan-outs run inline so pool workers never wait on each other.
+            return [fn(item) for item in items]
+        pool = self._ensure_pool()
+
+        def call(item: Any) -> Any:
+            self._local.in_pool = True
+            try:
+                return fn(item)
+            finally:
+                self._local.in_pool = False
+
+        return list(pool.map(call, items))
+
+    def _ensure_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="git")
+            return self._pool
+
+    def stats(self) -> dict[str, Any]:
+        with self._cache_lock:
+            return {
+                "max_workers": self.max_workers,
+                "cached_results": len(self._cache),
+                **self._stats,
+            }
+
+
+GIT_EXECUTOR = GitExecutor()
+
+
+@dataclass
+class ProcessInfo:
+    pid: int
+    pgid: int
+    etimes: int
+    command: str
+    ppid: int = 0
+
+
+class ProcessTable:
+    """Process table read from /proc (or one `ps` call elsewhere), shared for a short TTL.
+
+    Callers that poll for a process to disappear pass max_age=0.
+    """
+
+    def __init__(self, ttl_seconds: float = PROCESS_TABLE_TTL_SECONDS, proc_root: Path = Path("/proc")):
+        self.ttl_seconds = ttl_seconds
+        self.proc_root = proc_root
+        self.use_proc = (proc_root / "self" / "stat").exists()
+        self._lock = threading.Lock()
+        self._table: dict[int, ProcessInfo] = {}
+        self._loaded_at = -1.0
+        self._clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._stats = {"refreshes": 0, "cache_hits": 0, "single_reads": 0}
+
+    def processes(self, max_age: float | None = None) -> dict[int, ProcessInfo]:
+        age_limit = self.ttl_seconds if max_age is None else max_age
+        with self._lock:
+            if self._loaded_at >= 0 and time.monotonic() - self._loaded_at <= age_limit:
+                self._stats["cache_hits"] += 1
+                return self._table
+            table = self._read_proc() if self.use_proc else self._read_ps()
+            self._table = table
+            self._loaded_at = time.monotonic()
+            self._stats["refreshes"] += 1
+            return table
+
+    def get(self, pid: int, max_age: float | None = None) -> ProcessInfo | None:
+        if pid <= 0:
+            return None
+        info = self.processes(max_age).get(pid)
+        if info is not None:
+            return info
+        # Not in the cached table: the process may be newer than the snapshot.
+        with self._lock:
+            self._stats["single_reads"] += 1
+        if self.use_proc:
+            uptime = self._uptime()
+            return self._read_proc_pid(pid, uptime) if uptime is not None else None
+        return self._read_ps(pid).get(pid)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = -1.0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "source": "proc" if self.use_proc else "ps",
+                "ttl_seconds": self.ttl_seconds,
+                "processes": len(self._table),
+                **self._stats,
+            }
+
+    def _uptime(self) -> float | None:
+        try:
+            return float((self.proc_root / "uptime").read_text().split()[0])
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def _read_proc(self) -> dict[int, ProcessInfo]:
+        uptime = self._uptime()
+        if uptime is None:
+            return {}
+        table: dict[int, ProcessInfo] = {}
+        try:
+            names = os.listdir(self.proc_root)
+        except OSError:
+            return table
+        for name in names:
+            if not name.isdigit():
+                continue
+            info = self._read_proc_pid(int(name), uptime)
+            if info is not None:
+                table[info.pid] = info
+        return table
+
+    def _read_proc_pid(self, pid: int, uptime: float) -> ProcessInfo | None:
+        base = self.proc_root / str(pid)
+        try:
+            stat_text = (base / "stat").read_text(encoding="utf-8", errors="replace")
+            raw_cmdline = (base / "cmdline").read_bytes()
+        except OSError:
+            return None
+        # comm may contain spaces or parentheses; fields resume after the last ")".
+        comm_end = stat_text.rfind(")")
+        fields = stat_text[comm_end + 2 :].split()
+        if comm_end < 0 or len(fields) < 20:
+            return None
+        # Match `ps -o command=`: NUL-separated argv joined by spaces, control characters blanked.
+        command = CONTROL_CHARS_PATTERN.sub(" ", raw_cmdline.rstrip(b"\0").decode("utf-8", errors="replace"))
+        if not command:
+            command = f"[{stat_text[stat_text.find('(') + 1 : comm_end]}]"
+        start_seconds = safe_int(fields[19], 0) / max(1, self._clock_ticks)
+        return ProcessInfo(
+            pid=pid,
+            pgid=safe_int(fields[2], 0),
+            etimes=max(0, int(uptime - start_seconds)),
+            command=command,
+            ppid=safe_int(fields[1], 0),
         )
-    except (OSError, subprocess.TimeoutExpired):
-        proc = None
+
+    def _read_ps(self, pid: int = 0) -> dict[int, ProcessInfo]:
+        columns = "pid=,ppid=,pgid=,etime=,command="
+        args = ["ps", "-o", columns, "-p", str(pid)] if pid else ["ps", "-axo", columns]
+        try:
+            proc = subprocess.run(args, capture_output=True, text=True, check=False)
+        except OSError:
+            return {}
+        if proc.returncode != 0:
+            return {}
+        table: dict[int, ProcessInfo] = {}
+        for line in proc.stdout.splitlines():
+            parts = line.strip().split(None, 4)
+            if len(parts) < 5:
+                continue
+            row_pid = safe_int(parts[0], 0)
+            if row_pid > 0:
+                table[row_pid] = ProcessInfo(
+                    pid=row_pid,
+                    pgid=safe_int(parts[2], 0),
+                    etimes=parse_etime_seconds(parts[3]),
+                    command=parts[4],
+                    ppid=safe_int(parts[1], 0),
+                )
+        return table
+
+
+PROCESS_TABLE = ProcessTable()
+
+
+def _pid_exited(pid: int) -> bool:
+    """True once pid is gone or a zombie; reaps it when it is our own child."""
+    try:
+        if os.waitpid(pid, os.WNOHANG)[0] == pid:
+            return True
+    except (ChildProcessError, OSError):
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    try:
+        stat_text = Path(f"/proc/{pid}/stat").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return False
+    return stat_text[stat_text.rfind(")") + 2 :][:1] == "Z"
+
+
+def wait_for_pids_exit(pids: list[int], timeout: float) -> list[int]:
+    """Block until every pid has exited or timeout passes; returns the pids still running.
+
+    Uses pidfds where available so the wait ends as soon as the last process exits.
+    Pids without a pidfd (older kernels, other platforms) are checked every
+    PID_WAIT_FALLBACK_POLL_SECONDS.
+    """
+    pending = {pid for pid in pids if pid > 0 and not _pid_exited(pid)}
+    if not pending:
+        return []
+    deadline = time.monotonic() + max(0.0, timeout)
+    pidfd_open = getattr(os, "pidfd_open", None)
+    poller = select.poll() if pidfd_open is not None and hasattr(select, "poll") else None
+    fds: dict[int, int] = {}
+    try:
+        if poller is not None:
+            for pid in list(pending):
+                try:
+                    fd = pidfd_open(pid)
+                except ProcessLookupError:
+                    pending.discard(pid)
+                    continue
+                except OSError:
+                    continue
+                fds[fd] = pid
+                poller.register(fd, select.POLLIN)
+        while pending:
+            polled = set(fds.values())
+            for pid in [pid for pid in pending if pid not in polled]:
+                if _pid_exited(pid):
+                    pending.discard(pid)
+            remaining = deadline - time.monotonic()
+            if not pending or remaining <= 0:
+                break
+            if len(polled) < len(pending):
+                remaining = min(remaining, PID_WAIT_FALLBACK_POLL_SECONDS)
+            if not fds:
+                time.sleep(remaining)
+                continue
+            for fd, _event in poller.poll(int(remaining * 1000) + 1):
+                pid = fds.pop(fd, 0)
+                poller.unregister(fd)
+                os.close(fd)
+                pending.discard(pid)
+                _pid_exited(pid)
+    finally:
+        for fd in fds:
+            os.close(fd)
+    PROCESS_TABLE.invalidate()
+    return sorted(pending)
+
+
+def git_default_branch(repo_path: Path, fallback: str = "main") -> str:
+    branch = git_default_branch_from_files(repo_path)
+    if branch is not None:
+        return branch or fallback
+
+    proc = GIT_EXECUTOR.run(repo_path, "symbolic-ref", "--short", "refs/remotes/origin/HEAD")
     if proc and proc.returncode == 0 and proc.stdout.strip():
         out = proc.stdout.strip()
         branch = out.split("/", 1)[1] if out.startswith("origin/") else out
@@ -359,16 +797,7 @@ def git_default_branch(repo_path: Path, fallback: str = "main") -> str:
         if branch:
             return branch
 
-    try:
-        proc = subprocess.run(
-            ["git", "-C", str(repo_path), "rev-parse", "--abbrev-ref", "HEAD"],
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=20,
-        )
-    except (OSError, subprocess.TimeoutExpired):
-        proc = None
+    proc = GIT_EXECUTOR.run(repo_path, "rev-parse", "--abbrev-ref", "HEAD")
     if proc and proc.returncode == 0:
         out = proc.stdout.strip()
         if out and out != "HEAD":
@@ -376,6 +805,128 @@ def git_default_branch(repo_path: Path, fallback: str = "main") -> str:
     return fallback
 
 
+def resolve_git_dirs(repo_path: Path) -> tuple[Path, Path] | None:
+    # (git_dir, common_dir); linked worktrees keep HEAD in git_dir and refs in common_dir.
+    dot_git = repo_path / ".git"
+    if dot_git.is_dir():
+        git_dir = dot_git
+    elif dot_git.is_file():
+        try:
+            text = dot_git.read_text(encoding="utf-8", errors="replace").strip()
+        except OSError:
+            return None
+        if not text.startswith("gitdir:"):
+            return None
+        git_dir = Path(text[len("gitdir:") :].strip())
+        if not git_dir.is_absolute():
+            git_dir = repo_path / git_dir
+        if not git_dir.is_dir():
+            return None
+    else:
+        return None
+
+    common_dir = git_dir
+    commondir_file = git_dir / "commondir"
+    if commondir_file.is_file():
+        try:
+            raw = commondir_file.read_text(encoding="utf-8", errors="replace").strip()
+        except OSError:
+            raw = ""
+        if raw:
+            candidate = Path(raw)
+            common_dir = candidate if candidate.is_absolute() else git_dir / candidate
+    return git_dir, common_dir
+
+
+def git_refs_stamp(repo_path: Path) -> str | None:
+    # Changes whenever HEAD moves: HEAD itself, the branch ref it points at, or packed-refs.
+    dirs = resolve_git_dirs(repo_path)
+    if dirs is None:
+        return None
+    git_dir, common_dir = dirs
+    head_path = git_dir / "HEAD"
+    try:
+        head_text = head_path.read_text(encoding="utf-8", errors="replace").strip()
+    except OSError:
+        return None
+    parts: list[Any] = [head_text, file_stamp(common_dir / "packed-refs")]
+    if head_text.startswith("ref:"):
+        ref_name = head_text[len("ref:") :].strip()
+        parts.append(file_stamp(common_dir / ref_name))
+    return json.dumps(parts)
+
+
+def read_git_symref(path: Path) -> str | None:
+    try:
+        text = path.read_text(encoding="utf-8", errors="replace").strip()
+    except OSError:
+        return None
+    if not text.startswith("ref:"):
+        return None
+    return text[len("ref:") :].strip() or None
+
+
+def git_ref_exists(common_dir: Path, ref_name: str) -> bool:
+    if common_dir.joinpath(ref_name).is_file():
+        return True
+    try:
+        with common_dir.joinpath("packed-refs").open("r", encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                if line.startswith(("#", "^")):
+                    continue
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref_name:
+                    return True
+    except OSError:
+        pass
+    return False
+
+
+def git_default_branch_from_files(repo_path: Path) -> str | None:
+    """Same answer as git_default_branch's git calls, read straight from .git.
+
+    Returns "" when git would not name a branch (detached or unborn HEAD) and
+    None when the layout is unusual enough that the git binary should decide.
+    """
+    dirs = resolve_git_dirs(repo_path)
+    if dirs is None:
+        return None
+    git_dir, common_dir = dirs
+    if common_dir.joinpath("reftable").is_dir():
+        return None
+
+    # `git symbolic-ref --short refs/remotes/origin/HEAD`
+    origin_head = common_dir / "refs" / "remotes" / "origin" / "HEAD"
+    if origin_head.is_symlink():
+        return None
+    if origin_head.is_file():
+        target = read_git_symref(origin_head)
+        if target:
+            for prefix in ("refs/remotes/", "refs/heads/"):
+                if target.startswith(prefix):
+                    short = target[len(prefix) :]
+                    break
+            else:
+                return None
+            branch = short.split("/", 1)[1] if short.startswith("origin/") else short
+            branch = branch.strip()
+            if branch:
+                return branch
+
+    # `git rev-parse --abbrev-ref HEAD`
+    head_path = git_dir / "HEAD"
+    if head_path.is_symlink() or not head_path.is_file():
+        return None
+    target = read_git_symref(head_path)
+    if target is None:
+        return ""
+    if not target.startswith("refs/heads/"):
+        return None
+    if not git_ref_exists(common_dir, target):
+        return ""
+    return target[len("refs/heads/") :]
+
+
 def discover_local_git_repos(
     code_root: Path,
     max_depth: int = 8,
@@ -383,24 +934,7 @@ def discover_local_git_repos(
     catalog_paths: set[str] | None = None,
     extra_ignored_dirs: set[str] | None = None,
 ) -> list[dict[str, Any]]:
-    ignored_dirs = {
-        ".git",
-        ".hg",
-        ".svn",
-        "node_modules",
-        ".next",
-        ".cache",
-        "__pycache__",
-        ".mypy_cache",
-        ".pytest_cache",
-        ".venv",
-        "venv",
-        "dist",
-        "build",
-        "target",
-        ".idea",
-        ".vscode",
-    }
+    ignored_dirs = set(SCAN_IGNORED_DIRS)
     ignored_dirs.update(extra_ignored_dirs or set())
     root_depth = len(code_root.parts)
     discovered: list[dict[str, Any]] = []
@@ -429,7 +963,7 @@ def discover_local_git_repos(
             {
                 "name": root_path.name or repo_path,
                 "path": repo_path,
-                "branch": git_default_branch(root_path, fallback="main"),
+                "branch": "",
                 "objective": "",
                 "in_catalog": repo_path in (catalog_paths or set()),
                 "source": "local_scan",
@@ -439,10 +973,213 @@ def discover_local_git_repos(
         if len(discovered) >= limit:
             break
 
+    branches = GIT_EXECUTOR.map(lambda item: git_default_branch(Path(item["path"]), fallback="main"), discovered)
+    for item, branch in zip(discovered, branches):
+        item["branch"] = branch
+
     discovered.sort(key=lambda item: str(item.get("name") or "").lower())
     return discovered
 
 
+class LocalRepoIndex:
+    """Persisted local repo scan, re-listing only directories whose mtime changed.
+
+    Each scope (code root, depth, ignore list) keeps {dir: [mtime_ns, is_repo,
+    children]}. A refresh stats every known directory but only lists the ones
+    whose mtime moved, which is where repos can appear or disappear.
+    """
+
+    def __init__(self, index_path: Path, max_age_seconds: int = LOCAL_REPO_INDEX_MAX_AGE_SECONDS):
+        self.index_path = index_path
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._scopes: dict[str, dict[str, Any]] | None = None
+        self._refreshing: dict[str, threading.Lock] = {}
+
+    @staticmethod
+    def _scope_key(code_root: Path, max_depth: int, ignored_dirs: set[str]) -> str:
+        return json.dumps([str(code_root), max_depth, sorted(ignored_dirs)])
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._scopes is None:
+            scopes: dict[str, dict[str, Any]] = {}
+            try:
+                payload = json.loads(self.index_path.read_text(encoding="utf-8", errors="replace"))
+            except (OSError, json.JSONDecodeError):
+                payload = {}
+            if isinstance(payload, dict) and isinstance(payload.get("scopes"), dict):
+                scopes = {key: value for key, value in payload["scopes"].items() if isinstance(value, dict)}
+            self._scopes = scopes
+        return self._scopes
+
+    def _save(self) -> None:
+        with self._lock:
+            payload = {"version": 1, "scopes": dict(self._load())}
+            text = json.dumps(payload, separators=(",", ":"))
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(text + "\n", encoding="utf-8")
+        tmp_path.replace(self.index_path)
+
+    def _scope_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._refreshing.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._refreshing[key] = lock
+            return lock
+
+    def refresh(
+        self,
+        code_root: Path,
+        max_depth: int = 8,
+        extra_ignored_dirs: set[str] | None = None,
+        full: bool = False,
+    ) -> dict[str, Any]:
+        ignored_dirs = set(SCAN_IGNORED_DIRS) | set(extra_ignored_dirs or set())
+        key = self._scope_key(code_root, max_depth, ignored_dirs)
+        with self._scope_lock(key):
+            started = time.time()
+            with self._lock:
+                previous = self._load().get(key) or {}
+            old_nodes: dict[str, list[Any]] = {} if full else dict(previous.get("nodes") or {})
+            nodes: dict[str, list[Any]] = {}
+            repo_dirs: list[str] = []
+            stats = {"dirs_seen": 0, "dirs_listed": 0}
+
+            def visit(path: str, depth: int) -> None:
+                try:
+                    mtime_ns = os.stat(path).st_mtime_ns
+                except OSError:
+                    return
+                stats["dirs_seen"] += 1
+                node = old_nodes.get(path)
+                if node and len(node) == 3 and node[0] == mtime_ns:
+                    is_repo, children = bool(node[1]), list(node[2])
+                else:
+                    stats["dirs_listed"] += 1
+                    is_repo, children = False, []
+                    try:
+                        with os.scandir(path) as entries:
+                            for entry in entries:
+                                try:
+                                    if not entry.is_dir():
+                                        continue
+                                    if entry.name == ".git":
+                                        is_repo = True
+                                    elif (
+                                        entry.name not in ignored_dirs
+                                        and not entry.name.startswith(".")
+                                        and not entry.is_symlink()
+                                    ):
+                                        children.append(entry.name)
+                                except OSError:
+                                    continue
+                    except OSError:
+                        return
+                nodes[path] = [mtime_ns, is_repo, children]
+                if is_repo:
+                    repo_dirs.append(path)
+                    return
+                if depth >= max_depth or len(repo_dirs) >= LOCAL_REPO_INDEX_MAX_REPOS:
+                    return
+                for name in children:
+                    visit(os.path.join(path, name), depth + 1)
+
+            if code_root.is_dir():
+                visit(str(code_root), 0)
+
+            repos: list[dict[str, Any]] = []
+            seen: set[str] = set()
+            for raw_path in repo_dirs:
+                repo_path = str(Path(raw_path).resolve())
+                if repo_path in seen:
+                    continue
+                seen.add(repo_path)
+                repos.append({"name": Path(raw_path).name or repo_path, "path": repo_path, "branch": ""})
+            branches = GIT_EXECUTOR.map(lambda item: git_default_branch(Path(item["path"]), fallback="main"), repos)
+            for item, branch in zip(repos, branches):
+                item["branch"] = branch
+            repos.sort(key=lambda item: str(item.get("name") or "").lower())
+
+            scope = {
+                "code_root": str(code_root),
+                "max_depth": max_depth,
+                "ignored_dirs": sorted(ignored_dirs),
+                "refreshed_at": iso_utc(utc_now()),
+                "refreshed_ts": time.time(),
+                "nodes": nodes,
+                "repos": repos,
+            }
+            with self._lock:
+                self._load()[key] = scope
+            try:
+                self._save()
+            except OSError:
+                pass
+            return {
+                "code_root": str(code_root),
+                "max_depth": max_depth,
+                "full": bool(full),
+                "refreshed_at": scope["refreshed_at"],
+                "duration_ms": max(0, int((time.time() - started) * 1000)),
+                "repo_count": len(repos),
+                **stats,
+            }
+
+    def repos(
+        self,
+        code_root: Path,
+        max_depth: int = 8,
+        limit: int = 10000,
+        catalog_paths: set[str] | None = None,
+        extra_ignored_dirs: set[str] | None = None,
+    ) -> tuple[list[dict[str, Any]], str]:
+        """Indexed repos for the scope plus the time they were indexed.
+
+        A missing scope is scanned inline; a stale one is served as-is while a
+        background refresh catches up.
+        """
+        ignored_dirs = set(SCAN_IGNORED_DIRS) | set(extra_ignored_dirs or set())
+        key = self._scope_key(code_root, max_depth, ignored_dirs)
+        with self._lock:
+            scope = self._load().get(key)
+        if scope is None:
+            self.refresh(code_root, max_depth=max_depth, extra_ignored_dirs=extra_ignored_dirs)
+            with self._lock:
+                scope = self._load().get(key) or {}
+        elif time.time() - float(scope.get("refreshed_ts") or 0) > self.max_age_seconds:
+            lock = self._scope_lock(key)
+            if not lock.locked():
+                threading.Thread(
+                    target=self._refresh_quietly,
+                    args=(code_root, max_depth, extra_ignored_dirs),
+                    daemon=True,
+                ).start()
+
+        catalog = catalog_paths or set()
+        repos = [
+            {
+                "name": item.get("name") or item.get("path"),
+                "path": item.get("path"),
+                "branch": item.get("branch") or "main",
+                "objective": "",
+                "in_catalog": str(item.get("path") or "") in catalog,
+                "source": "local_scan",
+            }
+            for item in scope.get("repos") or []
+            if isinstance(item, dict)
+        ]
+        return repos[: max(1, limit)], str(scope.get("refreshed_at") or "")
+
+    def _refresh_quietly(self, code_root: Path, max_depth: int, extra_ignored_dirs: set[str] | None) -> None:
+        try:
+            self.refresh(code_root, max_depth=max_depth, extra_ignored_dirs=extra_ignored_dirs)
+        except Exception as exc:  # noqa: BLE001
+            if os.environ.get("CLONE_CONTROL_PLANE_DEBUG"):
+                print(f"local repo index refresh failed: {exc}", file=sys.stderr)
+
+
 @dataclass
 class RunSummary:
     run_id: str
@@ -453,6 +1190,7 @@ class RunSummary:
     status_run_log: str
     status_events_log: str
     repo_count: int
+    parallel_repos: int
     first_ts: str | None
     last_ts: str | None
     duration_seconds: int
@@ -488,6 +1226,7 @@ class RunSummary:
             "status_run_log": self.status_run_log,
             "status_events_log": self.status_events_log,
             "repo_count": self.repo_count,
+            "parallel_repos": self.parallel_repos,
             "first_ts": self.first_ts,
             "last_ts": self.last_ts,
             "duration_seconds": self.duration_seconds,
@@ -511,229 +1250,893 @@ class RunSummary:
         }
 
 
+@dataclass
+class RunEventsAccumulator:
+    # Aggregate state folded from a run events log, resumable from `offset`.
+    file_id: tuple[int, int] = (0, 0)
+    offset: int = 0
+    events_seen: int = 0
+    first_ts: str | None = None
+    last_ts: str | None = None
+    repo_count: int = 0
+    parallel_repos: int = 0
+    cycles_seen: int = 0
+    latest_cycle: int = 0
+    repos_started: int = 0
+    repos_running: int = 0
+    repos_ended: int = 0
+    repos_no_change: int = 0
+    repos_skipped_lock: int = 0
+    spawned_workers: int = 0
+    latest_cycle_queue: dict[str, int] | None = None
+    latest_lock_sweep: dict[str, int] | None = None
+    no_workers_events: int = 0
+    latest_no_workers_cycle: int = 0
+    repo_states: dict[str, str] = field(default_factory=dict)
+    repo_names: set[str] = field(default_factory=set)
+    active_repo: str = ""
+    active_path: str = ""
+    active_pass: str = ""
+
+    def fold(self, event: dict[str, Any]) -> None:
+        if self.events_seen == 0:
+            self.first_ts = event.get("ts")
+        self.events_seen += 1
+        self.last_ts = event.get("ts")
+        message = str(event.get("message", ""))
+
+        any_repo_match = REPO_FIELD_PATTERN.search(message)
+        if any_repo_match:
+            self.repo_names.add(any_repo_match.group(1))
+
+        repo_count_match = REPO_COUNT_PATTERN.match(message)
+        if repo_count_match:
+            self.repo_count = max(self.repo_count, safe_int(repo_count_match.group(1), 0))
+            return
+
+        parallel_match = PARALLEL_REPOS_PATTERN.match(message)
+        if parallel_match:
+            self.parallel_repos = safe_int(parallel_match.group(1), 0)
+            return
+
+        cycle_match = CYCLE_PATTERN.match(message)
+        if cycle_match:
+            self.cycles_seen += 1
+            self.latest_cycle = max(self.latest_cycle, safe_int(cycle_match.group(1)))
+            return
+
+        if message.startswith("START repo="):
+            self.repos_started += 1
+            if any_repo_match:
+                self.active_repo = any_repo_match.group(1)
+                self.repo_states[self.active_repo] = "starting"
+            path_match = PATH_FIELD_PATTERN.search(message)
+            if path_match:
+                self.active_path = path_match.group(1)
+            return
+
+        if message.startswith("RUN repo="):
+            self.repos_running += 1
+            if any_repo_match:
+                self.active_repo = any_repo_match.group(1)
+                self.repo_states[self.active_repo] = "running"
+            cwd_match = CWD_FIELD_PATTERN.search(message)
+            if cwd_match:
+                self.active_path = cwd_match.group(1)
+            pass_match = PASS_FIELD_PATTERN.search(message)
+            if pass_match:
+                self.active_pass = pass_match.group(1)
+            return
+
+        if message.startswith("END repo="):
+            self.repos_ended += 1
+            if any_repo_match:
+                current = self.repo_states.get(any_repo_match.group(1))
+                if current != "no_change":
+                    self.repo_states[any_repo_match.group(1)] = "ended"
+            return
+
+        if message.startswith("NO_CHANGE repo="):
+            self.repos_no_change += 1
+            if any_repo_match:
+                self.repo_states[any_repo_match.group(1)] = "no_change"
+            return
+
+        if message.startswith("SPAWN cycle="):
+            self.spawned_workers += 1
+            if not self.parallel_repos:
+                limit_match = PARALLEL_LIMIT_FIELD_PATTERN.search(message)
+                if limit_match:
+                    self.parallel_repos = safe_int(limit_match.group(1), 0)
+            return
+
+        if message.startswith("SKIP repo="):
+            reason_match = REASON_FIELD_PATTERN.search(message)
+            reason = reason_match.group(1) if reason_match else "unknown"
+            if reason == "repo_lock_active":
+                self.repos_skipped_lock += 1
+            if any_repo_match:
+                self.repo_states[any_repo_match.group(1)] = f"skipped:{reason}"
+            return
+
+        queue_match = CYCLE_QUEUE_PATTERN.match(message)
+        if queue_match:
+            self.latest_cycle_queue = {
+                "cycle": safe_int(queue_match.group(1)),
+                "repos_seen": safe_int(queue_match.group(2)),
+                "spawned": safe_int(queue_match.group(3)),
+                "skipped_lock": safe_int(queue_match.group(4)),
+            }
+            return
+
+        sweep_match = LOCK_SWEEP_PATTERN.match(message)
+        if sweep_match:
+            self.latest_lock_sweep = {
+                "cycle": safe_int(sweep_match.group(1)),
+                "cleared": safe_int(sweep_match.group(2)),
+            }
+            return
+
+        no_workers_match = NO_WORKERS_PATTERN.match(message)
+        if no_workers_match:
+            self.no_workers_events += 1
+            self.latest_no_workers_cycle = max(self.latest_no_workers_cycle, safe_int(no_workers_match.group(1)))
+
+    def fold_chunk(self, chunk: bytes, at_eof: bool) -> int:
+        # Returns the number of bytes consumed. A trailing fragment without a newline is only
+        # consumed when it already decodes as a complete event; otherwise it is retried later.
+        consumed = 0
+        while consumed < len(chunk):
+            newline = chunk.find(b"\n", consumed)
+            if newline < 0:
+                fragment = chunk[consumed:]
+                payload = self._decode_line(fragment) if at_eof else None
+                if payload is None:
+                    break
+                self.fold(payload)
+                consumed = len(chunk)
+                break
+            payload = self._decode_line(chunk[consumed:newline])
+            if payload is not None:
+                self.fold(payload)
+            consumed = newline + 1
+        return consumed
+
+    @staticmethod
+    def _decode_line(raw: bytes) -> dict[str, Any] | None:
+        text = raw.decode("utf-8", errors="replace").strip()
+        if not text:
+            return None
+        try:
+            payload = json.loads(text)
+        except json.JSONDecodeError:
+            # Ignore partial line writes from active runs.
+            return None
+        return payload if isinstance(payload, dict) else None
+
+
+class CommitIndex:
+    """Per-repo commit history cached in SQLite, advanced from the last indexed HEAD."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.enabled = str(os.environ.get("CLONE_COMMIT_INDEX", "1")).strip().lower() not in {"0", "false", "off"}
+        self._lock = threading.Lock()
+        self._repo_locks: dict[str, threading.Lock] = {}
+        self._stamps: dict[str, str] = {}
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=10)
+        if not self._schema_ready:
+            with self._lock:
+                if not self._schema_ready:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(
+                        """
+                        CREATE TABLE IF NOT EXISTS commits (
+                            repo_path TEXT NOT NULL,
+                            hash TEXT NOT NULL,
+                            short_hash TEXT NOT NULL,
+                            ts INTEGER NOT NULL,
+                            subject TEXT NOT NULL,
+                            PRIMARY KEY (repo_path, hash)
+                        );
+                        CREATE INDEX IF NOT EXISTS commits_ts ON commits (ts);
+                        CREATE INDEX IF NOT EXISTS commits_repo_ts ON commits (repo_path, ts);
+                        CREATE TABLE IF NOT EXISTS repo_heads (
+                            repo_path TEXT PRIMARY KEY,
+                            head TEXT NOT NULL,
+                            refs_stamp TEXT NOT NULL,
+                            updated_at TEXT NOT NULL
+                        );
+                        """
+                    )
+                    self._schema_ready = True
+        return conn
+
+    def _repo_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._repo_locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._repo_locks[key] = lock
+            return lock
+
+    @staticmethod
+    def _git(repo_path: Path, *args: str) -> subprocess.CompletedProcess[str] | None:
+        return GIT_EXECUTOR.run(repo_path, *args, timeout=COMMIT_INDEX_GIT_TIMEOUT_SECONDS)
+
+    def covers(self, since_ts: int) -> bool:
+        return self.enabled and since_ts >= int(time.time()) - COMMIT_INDEX_WINDOW_SECONDS
+
+    def refresh(self, repo_path: Path) -> bool:
+        """Bring one repo up to date; False means the caller should query git directly."""
+        if not self.enabled:
+            return False
+        key = str(repo_path)
+        stamp = git_refs_stamp(repo_path)
+        if stamp is None:
+            return False
+        if self._stamps.get(key) == stamp:
+            return True
+
+        with self._repo_lock(key):
+            if self._stamps.get(key) == stamp:
+                return True
+            try:
+                conn = self._connect()
+            except sqlite3.Error:
+                return False
+            try:
+                row = conn.execute(
+                    "SELECT head, refs_stamp FROM repo_heads WHERE repo_path = ?", (key,)
+                ).fetchone()
+                if row and row[1] == stamp:
+                    self._stamps[key] = stamp
+                    return True
+
+                proc = self._git(repo_path, "rev-parse", "--verify", "--quiet", "HEAD")
+                if proc is None:
+                    return False
+                # Unborn branches have no HEAD commit yet; index them as empty.
+                head = proc.stdout.strip() if proc.returncode == 0 else ""
+                old_head = str(row[0]) if row else ""
+
+                if row and old_head == head:
+                    rev_args: list[str] | None = None
+                elif old_head and head and self._is_ancestor(repo_path, old_head, head):
+                    rev_args = [head, f"^{old_head}"]
+                else:
+                    # First sight or rewritten history: reindex the retention window.
+                    conn.execute("DELETE FROM commits WHERE repo_path = ?", (key,))
+                    since = dt.datetime.fromtimestamp(time.time() - COMMIT_INDEX_WINDOW_SECONDS, tz=dt.timezone.utc)
+                    rev_args = [head, f"--since={iso_utc(since)}"] if head else None
+
+                if rev_args:
+                    proc = self._git(repo_path, "log", "--pretty=format:%H%x09%h%x09%ct%x09%s", *rev_args)
+                    if proc is None or proc.returncode != 0:
+                        conn.rollback()
+                        return False
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO commits (repo_path, hash, short_hash, ts, subject) VALUES (?, ?, ?, ?, ?)",
+                        self._parse_log(key, proc.stdout),
+                    )
+                # Keep the table bounded to the window covers() promises.
+                conn.execute(
+                    "DELETE FROM commits WHERE repo_path = ? AND ts < ?",
+                    (key, int(time.time()) - COMMIT_INDEX_WINDOW_SECONDS),
+                )
+
+                conn.execute(
+                    """
+                    INSERT INTO repo_heads (repo_path, head, refs_stamp, updated_at) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(repo_path) DO UPDATE SET
+                        head = excluded.head, refs_stamp = excluded.refs_stamp, updated_at = excluded.updated_at
+                    """,
+                    (key, head, stamp, iso_utc(utc_now())),
+                )
+                conn.commit()
+            except sqlite3.Error:
+                return False
+            finally:
+                conn.close()
+            self._stamps[key] = stamp
+        return True
+
+    def _is_ancestor(self, repo_path: Path, old_head: str, head: str) -> bool:
+        proc = self._git(repo_path, "merge-base", "--is-ancestor", old_head, head)
+        return proc is not None and proc.returncode == 0
+
+    @staticmethod
+    def _parse_log(key: str, output: str) -> list[tuple[str, str, str, int, str]]:
+        rows: list[tuple[str, str, str, int, str]] = []
+        for line in output.splitlines():
+            parts = line.split("\t", 3)
+            if len(parts) != 4:
+                continue
+            full_hash, short_hash, ts_raw, subject = parts
+            ts = safe_int(ts_raw)
+            full_hash = full_hash.strip()
+            if not ts or not full_hash:
+                continue
+            rows.append((key, full_hash, short_hash.strip() or full_hash[:7], ts, subject.strip()))
+        return rows
+
+    def commits_since(
+        self, repo_paths: set[str], since_ts: int, limit: int
+    ) -> list[tuple[str, str, str, int, str]] | None:
+        """Newest-first (repo_path, hash, short_hash, ts, subject) rows, or None on DB errors."""
+        if not repo_paths or limit <= 0:
+            return []
+        try:
+            conn = self._connect()
+        except sqlite3.Error:
+            return None
+        rows: list[tuple[str, str, str, int, str]] = []
+        try:
+            if len(repo_paths) == 1:
+                cursor = conn.execute(
+                    "SELECT repo_path, hash, short_hash, ts, subject FROM commits "
+                    "WHERE repo_path = ? AND ts >= ? ORDER BY ts DESC LIMIT ?",
+                    (next(iter(repo_paths)), since_ts, limit),
+                )
+                rows = [tuple(row) for row in cursor]
+            else:
+                cursor = conn.execute(
+                    "SELECT repo_path, hash, short_hash, ts, subject FROM commits WHERE ts >= ? ORDER BY ts DESC",
+                    (since_ts,),
+                )
+                for row in cursor:
+                    if row[0] not in repo_paths:
+                        continue
+                    rows.append(tuple(row))
+                    if len(rows) >= limit:
+                        break
+        except sqlite3.Error:
+            return None
+        finally:
+            conn.close()
+        return rows
+
+
+class CommitPrefixIndex:
+    """Sorted full hashes for resolving short hashes that git reports as ambiguous."""
+
+    def __init__(self, full_hashes: list[str]):
+        # rev-list order is newest first; remember it so prefix ties go to the newest commit.
+        self._rank = {full_hash: rank for rank, full_hash in enumerate(full_hashes)}
+        self._sorted = sorted(self._rank)
+
+    def matches(self, prefix: str) -> list[str]:
+        found: list[str] = []
+        idx = bisect.bisect_left(self._sorted, prefix)
+        while idx < len(self._sorted) and self._sorted[idx].startswith(prefix):
+            found.append(self._sorted[idx])
+            idx += 1
+        return found
+
+    def lookup(self, prefix: str) -> str | None:
+        found = self.matches(prefix.lower())
+        if not found:
+            return None
+        return min(found, key=lambda full_hash: self._rank[full_hash])
+
+
+def approx_size(value: Any, _depth: int = 0) -> int:
+    """Rough deep size in bytes of JSON-like values and dataclasses (for cache accounting)."""
+    size = sys.getsizeof(value)
+    if _depth > 6:
+        return size
+    if isinstance(value, dict):
+        return size + sum(approx_size(k, _depth + 1) + approx_size(v, _depth + 1) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset, deque)):
+        return size + sum(approx_size(item, _depth + 1) for item in value)
+    if hasattr(value, "__dataclass_fields__"):
+        return size + approx_size(vars(value), _depth + 1)
+    return size
+
+
+class BoundedCache:
+    """Thread-safe LRU bounded by entry count and approximate bytes, with counters.
+
+    Values that share a `group` (e.g. a run id) replace each other, so keys that
+    embed file stamps do not pile up as logs grow.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        max_bytes: int = 0,
+        sizeof: Callable[[Any], int] | None = approx_size,
+    ):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        self._sizeof = sizeof
+        self._lock = threading.Lock()
+        self._items: OrderedDict[Any, tuple[Any, int, Any]] = OrderedDict()
+        self._groups: dict[Any, Any] = {}
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "stale_evictions": 0}
+
+    def get(self, key: Any, default: Any = None, fresh: Callable[[Any], bool] | None = None) -> Any:
+        """Return the cached value; entries failing `fresh` count as misses and are dropped."""
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and fresh is not None and not fresh(entry[0]):
+                self._remove(key)
+                self._stats["stale_evictions"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return default
+            self._items.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(self, key: Any, value: Any, group: Any = None) -> None:
+        size = self._sizeof(value) if self._sizeof else 0
+        with self._lock:
+            self._remove(key)
+            if group is not None:
+                stale_key = self._groups.get(group)
+                if stale_key is not None and stale_key != key and self._remove(stale_key):
+                    self._stats["stale_evictions"] += 1
+                self._groups[group] = key
+            self._items[key] = (value, size, group)
+            self._bytes += size
+            while len(self._items) > self.max_entries or (
+                self.max_bytes and self._bytes > self.max_bytes and len(self._items) > 1
+            ):
+                oldest = next(iter(self._items))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    def pop(self, key: Any) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._groups.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Any) -> bool:
+        # Caller holds self._lock.
+        entry = self._items.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[1]
+        if entry[2] is not None and self._groups.get(entry[2]) == key:
+            del self._groups[entry[2]]
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                **self._stats,
+            }
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: BaseException | None = None
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one in-progress computation."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[Any, _Flight] = {}
+        self._stats = {"calls": 0, "coalesced": 0}
+
+    def do(self, key: Any, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = _Flight()
+                self._flights[key] = flight
+                self._stats["calls"] += 1
+            else:
+                self._stats["coalesced"] += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = fn()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        return flight.result
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"in_flight": len(self._flights), **self._stats}
+
+
+class RunIndex:
+    """Run ids ordered by status file mtime (newest first), kept current cheaply.
+
+    The logs directory is only re-listed when its own mtime changes (a file was
+    added or removed). Between full re-stats (every RUN_INDEX_FULL_RESCAN_SECONDS)
+    only "hot" status files are stat'ed: runs without a summary sidecar whose
+    status changed within RUN_INDEX_COLD_SECONDS.
+    """
+
+    def __init__(self, logs_dir: Path):
+        self.logs_dir = logs_dir
+        self._lock = threading.Lock()
+        self._mtimes: dict[str, int] = {}
+        self._finished: set[str] = set()
+        self._order: list[tuple[int, str]] = []
+        self._dir_mtime_ns: int | None = None
+        self._full_scan_at = 0.0
+        # Set when a FileWatcher reports changes: only runs named in note_change are re-stat'ed.
+        self.watched = False
+        self._dirty: set[str] = set()
+
+    def _status_path(self, run_id: str) -> Path:
+        return self.logs_dir / f"run-{run_id}-status.txt"
+
+    def refresh(self) -> list[tuple[int, str]]:
+        """(status_mtime_ns, run_id) pairs, newest first."""
+        with self._lock:
+            try:
+                dir_mtime_ns = self.logs_dir.stat().st_mtime_ns
+            except OSError:
+                self._mtimes, self._finished, self._order, self._dir_mtime_ns = {}, set(), [], None
+                return []
+            now = time.monotonic()
+            full = now - self._full_scan_at >= RUN_INDEX_FULL_RESCAN_SECONDS
+            changed = False
+            if full or dir_mtime_ns != self._dir_mtime_ns:
+                try:
+                    names = os.listdir(self.logs_dir)
+                except OSError:
+                    names = []
+                run_ids: set[str] = set()
+                finished: set[str] = set()
+                for name in names:
+                    match = RUN_STATUS_PATTERN.search(name)
+                    if match:
+                        run_ids.add(match.group(1))
+                    elif name.startswith("run-") and name.endswith("-summary.json"):
+                        finished.add(name[4:-13])
+                for run_id in list(self._mtimes):
+                    if run_id not in run_ids:
+                        del self._mtimes[run_id]
+                        changed = True
+                for run_id in run_ids:
+                    if full or run_id not in self._mtimes:
+                        changed |= self._stat(run_id)
+                self._finished = finished & run_ids
+                self._dir_mtime_ns = dir_mtime_ns
+                if full:
+                    self._full_scan_at = now
+            # A re-list only stats new run ids; existing runs still need their dirty/hot re-stat.
+            if self.watched and not full:
+                for run_id in self._dirty:
+                    if run_id in self._mtimes:
+                        changed |= self._stat(run_id)
+            elif not full:
+                cold_before_ns = time.time_ns() - RUN_INDEX_COLD_SECONDS * 1_000_000_000
+                for run_id, mtime_ns in list(self._mtimes.items()):
+                    if run_id not in self._finished and mtime_ns >= cold_before_ns:
+                        changed |= self._stat(run_id)
+            self._dirty.clear()
+            if changed or len(self._order) != len(self._mtimes):
+                self._order = sorted(((mtime_ns, run_id) for run_id, mtime_ns in self._mtimes.items()), reverse=True)
+            return list(self._order)
+
+    def _stat(self, run_id: str) -> bool:
+        # Caller holds self._lock. Returns True if the entry changed.
+        try:
+            mtime_ns = self._status_path(run_id).stat().st_mtime_ns
+        except OSError:
+            return self._mtimes.pop(run_id, None) is not None
+        if self._mtimes.get(run_id) == mtime_ns:
+            return False
+        self._mtimes[run_id] = mtime_ns
+        return True
+
+    def note_change(self, run_id: str | None) -> None:
+        """Re-stat run_id on the next refresh; None forces a full rescan."""
+        with self._lock:
+            if run_id is None:
+                self._full_scan_at = 0.0
+            else:
+                self._dirty.add(run_id)
+
+    def mark_finished(self, run_id: str) -> None:
+        with self._lock:
+            if run_id in self._mtimes:
+                self._finished.add(run_id)
+
+
 class CloneMonitor:
     def __init__(self, clone_root: Path, repos_file: Path, logs_dir: Path):
         self.clone_root = clone_root
         self.repos_file = repos_file
         self.logs_dir = logs_dir
         self._cache_lock = threading.Lock()
-        self._run_summary_cache: dict[str, tuple[tuple[int, int], RunSummary]] = {}
+        # (run_id, status_mtime_ns, events_mtime_ns) -> RunSummary; one live key per run
+        self._run_summary_cache = BoundedCache("run_summaries", 2048, 16 * 1024 * 1024)
         self._repos_cache: tuple[int, list[dict[str, Any]]] | None = None
-        self._commit_cache: dict[tuple[int, int], tuple[float, list[dict[str, Any]]]] = {}
-        self._run_detailed_commits_cache: dict[tuple[str, int, int, int, int], list[dict[str, Any]]] = {}
+        # (hours, limit) -> (computed_at, commits)
+        self._commit_cache = BoundedCache("recent_commits", 64, 16 * 1024 * 1024)
+        # (run_id, status/events/run log/repos mtimes) -> commits; one live key per run
+        self._run_detailed_commits_cache = BoundedCache("run_commits", 256, 32 * 1024 * 1024)
+        self._run_events_lock = threading.Lock()
+        # Accumulators grow in place, so only their count is bounded.
+        self._run_events_state = BoundedCache("run_events", 256, sizeof=None)
+        self.single_flight = SingleFlight()
+        self.run_index = RunIndex(logs_dir)
+        # Bumped by the change watcher for inputs the stat fingerprint does not cover (git refs).
+        self.change_generation = 0
+        self.commit_index = CommitIndex(logs_dir / "control-plane-commits.db")
+        self.local_repo_index = LocalRepoIndex(logs_dir / "control-plane-local-repos.json")
+
+    def cache_stats(self) -> dict[str, Any]:
+        caches = [
+            self._run_summary_cache,
+            self._commit_cache,
+            self._run_detailed_commits_cache,
+            self._run_events_state,
+        ]
+        return {cache.name: cache.stats() for cache in caches}
 
     def _run_status_files(self) -> list[Path]:
-        status_files = list(self.logs_dir.glob("run-*-status.txt"))
-        status_files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-        return status_files
-
-    def _run_paths(self, run_id: str) -> tuple[Path, Path, Path]:
-        status_path = self.logs_dir / f"run-{run_id}-status.txt"
-        events_path = self.logs_dir / f"run-{run_id}-events.log"
-        run_log_path = self.logs_dir / f"run-{run_id}.log"
-        return status_path, events_path, run_log_path
-
-    def _load_events(self, path: Path) -> list[dict[str, Any]]:
-        if not path.exists():
-            return []
-        events: list[dict[str, Any]] = []
-        with path.open("r", encoding="utf-8", errors="replace") as handle:
-            for line in handle:
-                text = line.strip()
-                if not text:
-                    continue
-                try:
-                    payload = json.loads(text)
-                except json.JSONDecodeError:
-                    # Ignore partial line writes from active runs.
-                    continue
-                if isinstance(payload, dict):
-                    events.append(payload)
-        return events
-
-    def _summarize_run(self, run_id: str) -> RunSummary:
-        status_path, events_path, _ = self._run_paths(run_id)
-        status_mtime_ns = status_path.stat().st_mtime_ns if status_path.exists() else 0
-        events_mtime_ns = events_path.stat().st_mtime_ns if events_path.exists() else 0
-        cache_key = (status_mtime_ns, events_mtime_ns)
-
-        with self._cache_lock:
-            cached = self._run_summary_cache.get(run_id)
-            if cached and cached[0] == cache_key:
-                return cached[1]
-
-        status_data = read_key_value_file(status_path)
-        run_pid = safe_int(status_data.get("pid"), 0)
-        state = status_data.get("state", "unknown")
-        updated_at = status_data.get("updated_at", "")
-        status_run_log = status_data.get("run_log", "")
-        status_events_log = status_data.get("events_log", "")
-        events = self._load_events(events_path)
-
-        first_ts = events[0].get("ts") if events else None
-        last_ts = events[-1].get("ts") if events else None
-        first_dt = parse_iso(first_ts)
-        last_dt = parse_iso(last_ts)
-        duration_seconds = 0
-        if first_dt and last_dt:
-            duration_seconds = max(0, int((last_dt - first_dt).total_seconds()))
-
-        cycles_seen = 0
-        latest_cycle = 0
-        repo_count = safe_int(status_data.get("repo_count"), 0)
-        repos_started = 0
-        repos_running = 0
-        repos_ended = 0
-        repos_no_change = 0
-        repos_skipped_lock = 0
-        spawned_workers = 0
-        latest_cycle_queue: dict[str, int] | None = None
-        latest_lock_sweep: dict[str, int] | None = None
-        no_workers_events = 0
-        latest_no_workers_cycle = 0
-        repo_states: dict[str, str] = {}
-        active_repo = str(status_data.get("repo") or "")
-        active_path = str(status_data.get("path") or "")
-        active_pass = str(status_data.get("pass") or "")
-
-        for event in events:
-            message = str(event.get("message", ""))
-
-            repo_count_match = REPO_COUNT_PATTERN.match(message)
-            if repo_count_match:
-                repo_count = max(repo_count, safe_int(repo_count_match.group(1), 0))
-                continue
+        return [self.logs_dir / f"run-{run_id}-status.txt" for _, run_id in self.run_index.refresh()]
+
+    def change_fingerprint(self) -> dict[str, Any]:
+        # Cheap stat-only view of everything a snapshot is derived from on disk.
+        status_files = self._run_status_files()
+        latest_stamp: tuple[Any, ...] = ()
+        run_online = False
+        if status_files:
+            match = RUN_STATUS_PATTERN.search(status_files[0].name)
+            if match:
+                run_id = match.group(1)
+                latest_stamp = (run_id, *(file_stamp(path) for path in self._run_paths(run_id)))
+                status_data = read_key_value_file(status_files[0])
+                run_online = run_is_online(status_data.get("state"), pid=status_data.get("pid"))
+        return {
+            "stamp": (len(status_files), latest_stamp, file_stamp(self.repos_file), run_online, self.change_generation),
+            "run_online": run_online,
+        }
 
-            cycle_match = CYCLE_PATTERN.match(message)
-            if cycle_match:
-                cycles_seen += 1
-                latest_cycle = max(latest_cycle, safe_int(cycle_match.group(1)))
-                continue
+    def _run_summary_sidecar_path(self, run_id: str) -> Path:
+        return self.logs_dir / f"run-{run_id}-summary.json"
 
-            if message.startswith("START repo="):
-                repos_started += 1
-                repo_match = REPO_FIELD_PATTERN.search(message)
-                if repo_match:
-                    active_repo = repo_match.group(1)
-                    repo_states[active_repo] = "starting"
-                path_match = PATH_FIELD_PATTERN.search(message)
-                if path_match:
-                    active_path = path_match.group(1)
-                continue
+    def _load_run_summary_sidecar(self, run_id: str, stamps: list[list[int]]) -> RunSummary | None:
+        path = self._run_summary_sidecar_path(run_id)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(payload, dict):
+            return None
+        if payload.get("parser_version") != RUN_SUMMARY_SIDECAR_VERSION or payload.get("sources") != stamps:
+            return None
+        fields = payload.get("summary")
+        if not isinstance(fields, dict) or set(fields) != set(RunSummary.__dataclass_fields__):
+            return None
+        try:
+            return RunSummary(**fields)
+        except TypeError:
+            return None
 
-            if message.startswith("RUN repo="):
-                repos_running += 1
-                repo_match = REPO_FIELD_PATTERN.search(message)
-                if repo_match:
-                    active_repo = repo_match.group(1)
-                    repo_states[active_repo] = "running"
-                cwd_match = CWD_FIELD_PATTERN.search(message)
-                if cwd_match:
-                    active_path = cwd_match.group(1)
-                pass_match = PASS_FIELD_PATTERN.search(message)
-                if pass_match:
-                    active_pass = pass_match.group(1)
-                continue
+    def _write_run_summary_sidecar(self, summary: RunSummary, stamps: list[list[int]]) -> None:
+        payload = {
+            "parser_version": RUN_SUMMARY_SIDECAR_VERSION,
+            "sources": stamps,
+            "written_at": iso_utc(utc_now()),
+            "summary": vars(summary),
+        }
+        path = self._run_summary_sidecar_path(summary.run_id)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(json.dumps(payload, sort_keys=True) + "\n", encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError:
+            pass
 
-            if message.startswith("END repo="):
-                repos_ended += 1
-                repo_match = REPO_FIELD_PATTERN.search(message)
-                if repo_match:
-                    current = repo_states.get(repo_match.group(1))
-                    if current != "no_change":
-                        repo_states[repo_match.group(1)] = "ended"
-                continue
+    def _run_paths(self, run_id: str) -> tuple[Path, Path, Path]:
+        status_path = self.logs_dir / f"run-{run_id}-status.txt"
+        events_path = self.logs_dir / f"run-{run_id}-events.log"
+        run_log_path = self.logs_dir / f"run-{run_id}.log"
+        return status_path, events_path, run_log_path
 
-            if message.startswith("NO_CHANGE repo="):
-                repos_no_change += 1
-                repo_match = REPO_FIELD_PATTERN.search(message)
-                if repo_match:
-                    repo_states[repo_match.group(1)] = "no_change"
-                continue
+    def _fold_run_events(self, run_id: str, events_path: Path) -> RunEventsAccumulator:
+        # Caller must hold _run_events_lock. Only bytes appended since the last call are parsed.
+        try:
+            stat = events_path.stat()
+        except OSError:
+            self._run_events_state.pop(run_id)
+            return RunEventsAccumulator()
+
+        file_id = (stat.st_dev, stat.st_ino)
+        state = self._run_events_state.get(run_id)
+        if state is None or state.file_id != file_id or stat.st_size < state.offset:
+            # First read, rotation or truncation: rebuild from the start of the file.
+            state = RunEventsAccumulator(file_id=file_id)
+            self._run_events_state.put(run_id, state)
+        if stat.st_size == state.offset:
+            return state
 
-            if message.startswith("SPAWN cycle="):
-                spawned_workers += 1
-                continue
+        try:
+            with events_path.open("rb") as handle:
+                handle.seek(state.offset)
+                pending = b""
+                while True:
+                    block = handle.read(RUN_EVENTS_READ_BLOCK_BYTES)
+                    at_eof = not block
+                    data = pending + block
+                    if not data:
+                        break
+                    consumed = state.fold_chunk(data, at_eof=at_eof)
+                    state.offset += consumed
+                    pending = data[consumed:]
+                    if at_eof:
+                        break
+        except OSError:
+            self._run_events_state.pop(run_id)
+            return RunEventsAccumulator()
+        return state
 
-            if message.startswith("SKIP repo="):
-                repo_match = REPO_FIELD_PATTERN.search(message)
-                reason_match = REASON_FIELD_PATTERN.search(message)
-                reason = reason_match.group(1) if reason_match else "unknown"
-                if reason == "repo_lock_active":
-                    repos_skipped_lock += 1
-                if repo_match:
-                    repo_states[repo_match.group(1)] = f"skipped:{reason}"
-                continue
+    def _summarize_run(self, run_id: str) -> RunSummary:
+        return self.single_flight.do(("summary", run_id), lambda: self._summarize_run_once(run_id))
 
-            queue_match = CYCLE_QUEUE_PATTERN.match(message)
-            if queue_match:
-                latest_cycle_queue = {
-                    "cycle": safe_int(queue_match.group(1)),
-                    "repos_seen": safe_int(queue_match.group(2)),
-                    "spawned": safe_int(queue_match.group(3)),
-                    "skipped_lock": safe_int(queue_match.group(4)),
-                }
-                continue
+    def _summarize_run_once(self, run_id: str) -> RunSummary:
+        status_path, events_path, _ = self._run_paths(run_id)
+        status_stamp = file_stamp(status_path)
+        events_stamp = file_stamp(events_path)
+        status_mtime_ns = status_stamp[0]
+        events_mtime_ns = events_stamp[0]
+        cache_key = (run_id, status_mtime_ns, events_mtime_ns)
+
+        cached = self._run_summary_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Finished runs keep a summary sidecar so restarts do not re-parse their events logs.
+        sidecar_stamps = [list(status_stamp), list(events_stamp)]
+        stored = self._load_run_summary_sidecar(run_id, sidecar_stamps)
+        if stored is not None:
+            self._run_summary_cache.put(cache_key, stored, group=run_id)
+            self.run_index.mark_finished(run_id)
+            return stored
 
-            sweep_match = LOCK_SWEEP_PATTERN.match(message)
-            if sweep_match:
-                latest_lock_sweep = {
-                    "cycle": safe_int(sweep_match.group(1)),
-                    "cleared": safe_int(sweep_match.group(2)),
-                }
-                continue
+        status_data = read_key_value_file(status_path)
+        run_pid = safe_int(status_data.get("pid"), 0)
 
-            no_workers_match = NO_WORKERS_PATTERN.match(message)
-            if no_workers_match:
-                no_workers_events += 1
-                latest_no_workers_cycle = max(latest_no_workers_cycle, safe_int(no_workers_match.group(1)))
-
-        summary = RunSummary(
-            run_id=run_id,
-            pid=run_pid,
-            run_started_at=parse_run_id_utc(run_id),
-            state=state,
-            updated_at=updated_at,
-            status_run_log=status_run_log,
-            status_events_log=status_events_log,
-            repo_count=repo_count,
-            first_ts=first_ts,
-            last_ts=last_ts,
-            duration_seconds=duration_seconds,
-            cycles_seen=cycles_seen,
-            latest_cycle=latest_cycle,
-            repos_started=repos_started,
-            repos_running=repos_running,
-            repos_ended=repos_ended,
-            repos_no_change=repos_no_change,
-            repos_changed_est=max(0, repos_ended - repos_no_change),
-            repos_skipped_lock=repos_skipped_lock,
-            spawned_workers=spawned_workers,
-            latest_cycle_queue=latest_cycle_queue,
-            latest_lock_sweep=latest_lock_sweep,
-            no_workers_events=no_workers_events,
-            latest_no_workers_cycle=latest_no_workers_cycle,
-            repo_states=repo_states,
-            active_repo=active_repo,
-            active_path=active_path,
-            active_pass=active_pass,
-        )
+        with self._run_events_lock:
+            events = self._fold_run_events(run_id, events_path)
+            first_ts = events.first_ts
+            last_ts = events.last_ts
+            first_dt = parse_iso(first_ts)
+            last_dt = parse_iso(last_ts)
+            duration_seconds = 0
+            if first_dt and last_dt:
+                duration_seconds = max(0, int((last_dt - first_dt).total_seconds()))
+
+            summary = RunSummary(
+                run_id=run_id,
+                pid=run_pid,
+                run_started_at=parse_run_id_utc(run_id),
+                state=status_data.get("state", "unknown"),
+                updated_at=status_data.get("updated_at", ""),
+                status_run_log=status_data.get("run_log", ""),
+                status_events_log=status_data.get("events_log", ""),
+                repo_count=max(safe_int(status_data.get("repo_count"), 0), events.repo_count),
+                parallel_repos=events.parallel_repos,
+                first_ts=first_ts,
+                last_ts=last_ts,
+                duration_seconds=duration_seconds,
+                cycles_seen=events.cycles_seen,
+                latest_cycle=events.latest_cycle,
+                repos_started=events.repos_started,
+                repos_running=events.repos_running,
+                repos_ended=events.repos_ended,
+                repos_no_change=events.repos_no_change,
+                repos_changed_est=max(0, events.repos_ended - events.repos_no_change),
+                repos_skipped_lock=events.repos_skipped_lock,
+                spawned_workers=events.spawned_workers,
+                latest_cycle_queue=dict(events.latest_cycle_queue) if events.latest_cycle_queue else None,
+                latest_lock_sweep=dict(events.latest_lock_sweep) if events.latest_lock_sweep else None,
+                no_workers_events=events.no_workers_events,
+                latest_no_workers_cycle=events.latest_no_workers_cycle,
+                repo_states=dict(events.repo_states),
+                active_repo=events.active_repo or str(status_data.get("repo") or ""),
+                active_path=events.active_path or str(status_data.get("path") or ""),
+                active_pass=events.active_pass or str(status_data.get("pass") or ""),
+            )
 
-        with self._cache_lock:
-            self._run_summary_cache[run_id] = (cache_key, summary)
+        self._run_summary_cache.put(cache_key, summary, group=run_id)
+        if status_stamp[1] >= 0 and not run_is_online(summary.state, pid=summary.pid):
+            self._write_run_summary_sidecar(summary, sidecar_stamps)
+            self.run_index.mark_finished(run_id)
+            with self._run_events_lock:
+                # The sidecar covers this run from now on; drop its fold state.
+                self._run_events_state.pop(run_id)
 
         return summary
 
     def list_runs(self, limit: int = 25) -> list[dict[str, Any]]:
         summaries: list[dict[str, Any]] = []
-        for status_file in self._run_status_files()[: max(limit, 1)]:
-            match = RUN_STATUS_PATTERN.search(status_file.name)
-            if not match:
-                continue
-            summary = self._summarize_run(match.group(1))
+        for _, run_id in self.run_index.refresh()[: max(limit, 1)]:
+            summary = self._summarize_run(run_id)
             summaries.append(summary.as_dict())
         return summaries
 
+    def query_runs(
+        self,
+        limit: int = 60,
+        cursor: str = "",
+        states: set[str] | None = None,
+        repo: str = "",
+        since: dt.datetime | None = None,
+        until: dt.datetime | None = None,
+    ) -> dict[str, Any]:
+        """A page of runs (effective fields applied), newest status first.
+
+        `cursor` is the `next_cursor` of the previous page ("<status_mtime_ns>:<run_id>").
+        `since`/`until` bound the run start time, `repo` matches repos the run touched.
+        """
+        entries = self.run_index.refresh()
+        start = 0
+        if cursor:
+            mtime_raw, _, cursor_run_id = cursor.partition(":")
+            position = (safe_int(mtime_raw, 0), cursor_run_id)
+            start = next((idx for idx, entry in enumerate(entries) if entry < position), len(entries))
+        if since and since.tzinfo is None:
+            since = since.replace(tzinfo=dt.timezone.utc)
+        if until and until.tzinfo is None:
+            until = until.replace(tzinfo=dt.timezone.utc)
+        repo_filter = repo.strip().lower()
+        items: list[dict[str, Any]] = []
+        next_cursor = ""
+        for idx in range(start, len(entries)):
+            mtime_ns, run_id = entries[idx]
+            if since or until:
+                started = parse_iso(parse_run_id_utc(run_id))
+                if started is None or (since and started < since) or (until and started >= until):
+                    continue
+            summary = self._summarize_run(run_id)
+            if repo_filter:
+                touched = {name.lower() for name in summary.repo_states}
+                if summary.active_repo:
+                    touched.add(summary.active_repo.lower())
+                if repo_filter not in touched:
+                    continue
+            run = with_effective_run_fields(summary.as_dict()) or {}
+            if states and not {str(run.get("state") or "").lower(), str(run.get("state_raw") or "").lower()} & states:
+                continue
+            items.append(run)
+            if len(items) >= max(1, limit):
+                if idx + 1 < len(entries):
+                    next_cursor = f"{mtime_ns}:{run_id}"
+                break
+        return {"items": items, "next_cursor": next_cursor, "total_runs": len(entries)}
+
     def latest_run(self) -> dict[str, Any] | None:
         runs = self.list_runs(limit=1)
         return runs[0] if runs else None
@@ -753,7 +2156,7 @@ class CloneMonitor:
         if not repos:
             code_root = resolve_default_code_root(self.clone_root, self.repos_file)
             if code_root.exists() and code_root.is_dir():
-                repos = discover_local_git_repos(
+                repos, _indexed_at = self.local_repo_index.repos(
                     code_root=code_root,
                     max_depth=8,
                     limit=10000,
@@ -799,40 +2202,53 @@ class CloneMonitor:
         return catalog
 
     def recent_commits(self, hours: int = 2, limit: int = 250) -> list[dict[str, Any]]:
+        return self.single_flight.do(("recent_commits", hours, limit), lambda: self._recent_commits_once(hours, limit))
+
+    def _recent_commits_once(self, hours: int, limit: int) -> list[dict[str, Any]]:
         key = (hours, limit)
         now = time.time()
 
-        with self._cache_lock:
-            cached = self._commit_cache.get(key)
-            if cached and (now - cached[0]) < 15:
-                return cached[1]
+        cached = self._commit_cache.get(key, fresh=lambda entry: (now - entry[0]) < 15)
+        if cached:
+            return cached[1]
 
         results: list[dict[str, Any]] = []
         seen: set[tuple[str, str]] = set()
 
+        def add(repo_name: str, ts: int, commit_hash: str, subject: str) -> None:
+            identity = (repo_name, commit_hash)
+            if identity in seen:
+                return
+            seen.add(identity)
+            results.append(
+                {
+                    "ts": ts,
+                    "time_utc": iso_utc(dt.datetime.fromtimestamp(ts, tz=dt.timezone.utc)),
+                    "repo": repo_name,
+                    "hash": commit_hash,
+                    "subject": subject,
+                }
+            )
+
+        since_ts = int(now) - hours * 3600
+        use_index = self.commit_index.covers(since_ts)
+        repos: list[tuple[str, Path]] = []
         for repo_entry in self._load_repos():
             repo_path = Path(str(repo_entry.get("path", ""))).expanduser()
             repo_name = str(repo_entry.get("name") or repo_path.name)
             if not repo_path.joinpath(".git").exists():
                 continue
+            repos.append((repo_name, repo_path))
 
-            cmd = [
-                "git",
-                "-C",
-                str(repo_path),
-                "log",
-                f"--since={hours} hours ago",
-                "--pretty=format:%ct%x09%h%x09%s",
-            ]
-
-            try:
-                proc = subprocess.run(cmd, capture_output=True, text=True, check=False)
-            except OSError:
-                continue
-
-            if proc.returncode != 0:
-                continue
-
+        def collect(repo: tuple[str, Path]) -> list[tuple[int, str, str]] | None:
+            # None means the commit index is current for this repo.
+            repo_name, repo_path = repo
+            if use_index and self.commit_index.refresh(repo_path):
+                return None
+            proc = GIT_EXECUTOR.run(repo_path, "log", f"--since={hours} hours ago", "--pretty=format:%ct%x09%h%x09%s")
+            if proc is None or proc.returncode != 0:
+                return []
+            rows: list[tuple[int, str, str]] = []
             for line in proc.stdout.splitlines():
                 parts = line.split("\t", 2)
                 if len(parts) != 3:
@@ -843,25 +2259,26 @@ class CloneMonitor:
                 subject = subject.strip()
                 if not ts or not commit_hash:
                     continue
-                identity = (repo_name, commit_hash)
-                if identity in seen:
-                    continue
-                seen.add(identity)
-                results.append(
-                    {
-                        "ts": ts,
-                        "time_utc": iso_utc(dt.datetime.fromtimestamp(ts, tz=dt.timezone.utc)),
-                        "repo": repo_name,
-                        "hash": commit_hash,
-                        "subject": subject,
-                    }
-                )
+                rows.append((ts, commit_hash, subject))
+            return rows
+
+        indexed: dict[str, str] = {}
+        for (repo_name, repo_path), rows in zip(repos, GIT_EXECUTOR.map(collect, repos)):
+            if rows is None:
+                indexed.setdefault(str(repo_path), repo_name)
+                continue
+            for ts, commit_hash, subject in rows:
+                add(repo_name, ts, commit_hash, subject)
+
+        if indexed:
+            indexed_rows = self.commit_index.commits_since(set(indexed), since_ts, max(limit, 1))
+            for repo_path_key, _full_hash, short_hash, ts, subject in indexed_rows or []:
+                add(indexed[repo_path_key], ts, short_hash, subject)
 
         results.sort(key=lambda item: item["ts"], reverse=True)
         results = results[: max(limit, 1)]
 
-        with self._cache_lock:
-            self._commit_cache[key] = (now, results)
+        self._commit_cache.put(key, (now, results))
         return results
 
     def latest_events(self, run_id: str, limit: int = 250) -> list[dict[str, Any]]:
@@ -942,16 +2359,15 @@ class CloneMonitor:
         commits: list[dict[str, Any]] = []
         seen: set[str] = set()
 
-        for repo_name, repo_path in candidate_repos:
-            cmd = ["git", "-C", str(repo_path), "log", "--pretty=format:%H%x09%ct%x09%s", f"--max-count={per_repo_limit}"]
-            if since:
-                cmd.insert(-1, f"--since={since}")
+        log_args = ["log", "--pretty=format:%H%x09%ct%x09%s"]
+        if since:
+            log_args.append(f"--since={since}")
+        log_args.append(f"--max-count={per_repo_limit}")
+        # Output only depends on HEAD (the since bound is absolute), so it can be cached per repo.
+        procs = GIT_EXECUTOR.map(lambda repo: GIT_EXECUTOR.run(repo[1], *log_args, cache=True), candidate_repos)
 
-            try:
-                proc = subprocess.run(cmd, capture_output=True, text=True, check=False)
-            except OSError:
-                continue
-            if proc.returncode != 0:
+        for (repo_name, repo_path), proc in zip(candidate_repos, procs):
+            if proc is None or proc.returncode != 0:
                 continue
 
             for line in proc.stdout.splitlines():
@@ -1033,61 +2449,78 @@ class CloneMonitor:
 
     def _run_repo_candidates(self, run_id: str) -> list[str]:
         _, events_path, _ = self._run_paths(run_id)
-        events = self._load_events(events_path)
-        repos: set[str] = set()
-        for event in events:
-            message = str(event.get("message", ""))
-            match = REPO_FIELD_PATTERN.search(message)
-            if match:
-                repos.add(match.group(1))
-        return sorted(repos)
+        with self._run_events_lock:
+            return sorted(self._fold_run_events(run_id, events_path).repo_names)
 
-    def _resolve_commit_in_repo(self, repo_path: Path, commit_hash: str) -> str | None:
-        cmd = ["git", "-C", str(repo_path), "rev-parse", "--verify", "--quiet", f"{commit_hash}^{{commit}}"]
-        try:
-            proc = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        except OSError:
-            return None
-        if proc.returncode != 0:
-            # Fallback for short hashes that rev-parse may reject as ambiguous.
-            if len(commit_hash) >= 7:
-                try:
-                    fallback = subprocess.run(
-                        ["git", "-C", str(repo_path), "log", "--all", "--format=%H", "--max-count=20000"],
-                        capture_output=True,
-                        text=True,
-                        check=False,
-                    )
-                except OSError:
-                    return None
-                if fallback.returncode == 0:
-                    for line in fallback.stdout.splitlines():
-                        full_hash = line.strip()
-                        if full_hash.startswith(commit_hash):
-                            return full_hash
-            return None
-        resolved = proc.stdout.strip()
-        return resolved or None
+    def _resolve_commits_in_repo(self, repo_path: Path, commit_hashes: list[str]) -> dict[str, str]:
+        """Map run-log hashes to the full commit hashes they name in repo_path (one cat-file pass)."""
+        if not commit_hashes:
+            return {}
+        proc = GIT_EXECUTOR.run(
+            repo_path,
+            "cat-file",
+            "--batch-check=%(objectname) %(objecttype)",
+            input_text="".join(f"{commit_hash}^{{commit}}\n" for commit_hash in commit_hashes),
+            timeout=COMMIT_INDEX_GIT_TIMEOUT_SECONDS,
+        )
+        if proc is None or proc.returncode != 0:
+            return {}
 
-    def _resolve_commit_metadata(self, repo_path: Path, commit_hash: str) -> tuple[int, str, str] | None:
-        cmd = ["git", "-C", str(repo_path), "show", "-s", "--format=%ct%x09%H%x09%s", commit_hash]
-        try:
-            proc = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        except OSError:
-            return None
-        if proc.returncode != 0:
-            return None
-        parts = proc.stdout.strip().split("\t", 2)
-        if len(parts) != 3:
-            return None
-        ts = safe_int(parts[0])
-        full_hash = parts[1].strip()
-        subject = parts[2].strip()
-        if not ts or not full_hash:
-            return None
-        return ts, full_hash, subject
+        resolved: dict[str, str] = {}
+        ambiguous: list[str] = []
+        for commit_hash, line in zip(commit_hashes, proc.stdout.splitlines()):
+            parts = line.split()
+            if len(parts) == 2 and parts[1] == "commit":
+                resolved[commit_hash] = parts[0]
+            elif line.endswith(" ambiguous") and len(commit_hash) >= 7:
+                ambiguous.append(commit_hash)
+
+        if ambiguous:
+            # Short hashes shared by several commits: take the newest match, like `git log --all` order.
+            index = self._commit_prefix_index(repo_path)
+            for commit_hash in ambiguous:
+                full_hash = index.lookup(commit_hash)
+                if full_hash:
+                    resolved[commit_hash] = full_hash
+        return resolved
+
+    def _commit_prefix_index(self, repo_path: Path) -> CommitPrefixIndex:
+        proc = GIT_EXECUTOR.run(repo_path, "rev-list", "--all", timeout=COMMIT_INDEX_GIT_TIMEOUT_SECONDS)
+        if proc is None or proc.returncode != 0:
+            return CommitPrefixIndex([])
+        return CommitPrefixIndex(proc.stdout.split())
+
+    def _commit_metadata_batch(self, repo_path: Path, full_hashes: list[str]) -> dict[str, tuple[int, str, str]]:
+        if not full_hashes:
+            return {}
+        proc = GIT_EXECUTOR.run(
+            repo_path,
+            "log",
+            "--no-walk=unsorted",
+            "--stdin",
+            "--format=%ct%x09%H%x09%s",
+            input_text="".join(f"{full_hash}\n" for full_hash in full_hashes),
+            timeout=COMMIT_INDEX_GIT_TIMEOUT_SECONDS,
+        )
+        if proc is None or proc.returncode != 0:
+            return {}
+        metadata: dict[str, tuple[int, str, str]] = {}
+        for line in proc.stdout.splitlines():
+            parts = line.split("\t", 2)
+            if len(parts) != 3:
+                continue
+            ts = safe_int(parts[0])
+            full_hash = parts[1].strip()
+            subject = parts[2].strip()
+            if not ts or not full_hash:
+                continue
+            metadata[full_hash] = (ts, full_hash, subject)
+        return metadata
 
     def run_commits_detailed(self, run_id: str) -> list[dict[str, Any]]:
+        return self.single_flight.do(("run_commits", run_id), lambda: self._run_commits_detailed_once(run_id))
+
+    def _run_commits_detailed_once(self, run_id: str) -> list[dict[str, Any]]:
         status_path, events_path, run_log_path = self._run_paths(run_id)
         if not run_log_path.exists():
             return []
@@ -1100,15 +2533,13 @@ class CloneMonitor:
             repos_mtime_ns,
         )
 
-        with self._cache_lock:
-            cached = self._run_detailed_commits_cache.get(cache_key)
-            if cached is not None:
-                return cached
+        cached = self._run_detailed_commits_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         raw_commits = self._extract_run_commit_hashes(run_id)
         if not raw_commits:
-            with self._cache_lock:
-                self._run_detailed_commits_cache[cache_key] = []
+            self._run_detailed_commits_cache.put(cache_key, [], group=run_id)
             return []
 
         repo_map = self._repo_entries_by_name()
@@ -1121,16 +2552,38 @@ class CloneMonitor:
         if not candidate_repos:
             candidate_repos = list(repo_map.items())
 
+        hashes = [item["hash"] for item in raw_commits]
+        resolved_by_repo = GIT_EXECUTOR.map(
+            lambda repo: self._resolve_commits_in_repo(repo[1], hashes),
+            candidate_repos,
+        )
+
+        # Metadata is read from each commit's primary (first matching) repo, one pass per repo.
+        all_matches: list[list[tuple[int, str]]] = []
+        primary_hashes: list[dict[str, None]] = [{} for _ in candidate_repos]
+        for commit_hash in hashes:
+            matches = [
+                (repo_idx, resolved[commit_hash])
+                for repo_idx, resolved in enumerate(resolved_by_repo)
+                if commit_hash in resolved
+            ]
+            all_matches.append(matches)
+            if matches:
+                repo_idx, full_hash = matches[0]
+                primary_hashes[repo_idx][full_hash] = None
+        metadata_by_repo = GIT_EXECUTOR.map(
+            lambda pair: self._commit_metadata_batch(pair[0][1], list(pair[1])),
+            list(zip(candidate_repos, primary_hashes)),
+        )
+
         detailed: list[dict[str, Any]] = []
-        for item in raw_commits:
+        for item, repo_matches in zip(raw_commits, all_matches):
             commit_hash = item["hash"]
             subject = item["subject"]
-            matches: list[tuple[str, Path, str]] = []
-
-            for repo_name, repo_path in candidate_repos:
-                resolved_hash = self._resolve_commit_in_repo(repo_path, commit_hash)
-                if resolved_hash:
-                    matches.append((repo_name, repo_path, resolved_hash))
+            matches = [
+                (candidate_repos[repo_idx][0], candidate_repos[repo_idx][1], full_hash)
+                for repo_idx, full_hash in repo_matches
+            ]
 
             if not matches:
                 detailed.append(
@@ -1146,8 +2599,8 @@ class CloneMonitor:
                 )
                 continue
 
-            primary_repo_name, primary_repo_path, primary_hash = matches[0]
-            metadata = self._resolve_commit_metadata(primary_repo_path, primary_hash)
+            primary_repo_name, _primary_repo_path, primary_hash = matches[0]
+            metadata = metadata_by_repo[repo_matches[0][0]].get(primary_hash)
 
             if metadata:
                 ts, full_hash, resolved_subject = metadata
@@ -1177,8 +2630,7 @@ class CloneMonitor:
 
         detailed.sort(key=lambda item: item.get("ts", 0))
 
-        with self._cache_lock:
-            self._run_detailed_commits_cache[cache_key] = detailed
+        self._run_detailed_commits_cache.put(cache_key, detailed, group=run_id)
 
         return detailed
 
@@ -1320,30 +2772,13 @@ class CloneMonitor:
                 return None
 
         commits: list[dict[str, Any]] = []
-        cmd = [
-            "git",
-            "-C",
-            str(repo_path),
-            "log",
-            f"--since={max(1, commit_hours)} hours ago",
-            f"--max-count={max(1, commit_limit)}",
-            "--pretty=format:%ct%x09%H%x09%s",
-        ]
-        try:
-            proc = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        except OSError:
-            proc = None
+        since_ts = int(time.time()) - max(1, commit_hours) * 3600
+        indexed_rows = None
+        if self.commit_index.covers(since_ts) and self.commit_index.refresh(repo_path):
+            indexed_rows = self.commit_index.commits_since({str(repo_path)}, since_ts, max(1, commit_limit))
 
-        if proc and proc.returncode == 0:
-            for line in proc.stdout.splitlines():
-                parts = line.split("\t", 2)
-                if len(parts) != 3:
-                    continue
-                ts = safe_int(parts[0], 0)
-                full_hash = parts[1].strip()
-                subject = parts[2].strip()
-                if not ts or not full_hash:
-                    continue
+        if indexed_rows is not None:
+            for _repo_path, full_hash, _short_hash, ts, subject in indexed_rows:
                 commits.append(
                     {
                         "ts": ts,
@@ -1352,6 +2787,33 @@ class CloneMonitor:
                         "subject": subject,
                     }
                 )
+        else:
+            proc = GIT_EXECUTOR.run(
+                repo_path,
+                "log",
+                f"--since={max(1, commit_hours)} hours ago",
+                f"--max-count={max(1, commit_limit)}",
+                "--pretty=format:%ct%x09%H%x09%s",
+            )
+
+            if proc and proc.returncode == 0:
+                for line in proc.stdout.splitlines():
+                    parts = line.split("\t", 2)
+                    if len(parts) != 3:
+                        continue
+                    ts = safe_int(parts[0], 0)
+                    full_hash = parts[1].strip()
+                    subject = parts[2].strip()
+                    if not ts or not full_hash:
+                        continue
+                    commits.append(
+                        {
+                            "ts": ts,
+                            "time_utc": iso_utc(dt.datetime.fromtimestamp(ts, tz=dt.timezone.utc)),
+                            "hash": full_hash,
+                            "subject": subject,
+                        }
+                    )
 
         timeline: list[dict[str, Any]] = []
         counts = {
@@ -1607,12 +3069,122 @@ class CloneMonitor:
 
 
 class TaskQueueStore:
+    """Task queue kept in SQLite (WAL), mirrored to task_queue.json for the bash loop.
+
+    The JSON file stays the exchange format: it is re-imported whenever its
+    stamp changes under us (scripts edit it with jq) and re-exported after
+    every write made here. Every insert/update/removal, including ones found
+    on re-import, gets a monotonically increasing version in task_changes.
+    Each operation holds an flock on "<queue file>.lock" from re-import to
+    export; the scripts take the same lock around their read-modify-mv.
+
+    DONE/CANCELED tasks finished more than archive_after_seconds ago are moved
+    out of the live queue into an append-only gzip JSONL archive (one gzip
+    member per pass) indexed by id and repo in archived_tasks.
+    """
+
     VALID_STATUSES = {"QUEUED", "CLAIMED", "DONE", "BLOCKED", "CANCELED"}
+    LEASE_FIELDS = ("lease_expires_at", "lease_owner")
 
-    def __init__(self, queue_file: Path):
+    def __init__(
+        self,
+        queue_file: Path,
+        db_path: Path | None = None,
+        archive_after_seconds: int = TASK_ARCHIVE_DEFAULT_DAYS * 86400,
+    ):
         self.queue_file = queue_file
+        self.db_path = db_path or queue_file.with_suffix(".db")
+        self.archive_file = queue_file.with_name(f"{queue_file.stem}-archive.jsonl.gz")
+        self.lock_file = queue_file.with_name(f"{queue_file.name}.lock")
+        self.archive_after_seconds = max(0, int(archive_after_seconds))
+        self._archive_checked_at = 0.0
         self._lock = threading.Lock()
+        self._synced_stamp: tuple[int, int, int] | None = None
+        self._payload_extra: dict[str, Any] = {}
+        self._summary_cache: dict[int, tuple[int, dict[str, Any]]] = {}
+        self._listeners: list[Callable[[int], None]] = []
+        # Dispatcher state: QUEUED tasks by seq -> heap key, heaps per repo selector
+        # and per repo path (lazy deletion), and a (expires_ts, seq) heap of leases.
+        self._queued: dict[int, tuple[int, str, str, int]] = {}
+        self._repo_heaps: dict[str, list[tuple[int, str, str, int]]] = {}
+        self._path_heaps: dict[str, list[tuple[int, str, str, int]]] = {}
+        self._any_heap: list[tuple[int, str, str, int]] = []
+        self._leases: list[tuple[float, int]] = []
         self._ensure_file_exists()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                seq INTEGER PRIMARY KEY,
+                id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                repo TEXT NOT NULL,
+                repo_path TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                created_at TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS tasks_id ON tasks (id);
+            CREATE INDEX IF NOT EXISTS tasks_status_order ON tasks (status, priority, created_at, id);
+            CREATE INDEX IF NOT EXISTS tasks_repo ON tasks (repo);
+            CREATE INDEX IF NOT EXISTS tasks_priority ON tasks (priority, created_at, id);
+            CREATE TABLE IF NOT EXISTS task_changes (
+                version INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id TEXT NOT NULL,
+                op TEXT NOT NULL,
+                changed_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS archived_tasks (
+                id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                repo TEXT NOT NULL,
+                repo_path TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                created_at TEXT NOT NULL,
+                archived_at TEXT NOT NULL,
+                member_offset INTEGER NOT NULL,
+                member_length INTEGER NOT NULL,
+                line INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS archived_tasks_id ON archived_tasks (id);
+            CREATE INDEX IF NOT EXISTS archived_tasks_repo ON archived_tasks (repo);
+            """
+        )
+        self._rebuild_archive_index()
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock:
+            self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_file, "a", encoding="utf-8") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def add_listener(self, callback: Callable[[int], None]) -> None:
+        """Call callback(version) after each committed change."""
+        self._listeners.append(callback)
+
+    def _notify(self, version: int) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(version)
+            except Exception:  # noqa: BLE001 - listeners must not break queue writes.
+                pass
+
+    def _record_change(self, task_id: str, op: str, now: str) -> int:
+        cursor = self._conn.execute(
+            "INSERT INTO task_changes (task_id, op, changed_at) VALUES (?, ?, ?)", (task_id, op, now)
+        )
+        return int(cursor.lastrowid or 0)
+
+    def _trim_changes(self, version: int) -> None:
+        if version > TASK_CHANGE_LOG_LIMIT:
+            self._conn.execute("DELETE FROM task_changes WHERE version <= ?", (version - TASK_CHANGE_LOG_LIMIT,))
 
     def _default_payload(self) -> dict[str, Any]:
         return {"generated_at": iso_utc(utc_now()), "tasks": []}
@@ -1623,24 +3195,469 @@ class TaskQueueStore:
         self.queue_file.parent.mkdir(parents=True, exist_ok=True)
         self.queue_file.write_text(json.dumps(self._default_payload(), indent=2) + "\n", encoding="utf-8")
 
-    def _read_payload(self) -> dict[str, Any]:
+    def _read_payload(self) -> dict[str, Any] | None:
+        # Returns None when the file cannot be read or parsed, so callers keep what they have.
         self._ensure_file_exists()
         try:
             parsed = json.loads(self.queue_file.read_text(encoding="utf-8", errors="replace"))
-        except (OSError, json.JSONDecodeError):
-            parsed = self._default_payload()
+        except (OSError, json.JSONDecodeError) as exc:
+            if os.environ.get("CLONE_CONTROL_PLANE_DEBUG"):
+                print(f"task queue file unreadable, keeping indexed tasks: {self.queue_file}: {exc}", file=sys.stderr)
+            return None
         if not isinstance(parsed, dict):
-            parsed = self._default_payload()
+            if os.environ.get("CLONE_CONTROL_PLANE_DEBUG"):
+                print(f"task queue file is not a JSON object, keeping indexed tasks: {self.queue_file}", file=sys.stderr)
+            return None
         tasks = parsed.get("tasks")
         if not isinstance(tasks, list):
             parsed["tasks"] = []
         return parsed
 
-    def _write_payload(self, payload: dict[str, Any]) -> None:
+    def _row_values(self, task: dict[str, Any]) -> tuple[str, str, str, str, int, str, str]:
+        normalized = self._normalize_task(task)
+        return (
+            normalized["id"],
+            normalized["status"],
+            normalized["repo"],
+            normalized["repo_path"],
+            normalized["priority"],
+            normalized["created_at"],
+            json.dumps(task),
+        )
+
+    def _sync_from_file(self) -> None:
+        # Caller holds self._lock. Only re-import when someone else touched the file.
+        stamp = file_identity_stamp(self.queue_file)
+        if stamp == self._synced_stamp:
+            return
+        payload = self._read_payload()
+        if payload is None:
+            # Leave the index alone and retry once the file changes again; a half-written or
+            # corrupt file must not turn into a delete for every task.
+            self._synced_stamp = stamp
+            return
+        tasks = [item for item in payload.get("tasks", []) if isinstance(item, dict)]
+        for task in tasks:
+            self._drop_stale_lease(task)
+        rows = [self._row_values(task) for task in tasks]
+        previous: dict[str, str] = {}
+        for task_id, data in self._conn.execute("SELECT id, data FROM tasks ORDER BY seq DESC"):
+            previous[task_id] = data
+        current: dict[str, str] = {}
+        for row in reversed(rows):
+            current[row[0]] = row[6]
+
+        now = iso_utc(utc_now())
+        version = 0
+        with self._conn:
+            self._conn.execute("DELETE FROM tasks")
+            self._conn.executemany(
+                "INSERT INTO tasks (id, status, repo, repo_path, priority, created_at, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            for task_id, data in current.items():
+                if previous.get(task_id) != data:
+                    version = self._record_change(task_id, "upsert", now)
+            for task_id in previous:
+                if task_id not in current:
+                    version = self._record_change(task_id, "delete", now)
+            if version:
+                self._trim_changes(version)
+        self._payload_extra = {key: value for key, value in payload.items() if key != "tasks"}
+        self._synced_stamp = stamp
+        self._rebuild_dispatch()
+        if version:
+            self._notify(version)
+
+    def _prepare(self) -> None:
+        # Caller holds self._lock.
+        self._sync_from_file()
+        self._reclaim_expired()
+        if self.archive_after_seconds and time.monotonic() - self._archive_checked_at >= TASK_ARCHIVE_CHECK_SECONDS:
+            self._archive_checked_at = time.monotonic()
+            self._archive_finished(self.archive_after_seconds)
+
+    def _archive_finished(self, older_than_seconds: int) -> int:
+        # Caller holds self._lock. The gzip member is written before the index/queue
+        # transaction, so a crash in between leaves at most an unindexed duplicate.
+        cutoff = time.time() - max(0, older_than_seconds)
+        placeholders = ", ".join("?" for _ in TASK_ARCHIVE_TERMINAL_STATUSES)
+        picked: list[tuple[int, dict[str, Any]]] = []
+        for seq, data in self._conn.execute(
+            f"SELECT seq, data FROM tasks WHERE status IN ({placeholders}) ORDER BY seq", TASK_ARCHIVE_TERMINAL_STATUSES
+        ):
+            try:
+                task = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(task, dict):
+                continue
+            finished = None
+            for field_name in ("done_at", "updated_at", "created_at"):
+                finished = parse_iso(str(task.get(field_name) or ""))
+                if finished is not None:
+                    break
+            if finished is not None and finished.timestamp() <= cutoff:
+                picked.append((int(seq), task))
+        if not picked:
+            return 0
+
+        now = iso_utc(utc_now())
+        lines: list[str] = []
+        for _, task in picked:
+            task["archived_at"] = now
+            lines.append(json.dumps(task, separators=(",", ":")))
+        blob = gzip.compress(("\n".join(lines) + "\n").encode("utf-8"))
+        self.archive_file.parent.mkdir(parents=True, exist_ok=True)
+        with self.archive_file.open("ab") as handle:
+            offset = handle.tell()
+            handle.write(blob)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+        version = 0
+        with self._conn:
+            for line, (seq, task) in enumerate(picked):
+                task_id, status, repo, repo_path, priority, created_at, _ = self._row_values(task)
+                self._conn.execute("DELETE FROM archived_tasks WHERE id = ?", (task_id,))
+                self._conn.execute(
+                    "INSERT INTO archived_tasks (id, status, repo, repo_path, priority, created_at, archived_at, "
+                    "member_offset, member_length, line) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (task_id, status, repo, repo_path, priority, created_at, now, offset, len(blob), line),
+                )
+                self._conn.execute("DELETE FROM tasks WHERE seq = ?", (seq,))
+                version = self._record_change(task_id, "archive", now)
+            self._trim_changes(version)
+        self._export(now)
+        self._notify(version)
+        return len(picked)
+
+    def _rebuild_archive_index(self) -> None:
+        # Recreates archived_tasks from the archive when the database was removed.
+        if not self.archive_file.exists():
+            return
+        if self._conn.execute("SELECT 1 FROM archived_tasks LIMIT 1").fetchone() is not None:
+            return
+        try:
+            data = memoryview(self.archive_file.read_bytes())
+        except OSError:
+            return
+        rows: dict[str, tuple[Any, ...]] = {}
+        offset = 0
+        while offset < len(data):
+            decompressor = zlib.decompressobj(wbits=31)
+            try:
+                text = decompressor.decompress(data[offset:]) + decompressor.flush()
+            except zlib.error:
+                break
+            length = len(data) - offset - len(decompressor.unused_data)
+            for line, raw in enumerate(text.decode("utf-8", errors="replace").splitlines()):
+                try:
+                    task = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(task, dict):
+                    continue
+                task_id, status, repo, repo_path, priority, created_at, _ = self._row_values(task)
+                rows[task_id] = (
+                    task_id,
+                    status,
+                    repo,
+                    repo_path,
+                    priority,
+                    created_at,
+                    str(task.get("archived_at") or ""),
+                    offset,
+                    length,
+                    line,
+                )
+            if not decompressor.eof or length <= 0:
+                break
+            offset += length
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO archived_tasks (id, status, repo, repo_path, priority, created_at, archived_at, "
+                "member_offset, member_length, line) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                list(rows.values()),
+            )
+
+    def _load_archived(self, locations: list[tuple[int, int, int]]) -> list[dict[str, Any]]:
+        members: dict[tuple[int, int], list[str]] = {}
+        tasks: list[dict[str, Any]] = []
+        try:
+            handle = self.archive_file.open("rb")
+        except OSError:
+            return tasks
+        with handle:
+            for offset, length, line in locations:
+                lines = members.get((offset, length))
+                if lines is None:
+                    handle.seek(offset)
+                    try:
+                        lines = gzip.decompress(handle.read(length)).decode("utf-8", errors="replace").splitlines()
+                    except (OSError, EOFError, zlib.error):
+                        lines = []
+                    members[(offset, length)] = lines
+                if line >= len(lines):
+                    continue
+                try:
+                    task = json.loads(lines[line])
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(task, dict):
+                    continue
+                normalized = self._normalize_task(task)
+                normalized["archived"] = True
+                normalized["archived_at"] = str(task.get("archived_at") or "")
+                tasks.append(normalized)
+        return tasks
+
+    def archive_finished(self, older_than_seconds: int | None = None) -> dict[str, Any]:
+        """Archive DONE/CANCELED tasks now (default age: archive_after_seconds)."""
+        age = self.archive_after_seconds if older_than_seconds is None else max(0, safe_int(older_than_seconds, 0))
+        with self._locked():
+            self._sync_from_file()
+            self._reclaim_expired()
+            self._archive_checked_at = time.monotonic()
+            archived = self._archive_finished(age)
+            total = self._conn.execute("SELECT COUNT(*) FROM archived_tasks").fetchone()[0]
+        return {"archived": archived, "archived_total": int(total), "older_than_seconds": age, "path": str(self.archive_file)}
+
+    def _rebuild_dispatch(self) -> None:
+        self._queued = {}
+        self._repo_heaps = {}
+        self._path_heaps = {}
+        self._any_heap = []
+        self._leases = []
+        rows = self._conn.execute("SELECT seq, data FROM tasks WHERE status IN ('QUEUED', 'CLAIMED')")
+        for seq, data in rows:
+            try:
+                task = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(task, dict):
+                self._index_task(int(seq), task)
+
+    def _index_task(self, seq: int, task: dict[str, Any]) -> None:
+        normalized = self._normalize_task(task)
+        if normalized["status"] != "QUEUED":
+            self._queued.pop(seq, None)
+            if normalized["status"] == "CLAIMED":
+                expires = parse_iso(normalized["lease_expires_at"])
+                if expires is not None:
+                    heapq.heappush(self._leases, (expires.timestamp(), seq))
+            return
+        key = (normalized["priority"], normalized["created_at"], normalized["id"], seq)
+        self._queued[seq] = key
+        heapq.heappush(self._repo_heaps.setdefault(normalized["repo"].lower(), []), key)
+        if normalized["repo_path"]:
+            heapq.heappush(self._path_heaps.setdefault(normalized["repo_path"], []), key)
+        heapq.heappush(self._any_heap, key)
+
+    def _load_task_row(self, seq: int) -> dict[str, Any] | None:
+        row = self._conn.execute("SELECT data FROM tasks WHERE seq = ?", (seq,)).fetchone()
+        if row is None:
+            return None
+        try:
+            task = json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+        return task if isinstance(task, dict) else None
+
+    def _store_task_row(self, seq: int, task: dict[str, Any], now: str) -> int:
+        self._conn.execute(
+            "UPDATE tasks SET id = ?, status = ?, repo = ?, repo_path = ?, priority = ?, created_at = ?, data = ? "
+            "WHERE seq = ?",
+            (*self._row_values(task), seq),
+        )
+        return self._record_change(str(task.get("id") or ""), "upsert", now)
+
+    def _drop_stale_lease(self, task: dict[str, Any]) -> None:
+        # Leases only mean something while the task is CLAIMED. The loop moves tasks on by
+        # editing the file and leaves these fields behind, and a later loop-side claim must
+        # not inherit an old expiry that would make the reclaimer requeue it early.
+        if str(task.get("status") or "").upper() != "CLAIMED":
+            for field_name in self.LEASE_FIELDS:
+                task.pop(field_name, None)
+
+    def _reclaim_expired(self) -> None:
+        # Caller holds self._lock. Requeues CLAIMED tasks whose lease ran out, like the
+        # loop's stale-claim sweep does for claimed_at.
+        now_ts = time.time()
+        expired: list[int] = []
+        while self._leases and self._leases[0][0] <= now_ts:
+            expired.append(heapq.heappop(self._leases)[1])
+        if not expired:
+            return
+        now = iso_utc(utc_now())
+        version = 0
+        requeued: list[tuple[int, dict[str, Any]]] = []
+        with self._conn:
+            for seq in expired:
+                task = self._load_task_row(seq)
+                if task is None or str(task.get("status") or "").upper() != "CLAIMED":
+                    continue
+                expires = parse_iso(str(task.get("lease_expires_at") or ""))
+                if expires is None or expires.timestamp() > now_ts:
+                    continue
+                task["status"] = "QUEUED"
+                task["updated_at"] = now
+                task["requeued_at"] = now
+                task["retry_count"] = safe_int(task.get("retry_count"), 0) + 1
+                for field_name in ("claimed_at", "claimed_run_id", "claimed_pass", *self.LEASE_FIELDS):
+                    task.pop(field_name, None)
+                version = self._store_task_row(seq, task, now)
+                requeued.append((seq, task))
+            if version:
+                self._trim_changes(version)
+        for seq, task in requeued:
+            self._index_task(seq, task)
+        if version:
+            self._export(now)
+            self._notify(version)
+
+    def _pop_next_queued(self, heaps: list[list[tuple[int, str, str, int]]]) -> int | None:
+        best: list[tuple[int, str, str, int]] | None = None
+        for heap in heaps:
+            while heap and self._queued.get(heap[0][3]) != heap[0]:
+                heapq.heappop(heap)
+            if heap and (best is None or heap[0] < best[0]):
+                best = heap
+        if best is None:
+            return None
+        seq = heapq.heappop(best)[3]
+        self._queued.pop(seq, None)
+        return seq
+
+    def claim(
+        self,
+        *,
+        repo: str = "",
+        repo_path: str = "",
+        limit: int = 1,
+        lease_seconds: int = TASK_LEASE_DEFAULT_SECONDS,
+        run_id: str = "",
+        pass_label: str = "",
+        owner: str = "",
+    ) -> dict[str, Any]:
+        """Atomically move the best QUEUED tasks for a repo to CLAIMED under a lease.
+
+        Matches the loop's selection: tasks for "*", for the repo name
+        (case-insensitive) or for the exact repo path, by priority then age.
+        Without repo and repo_path any queued task can be claimed.
+        """
+        repo_key = str(repo or "").strip().lower()
+        path_key = str(repo_path or "").strip()
+        limit = max(1, min(safe_int(limit, 1), 100))
+        lease_seconds = max(30, min(safe_int(lease_seconds, TASK_LEASE_DEFAULT_SECONDS), TASK_LEASE_MAX_SECONDS))
+
+        with self._locked():
+            self._prepare()
+            if not repo_key and not path_key:
+                heaps = [self._any_heap]
+            else:
+                heaps = [self._repo_heaps.setdefault("*", [])]
+                if repo_key and repo_key != "*":
+                    heaps.append(self._repo_heaps.setdefault(repo_key, []))
+                if path_key:
+                    heaps.append(self._path_heaps.setdefault(path_key, []))
+
+            now_dt = utc_now()
+            now = iso_utc(now_dt)
+            expires_at = iso_utc(now_dt + dt.timedelta(seconds=lease_seconds))
+            claimed: list[tuple[int, dict[str, Any]]] = []
+            version = 0
+            with self._conn:
+                while len(claimed) < limit:
+                    seq = self._pop_next_queued(heaps)
+                    if seq is None:
+                        break
+                    task = self._load_task_row(seq)
+                    if task is None:
+                        continue
+                    task["status"] = "CLAIMED"
+                    task["updated_at"] = now
+                    task["claimed_at"] = now
+                    task["lease_expires_at"] = expires_at
+                    if run_id:
+                        task["claimed_run_id"] = str(run_id)
+                    if pass_label:
+                        task["claimed_pass"] = str(pass_label)
+                    if owner:
+                        task["lease_owner"] = str(owner)
+                    version = self._store_task_row(seq, task, now)
+                    claimed.append((seq, task))
+                if version:
+                    self._trim_changes(version)
+            for seq, task in claimed:
+                self._index_task(seq, task)
+            if version:
+                self._export(now)
+                self._notify(version)
+            return {
+                "items": [self._normalize_task(task) for _, task in claimed],
+                "lease_expires_at": expires_at if claimed else "",
+                "lease_seconds": lease_seconds,
+                "version": self._current_version(),
+            }
+
+    def heartbeat(
+        self, task_ids: list[str], lease_seconds: int = TASK_LEASE_DEFAULT_SECONDS, run_id: str = ""
+    ) -> dict[str, Any]:
+        """Extend leases on CLAIMED tasks; ids that are not leased (or owned by another run) are missing."""
+        lease_seconds = max(30, min(safe_int(lease_seconds, TASK_LEASE_DEFAULT_SECONDS), TASK_LEASE_MAX_SECONDS))
+        wanted = [str(task_id or "").strip() for task_id in task_ids if str(task_id or "").strip()]
+        with self._locked():
+            self._prepare()
+            now_dt = utc_now()
+            now = iso_utc(now_dt)
+            expires_at = iso_utc(now_dt + dt.timedelta(seconds=lease_seconds))
+            renewed: list[tuple[int, dict[str, Any]]] = []
+            missing: list[str] = []
+            version = 0
+            with self._conn:
+                for task_id in wanted:
+                    row = self._conn.execute(
+                        "SELECT seq FROM tasks WHERE id = ? AND status = 'CLAIMED' ORDER BY seq LIMIT 1", (task_id,)
+                    ).fetchone()
+                    task = self._load_task_row(int(row[0])) if row else None
+                    if (
+                        task is None
+                        or not task.get("lease_expires_at")
+                        or (run_id and str(task.get("claimed_run_id") or "") != str(run_id))
+                    ):
+                        missing.append(task_id)
+                        continue
+                    task["lease_expires_at"] = expires_at
+                    task["updated_at"] = now
+                    version = self._store_task_row(int(row[0]), task, now)
+                    renewed.append((int(row[0]), task))
+                if version:
+                    self._trim_changes(version)
+            for seq, task in renewed:
+                self._index_task(seq, task)
+            if version:
+                self._export(now)
+                self._notify(version)
+            return {
+                "renewed": [str(task.get("id") or "") for _, task in renewed],
+                "missing": missing,
+                "lease_expires_at": expires_at if renewed else "",
+            }
+
+    def _export(self, now: str) -> None:
+        # Tasks are stored as JSON text already; splice them instead of re-encoding the queue.
+        header = dict(self._payload_extra)
+        header["generated_at"] = now
+        rows = [row[0] for row in self._conn.execute("SELECT data FROM tasks ORDER BY seq")]
+        head = json.dumps(header, indent=2)[:-2]
+        text = head + ',\n  "tasks": [\n    ' + ",\n    ".join(rows) + "\n  ]\n}\n"
         self.queue_file.parent.mkdir(parents=True, exist_ok=True)
         tmp_path = self.queue_file.with_suffix(".tmp")
-        tmp_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        tmp_path.write_text(text, encoding="utf-8")
         tmp_path.replace(self.queue_file)
+        self._payload_extra = header
+        self._synced_stamp = file_identity_stamp(self.queue_file)
 
     def _normalize_task(self, task: dict[str, Any]) -> dict[str, Any]:
         status = str(task.get("status") or "QUEUED").upper()
@@ -1667,6 +3684,7 @@ class TaskQueueStore:
             "route_claimed_count": max(0, safe_int(task.get("route_claimed_count"), 0)),
             "route_updated_at": str(task.get("route_updated_at") or ""),
             "is_interrupt": bool(to_bool(task.get("is_interrupt"))),
+            "lease_expires_at": str(task.get("lease_expires_at") or ""),
         }
 
     def _task_sort_key(self, task: dict[str, Any]) -> tuple[int, str, str]:
@@ -1676,63 +3694,172 @@ class TaskQueueStore:
             str(task.get("id") or ""),
         )
 
-    def _make_task_id(self, title: str, tasks: list[dict[str, Any]]) -> str:
+    def _task_id_exists(self, task_id: str) -> bool:
+        if self._conn.execute("SELECT 1 FROM tasks WHERE id = ? LIMIT 1", (task_id,)).fetchone() is not None:
+            return True
+        return self._conn.execute("SELECT 1 FROM archived_tasks WHERE id = ? LIMIT 1", (task_id,)).fetchone() is not None
+
+    def _make_task_id(self, title: str) -> str:
         slug = re.sub(r"[^a-z0-9]+", "-", str(title or "").lower()).strip("-")
         if not slug:
             slug = "task"
         slug = slug[:24]
         base = f"q-{dt.datetime.now(dt.timezone.utc).strftime('%Y%m%d-%H%M%S')}-{slug}"
-        existing = {str(item.get("id") or "") for item in tasks}
-        if base not in existing:
+        if not self._task_id_exists(base):
             return base
         return f"{base}-{int(time.time())}"
 
-    def summary(self, limit: int = 20) -> dict[str, Any]:
-        with self._lock:
-            payload = self._read_payload()
-            tasks = [self._normalize_task(item) for item in payload.get("tasks", []) if isinstance(item, dict)]
+    def _decode_tasks(self, rows: Any) -> list[dict[str, Any]]:
+        tasks: list[dict[str, Any]] = []
+        for row in rows:
+            try:
+                task = json.loads(row[0])
+            except json.JSONDecodeError:
+                continue
+            if isinstance(task, dict):
+                tasks.append(self._normalize_task(task))
+        return tasks
+
+    def _current_version(self) -> int:
+        row = self._conn.execute("SELECT MAX(version) FROM task_changes").fetchone()
+        return int(row[0] or 0) if row else 0
 
+    def current_version(self) -> int:
+        with self._locked():
+            self._prepare()
+            return self._current_version()
+
+    def summary(self, limit: int = 20) -> dict[str, Any]:
         counts: dict[str, int] = {status: 0 for status in self.VALID_STATUSES}
-        for task in tasks:
-            counts[task["status"]] = counts.get(task["status"], 0) + 1
+        order = "ORDER BY priority, created_at, id, seq LIMIT ?"
+        with self._locked():
+            self._prepare()
+            version = self._current_version()
+            cached = self._summary_cache.get(limit)
+            if cached and cached[0] == version:
+                return {**cached[1], "generated_at": iso_utc(utc_now())}
+            for status, count in self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+                counts[status] = counts.get(status, 0) + int(count)
+            queued = self._decode_tasks(
+                self._conn.execute(f"SELECT data FROM tasks WHERE status = 'QUEUED' {order}", (max(1, limit),))
+            )
+            claimed = self._decode_tasks(
+                self._conn.execute(f"SELECT data FROM tasks WHERE status = 'CLAIMED' {order}", (max(1, limit),))
+            )
+            result = {
+                "generated_at": iso_utc(utc_now()),
+                "path": str(self.queue_file),
+                "counts": counts,
+                "queued": queued,
+                "claimed": claimed,
+                "total": sum(counts.values()),
+                "archived": int(self._conn.execute("SELECT COUNT(*) FROM archived_tasks").fetchone()[0]),
+                "version": version,
+            }
+            self._summary_cache[limit] = (version, result)
+        return dict(result)
+
+    def _task_matches(self, task: dict[str, Any], status_filter: str, repo_filter: str) -> bool:
+        if status_filter and task["status"] != status_filter:
+            return False
+        if repo_filter:
+            task_repo = str(task.get("repo") or "").lower()
+            task_path = str(task.get("repo_path") or "").lower()
+            if repo_filter not in task_repo and repo_filter not in task_path:
+                return False
+        return True
 
-        queued = [item for item in tasks if item["status"] == "QUEUED"]
-        queued.sort(key=self._task_sort_key)
-        claimed = [item for item in tasks if item["status"] == "CLAIMED"]
-        claimed.sort(key=self._task_sort_key)
+    def changes_since(
+        self, since_version: int, status: str = "", repo: str = "", limit: int = 1000
+    ) -> dict[str, Any]:
+        """Tasks inserted/updated after since_version (latest state only) and ids removed.
 
+        Tasks that no longer match the status/repo filter are reported as removed.
+        `reset` means the log no longer reaches back to since_version.
+        """
+        status_filter = str(status or "").upper().strip()
+        repo_filter = str(repo or "").lower().strip()
+        since = max(0, safe_int(since_version, 0))
+        with self._locked():
+            self._prepare()
+            current = self._current_version()
+            oldest_row = self._conn.execute("SELECT MIN(version) FROM task_changes").fetchone()
+            oldest = int(oldest_row[0] or 0) if oldest_row else 0
+            if since > current or (oldest and since < oldest - 1):
+                return {
+                    "version": current,
+                    "since_version": since,
+                    "reset": True,
+                    "items": [],
+                    "removed": [],
+                    "has_more": False,
+                }
+            changed = self._conn.execute(
+                "SELECT task_id, MAX(version) AS latest FROM task_changes WHERE version > ? "
+                "GROUP BY task_id ORDER BY latest LIMIT ?",
+                (since, max(1, limit) + 1),
+            ).fetchall()
+            has_more = len(changed) > max(1, limit)
+            changed = changed[: max(1, limit)]
+            items: list[dict[str, Any]] = []
+            removed: list[str] = []
+            for task_id, _latest in changed:
+                row = self._conn.execute(
+                    "SELECT data FROM tasks WHERE id = ? ORDER BY seq LIMIT 1", (task_id,)
+                ).fetchone()
+                decoded = self._decode_tasks([row]) if row else []
+                if decoded and self._task_matches(decoded[0], status_filter, repo_filter):
+                    items.append(decoded[0])
+                else:
+                    removed.append(task_id)
         return {
-            "generated_at": iso_utc(utc_now()),
-            "path": str(self.queue_file),
-            "counts": counts,
-            "queued": queued[: max(1, limit)],
-            "claimed": claimed[: max(1, limit)],
-            "total": len(tasks),
+            "version": int(changed[-1][1]) if has_more else current,
+            "since_version": since,
+            "reset": False,
+            "items": items,
+            "removed": removed,
+            "has_more": has_more,
         }
 
-    def list_tasks(self, status: str = "", repo: str = "", limit: int = 100) -> list[dict[str, Any]]:
-        with self._lock:
-            payload = self._read_payload()
-            tasks = [self._normalize_task(item) for item in payload.get("tasks", []) if isinstance(item, dict)]
-
+    def list_tasks(
+        self, status: str = "", repo: str = "", limit: int = 100, include_archived: bool = False
+    ) -> list[dict[str, Any]]:
         status_filter = str(status or "").upper().strip()
         repo_filter = str(repo or "").lower().strip()
-        filtered: list[dict[str, Any]] = []
+        clauses: list[str] = []
+        params: list[Any] = []
+        if status_filter:
+            clauses.append("status = ?")
+            params.append(status_filter)
+        if repo_filter:
+            clauses.append("(instr(lower(repo), ?) > 0 OR instr(lower(repo_path), ?) > 0)")
+            params.extend([repo_filter, repo_filter])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(max(1, limit))
+
+        with self._locked():
+            self._prepare()
+            tasks = self._decode_tasks(
+                self._conn.execute(
+                    f"SELECT data FROM tasks {where} ORDER BY priority, created_at, id, seq LIMIT ?",
+                    params,
+                )
+            )
+            if not include_archived:
+                return tasks
+            locations = self._conn.execute(
+                f"SELECT member_offset, member_length, line FROM archived_tasks {where} "
+                "ORDER BY priority, created_at, id LIMIT ?",
+                params,
+            ).fetchall()
         for task in tasks:
-            if status_filter and task["status"] != status_filter:
-                continue
-            if repo_filter:
-                task_repo = str(task.get("repo") or "").lower()
-                task_path = str(task.get("repo_path") or "").lower()
-                if repo_filter not in task_repo and repo_filter not in task_path:
-                    continue
-            filtered.append(task)
-
-        filtered.sort(key=self._task_sort_key)
-        return filtered[: max(1, limit)]
+            task["archived"] = False
+        live_ids = {task["id"] for task in tasks}
+        archived = [task for task in self._load_archived(locations) if task["id"] not in live_ids]
+        return sorted(tasks + archived, key=self._task_sort_key)[: max(1, limit)]
 
-    def add_task(
-        self,
+    @staticmethod
+    def _new_task_fields(
         *,
         title: str,
         details: str = "",
@@ -1746,90 +3873,242 @@ class TaskQueueStore:
         route_updated_at: str = "",
         is_interrupt: bool = False,
         source: str = "control_plane",
-        task_id: str = "",
     ) -> dict[str, Any]:
         task_title = str(title or "").strip()
         if not task_title:
             raise ValueError("title is required")
+        return {
+            "status": "QUEUED",
+            "repo": str(repo or "*").strip() or "*",
+            "repo_path": str(repo_path or "").strip(),
+            "title": task_title,
+            "details": str(details or "").strip(),
+            "priority": max(1, min(safe_int(priority, 3), 5)),
+            "route_model": str(route_model or "").strip(),
+            "route_mode": str(route_mode or "").strip(),
+            "route_reason": str(route_reason or "").strip(),
+            "route_claimed_count": max(0, safe_int(route_claimed_count, 0)),
+            "route_updated_at": str(route_updated_at or "").strip(),
+            "source": str(source or "control_plane").strip() or "control_plane",
+            "is_interrupt": bool(to_bool(is_interrupt)),
+        }
 
-        task_details = str(details or "").strip()
-        task_repo = str(repo or "*").strip() or "*"
-        task_repo_path = str(repo_path or "").strip()
-        task_source = str(source or "control_plane").strip() or "control_plane"
-        task_priority = max(1, min(safe_int(priority, 3), 5))
-
-        with self._lock:
-            payload = self._read_payload()
-            tasks = [item for item in payload.get("tasks", []) if isinstance(item, dict)]
-            resolved_id = str(task_id or "").strip()
-            if not resolved_id:
-                resolved_id = self._make_task_id(task_title, tasks)
-            else:
-                known_ids = {str(item.get("id") or "") for item in tasks}
-                if resolved_id in known_ids:
-                    resolved_id = f"{resolved_id}-{int(time.time())}"
-
-            now = iso_utc(utc_now())
-            task = {
-                "id": resolved_id,
-                "status": "QUEUED",
-                "repo": task_repo,
-                "repo_path": task_repo_path,
-                "title": task_title,
-                "details": task_details,
-                "priority": task_priority,
-                "route_model": str(route_model or "").strip(),
-                "route_mode": str(route_mode or "").strip(),
-                "route_reason": str(route_reason or "").strip(),
-                "route_claimed_count": max(0, safe_int(route_claimed_count, 0)),
-                "route_updated_at": str(route_updated_at or "").strip(),
-                "source": task_source,
-                "is_interrupt": bool(to_bool(is_interrupt)),
-                "created_at": now,
-                "updated_at": now,
-            }
-            tasks.append(task)
-            payload["generated_at"] = now
-            payload["tasks"] = tasks
-            self._write_payload(payload)
-            return self._normalize_task(task)
+    def _insert_task(self, fields: dict[str, Any], task_id: str, now: str) -> tuple[dict[str, Any], int]:
+        # Caller holds self._lock and an open transaction.
+        resolved_id = str(task_id or "").strip()
+        if not resolved_id:
+            resolved_id = self._make_task_id(fields["title"])
+        elif self._task_id_exists(resolved_id):
+            resolved_id = f"{resolved_id}-{int(time.time())}"
+            suffix = 2
+            while self._task_id_exists(resolved_id):
+                resolved_id = f"{str(task_id).strip()}-{int(time.time())}-{suffix}"
+                suffix += 1
+        task = {"id": resolved_id, **fields, "created_at": now, "updated_at": now}
+        cursor = self._conn.execute(
+            "INSERT INTO tasks (id, status, repo, repo_path, priority, created_at, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            self._row_values(task),
+        )
+        seq = int(cursor.lastrowid or 0)
+        self._index_task(seq, task)
+        return task, self._record_change(resolved_id, "upsert", now)
 
-    def update_task(self, task_id: str, status: str, note: str = "") -> dict[str, Any] | None:
+    @classmethod
+    def _validate_update(cls, task_id: str, status: str) -> tuple[str, str]:
         normalized_id = str(task_id or "").strip()
         if not normalized_id:
             raise ValueError("task id is required")
-
         normalized_status = str(status or "").upper().strip()
-        if normalized_status not in self.VALID_STATUSES:
+        if normalized_status not in cls.VALID_STATUSES:
             raise ValueError(f"invalid status: {status}")
+        return normalized_id, normalized_status
+
+    def _find_task_row(self, task_id: str) -> tuple[int, dict[str, Any]] | None:
+        row = self._conn.execute("SELECT seq, data FROM tasks WHERE id = ? ORDER BY seq LIMIT 1", (task_id,)).fetchone()
+        if row is None:
+            return None
+        try:
+            task = json.loads(row[1])
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(task, dict):
+            return None
+        return int(row[0]), task
+
+    def _apply_status(self, seq: int, task: dict[str, Any], status: str, note: str, now: str) -> int:
+        # Caller holds self._lock and an open transaction.
+        task["status"] = status
+        task["updated_at"] = now
+        if note:
+            task["operator_note"] = note
+        if status == "DONE":
+            task["done_at"] = now
+        elif status == "BLOCKED":
+            task["blocked_at"] = now
+        elif status == "CLAIMED":
+            task["claimed_at"] = now
+        self._drop_stale_lease(task)
+        version = self._store_task_row(seq, task, now)
+        self._index_task(seq, task)
+        return version
+
+    def _finish_write(self, version: int, now: str) -> None:
+        # Caller holds self._lock; the transaction is committed.
+        if not version:
+            return
+        self._export(now)
+        self._notify(version)
+
+    def add_task(
+        self,
+        *,
+        title: str,
+        details: str = "",
+        repo: str = "*",
+        repo_path: str = "",
+        priority: int = 3,
+        route_model: str = "",
+        route_mode: str = "",
+        route_reason: str = "",
+        route_claimed_count: int = 0,
+        route_updated_at: str = "",
+        is_interrupt: bool = False,
+        source: str = "control_plane",
+        task_id: str = "",
+    ) -> dict[str, Any]:
+        task_fields = self._new_task_fields(
+            title=title,
+            details=details,
+            repo=repo,
+            repo_path=repo_path,
+            priority=priority,
+            route_model=route_model,
+            route_mode=route_mode,
+            route_reason=route_reason,
+            route_claimed_count=route_claimed_count,
+            route_updated_at=route_updated_at,
+            is_interrupt=is_interrupt,
+            source=source,
+        )
+        with self._locked():
+            self._prepare()
+            now = iso_utc(utc_now())
+            with self._conn:
+                task, version = self._insert_task(task_fields, task_id, now)
+                self._trim_changes(version)
+            self._finish_write(version, now)
+            return self._normalize_task(task)
 
+    def update_task(self, task_id: str, status: str, note: str = "") -> dict[str, Any] | None:
+        normalized_id, normalized_status = self._validate_update(task_id, status)
         note_text = str(note or "").strip()
-        with self._lock:
-            payload = self._read_payload()
-            tasks = [item for item in payload.get("tasks", []) if isinstance(item, dict)]
+        with self._locked():
+            self._prepare()
+            found = self._find_task_row(normalized_id)
+            if found is None:
+                return None
+            seq, task = found
+            now = iso_utc(utc_now())
+            with self._conn:
+                version = self._apply_status(seq, task, normalized_status, note_text, now)
+                self._trim_changes(version)
+            self._finish_write(version, now)
+            return self._normalize_task(task)
+
+    def add_tasks(self, items: list[Any], *, atomic: bool = False, source: str = "control_plane") -> dict[str, Any]:
+        """Validate and insert many tasks with one transaction and one file export.
+
+        Returns per-item results in request order. Invalid items are reported and
+        skipped, or, with atomic=True, cause nothing to be written.
+        """
+        results: list[dict[str, Any]] = []
+        accepted: list[tuple[int, dict[str, Any], str]] = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results.append({"index": index, "ok": False, "error": "task must be an object"})
+                continue
+            try:
+                fields = self._new_task_fields(**self._task_request_fields(item, source))
+            except ValueError as exc:
+                results.append({"index": index, "ok": False, "error": str(exc)})
+                continue
+            results.append({"index": index, "ok": True})
+            accepted.append((index, fields, str(item.get("id") or "")))
+
+        failed = len(items) - len(accepted)
+        if atomic and failed:
+            return {"results": results, "added": 0, "failed": failed, "committed": False}
+
+        with self._locked():
+            self._prepare()
             now = iso_utc(utc_now())
-            updated_task: dict[str, Any] | None = None
-            for task in tasks:
-                if str(task.get("id") or "") != normalized_id:
+            version = 0
+            with self._conn:
+                for index, fields, task_id in accepted:
+                    task, version = self._insert_task(fields, task_id, now)
+                    results[index]["item"] = self._normalize_task(task)
+                if version:
+                    self._trim_changes(version)
+            self._finish_write(version, now)
+            return {"results": results, "added": len(accepted), "failed": failed, "committed": True, "version": version}
+
+    def update_tasks(self, updates: list[Any], *, atomic: bool = False) -> dict[str, Any]:
+        """Apply many status updates with one transaction and one file export (see add_tasks)."""
+        results: list[dict[str, Any]] = []
+        with self._locked():
+            self._prepare()
+            planned: list[tuple[int, int, dict[str, Any], str, str]] = []
+            for index, update in enumerate(updates):
+                if not isinstance(update, dict):
+                    results.append({"index": index, "ok": False, "error": "update must be an object"})
                     continue
-                task["status"] = normalized_status
-                task["updated_at"] = now
-                if note_text:
-                    task["operator_note"] = note_text
-                if normalized_status == "DONE":
-                    task["done_at"] = now
-                elif normalized_status == "BLOCKED":
-                    task["blocked_at"] = now
-                elif normalized_status == "CLAIMED":
-                    task["claimed_at"] = now
-                updated_task = dict(task)
-                break
-            if updated_task is None:
-                return None
-            payload["generated_at"] = now
-            payload["tasks"] = tasks
-            self._write_payload(payload)
-            return self._normalize_task(updated_task)
+                try:
+                    task_id, status = self._validate_update(str(update.get("id") or ""), str(update.get("status") or ""))
+                except ValueError as exc:
+                    results.append({"index": index, "ok": False, "id": str(update.get("id") or ""), "error": str(exc)})
+                    continue
+                found = self._find_task_row(task_id)
+                if found is None:
+                    results.append({"index": index, "ok": False, "id": task_id, "error": f"task not found: {task_id}"})
+                    continue
+                results.append({"index": index, "ok": True, "id": task_id})
+                planned.append((index, found[0], found[1], status, str(update.get("note") or "").strip()))
+
+            failed = len(updates) - len(planned)
+            if atomic and failed:
+                return {"results": results, "updated": 0, "failed": failed, "committed": False}
+
+            now = iso_utc(utc_now())
+            version = 0
+            # Repeated ids in one batch apply in order to the same stored task.
+            latest: dict[int, dict[str, Any]] = {}
+            with self._conn:
+                for index, seq, task, status, note in planned:
+                    task = latest.get(seq, task)
+                    version = self._apply_status(seq, task, status, note, now)
+                    latest[seq] = task
+                    results[index]["item"] = self._normalize_task(task)
+                if version:
+                    self._trim_changes(version)
+            self._finish_write(version, now)
+            return {"results": results, "updated": len(planned), "failed": failed, "committed": True, "version": version}
+
+    @staticmethod
+    def _task_request_fields(request: dict[str, Any], source: str) -> dict[str, Any]:
+        return {
+            "title": str(request.get("title") or ""),
+            "details": str(request.get("details") or ""),
+            "repo": str(request.get("repo") or "*"),
+            "repo_path": str(request.get("repo_path") or ""),
+            "priority": safe_int(request.get("priority"), 3),
+            "route_model": str(request.get("route_model") or ""),
+            "route_mode": str(request.get("route_mode") or ""),
+            "route_reason": str(request.get("route_reason") or ""),
+            "route_claimed_count": safe_int(request.get("route_claimed_count"), 0),
+            "route_updated_at": str(request.get("route_updated_at") or ""),
+            "is_interrupt": to_bool(request.get("is_interrupt")),
+            "source": str(request.get("source") or source),
+        }
 
 
 class LaunchPresetStore:
@@ -1955,6 +4234,105 @@ class LaunchPresetStore:
             return True
 
 
+class ControlJobs:
+    """Stop/restart/normalize requests run off the HTTP thread, one at a time.
+
+    Each job keeps a progress log; on_change is called whenever a job moves so the
+    SSE streams can push it.
+    """
+
+    def __init__(self, keep: int = CONTROL_JOBS_KEEP):
+        self.keep = keep
+        self.on_change: Callable[[], None] | None = None
+        self.version = 0
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._seq = 0
+        self._pool: ThreadPoolExecutor | None = None
+
+    def submit(self, kind: str, fn: Callable[[Callable[..., None]], dict[str, Any]]) -> dict[str, Any]:
+        """Queue fn(progress) and return the job record; progress(stage, **detail) appends to its log."""
+        now = utc_now()
+        with self._lock:
+            self._seq += 1
+            job_id = f"job-{now.strftime('%Y%m%d-%H%M%S')}-{self._seq}"
+            job: dict[str, Any] = {
+                "id": job_id,
+                "kind": kind,
+                "status": "queued",
+                "ok": None,
+                "created_at": iso_utc(now),
+                "started_at": "",
+                "finished_at": "",
+                "stage": "queued",
+                "progress": [],
+                "error": "",
+                "result": None,
+            }
+            self._jobs[job_id] = job
+            finished = [key for key, item in self._jobs.items() if item["status"] in {"done", "failed"}]
+            for key in finished[: max(0, len(self._jobs) - self.keep)]:
+                del self._jobs[key]
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="control-job")
+            pool = self._pool
+            record = self._summary(job)
+        pool.submit(self._run, job, fn)
+        self._changed()
+        return record
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return {**job, "progress": list(job["progress"])} if job else None
+
+    def recent(self, limit: int = 10) -> list[dict[str, Any]]:
+        with self._lock:
+            jobs = list(self._jobs.values())[-max(0, limit) :]
+            return [self._summary(job) for job in reversed(jobs)]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counts: dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+            return {"jobs": len(self._jobs), "version": self.version, **counts}
+
+    def _summary(self, job: dict[str, Any]) -> dict[str, Any]:
+        return {key: (list(value) if key == "progress" else value) for key, value in job.items() if key != "result"}
+
+    def _run(self, job: dict[str, Any], fn: Callable[[Callable[..., None]], dict[str, Any]]) -> None:
+        def progress(stage: str, **detail: Any) -> None:
+            with self._lock:
+                job["stage"] = stage
+                job["progress"].append({"at": iso_utc(utc_now()), "stage": stage, **detail})
+            self._changed()
+
+        with self._lock:
+            job["status"] = "running"
+            job["started_at"] = iso_utc(utc_now())
+        progress("started")
+        try:
+            result = fn(progress)
+            error = "" if result.get("ok") else str(result.get("error") or result.get("message") or "")
+        except Exception as exc:  # noqa: BLE001
+            result, error = None, str(exc)
+        with self._lock:
+            job["result"] = result
+            job["ok"] = bool(result and result.get("ok"))
+            job["status"] = "done" if result is not None else "failed"
+            job["stage"] = "finished"
+            job["error"] = error
+            job["finished_at"] = iso_utc(utc_now())
+        self._changed()
+
+    def _changed(self) -> None:
+        with self._lock:
+            self.version += 1
+        if self.on_change is not None:
+            self.on_change()
+
+
 class RunController:
     def __init__(self, clone_root: Path, logs_dir: Path, monitor: CloneMonitor):
         self.clone_root = clone_root
@@ -1962,6 +4340,10 @@ class RunController:
         self.monitor = monitor
         self.script_path = clone_root / "scripts" / "run_clone_loop.sh"
         self.managed_state_path = logs_dir / "control-plane-managed.json"
+        self.jobs = ControlJobs()
+        # Set by main(): launched loops share this queue and claim through this server.
+        self.task_queue_file: Path | None = None
+        self.task_claim_url = ""
 
     def _load_managed_state(self) -> dict[str, Any]:
         if not self.managed_state_path.exists():
@@ -1991,56 +4373,23 @@ class RunController:
             return False
 
     def _pid_command(self, pid: int) -> str:
-        if pid <= 0:
-            return ""
-        try:
-            proc = subprocess.run(
-                ["ps", "-o", "command=", "-p", str(pid)],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-        except OSError:
-            return ""
-        if proc.returncode != 0:
-            return ""
-        return proc.stdout.strip()
+        info = PROCESS_TABLE.get(pid)
+        return info.command if info else ""
 
     def _pid_is_loop(self, pid: int) -> bool:
         command = self._pid_command(pid)
         return "run_clone_loop.sh" in command
 
-    def _all_loop_processes(self) -> list[dict[str, Any]]:
-        try:
-            proc = subprocess.run(
-                ["ps", "-axo", "pid=,pgid=,etime=,command="],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-        except OSError:
-            return []
-        if proc.returncode != 0:
-            return []
+    def _all_loop_processes(self, max_age: float | None = None) -> list[dict[str, Any]]:
         processes: list[dict[str, Any]] = []
-        for line in proc.stdout.splitlines():
-            raw = line.strip()
-            if not raw:
-                continue
-            parts = raw.split(None, 3)
-            if len(parts) < 4:
-                continue
-            pid = safe_int(parts[0], 0)
-            pgid = safe_int(parts[1], 0)
-            etimes = parse_etime_seconds(parts[2])
-            command = parts[3]
-            if pid > 0 and "run_clone_loop.sh" in command:
+        for info in PROCESS_TABLE.processes(max_age).values():
+            if "run_clone_loop.sh" in info.command:
                 processes.append(
                     {
-                        "pid": pid,
-                        "pgid": pgid,
-                        "etimes": etimes,
-                        "command": command,
+                        "pid": info.pid,
+                        "pgid": info.pgid,
+                        "etimes": info.etimes,
+                        "command": info.command,
                     }
                 )
         processes.sort(key=lambda item: (safe_int(item.get("etimes"), 0), safe_int(item.get("pid"), 0)))
@@ -2078,6 +4427,7 @@ class RunController:
     def _signal_pgid(self, pgid: int, sig: int) -> bool:
         if pgid <= 0:
             return False
+        PROCESS_TABLE.invalidate()
         try:
             os.killpg(pgid, sig)
             return True
@@ -2087,6 +4437,7 @@ class RunController:
     def _signal_pid(self, pid: int, sig: int) -> bool:
         if pid <= 0:
             return False
+        PROCESS_TABLE.invalidate()
         # Prefer signaling the process group. For non-leader processes, fall back to direct PID.
         try:
             os.killpg(pid, sig)
@@ -2270,8 +4621,8 @@ class RunController:
         tmp_path.replace(self.monitor.repos_file)
         with self.monitor._cache_lock:
             self.monitor._repos_cache = None
-            self.monitor._commit_cache.clear()
-            self.monitor._run_detailed_commits_cache.clear()
+        self.monitor._commit_cache.clear()
+        self.monitor._run_detailed_commits_cache.clear()
 
     def _upsert_catalog_entries(self, entries: list[dict[str, Any]], code_root: Path) -> tuple[int, int]:
         payload = self._read_repos_payload()
@@ -2363,7 +4714,7 @@ class RunController:
 
         catalog_payload = self._read_repos_payload()
         catalog_paths = {str(item.get("path") or "").strip() for item in catalog_payload.get("repos", []) if isinstance(item, dict)}
-        repos = discover_local_git_repos(
+        repos, indexed_at = self.monitor.local_repo_index.repos(
             code_root=code_root,
             max_depth=max_depth,
             limit=limit,
@@ -2375,8 +4726,23 @@ class RunController:
             "code_root": str(code_root),
             "count": len(repos),
             "repos": repos,
+            "indexed_at": indexed_at,
         }
 
+    def refresh_local_repos(self, request: dict[str, Any] | None = None) -> dict[str, Any]:
+        request = request or {}
+        code_root = self._resolve_code_root(request.get("code_root"))
+        max_depth = max(1, min(safe_int(request.get("max_depth"), 8), 16))
+        if not code_root.is_dir():
+            return {"ok": False, "error": f"code_root is not a directory: {code_root}", "code_root": str(code_root)}
+        result = self.monitor.local_repo_index.refresh(
+            code_root,
+            max_depth=max_depth,
+            extra_ignored_dirs=scan_ignored_dirs_from_env(),
+            full=to_bool(request.get("full")),
+        )
+        return {"ok": True, **result}
+
     def github_status(self, request: dict[str, Any] | None = None) -> dict[str, Any]:
         request = request or {}
         code_root = self._resolve_code_root(request.get("code_root"))
@@ -2729,6 +5095,10 @@ class RunController:
             env["REPOS_FILE"] = selected_repos_file
         if model:
             env["MODEL"] = model
+        if self.task_queue_file is not None:
+            env["TASK_QUEUE_FILE"] = str(self.task_queue_file)
+        if self.task_claim_url and not env.get("TASK_QUEUE_CLAIM_URL"):
+            env["TASK_QUEUE_CLAIM_URL"] = self.task_claim_url
 
         launcher_log = self.logs_dir / f"control-plane-launcher-{run_tag}.log"
 
@@ -2777,8 +5147,11 @@ class RunController:
             "control_status": self.status_payload(),
         }
 
-    def stop_run(self, request: dict[str, Any] | None = None) -> dict[str, Any]:
+    def stop_run(
+        self, request: dict[str, Any] | None = None, progress: Callable[..., None] | None = None
+    ) -> dict[str, Any]:
         request = request or {}
+        progress = progress or (lambda stage, **detail: None)
         force = self._to_bool(request.get("force", False))
         wait_seconds = max(2, min(safe_int(request.get("wait_seconds"), 12), 30))
 
@@ -2821,21 +5194,17 @@ class RunController:
             self._signal_pid(pid, signal.SIGTERM)
         for group_id in list(candidate_groups):
             self._signal_pgid(group_id, signal.SIGTERM)
+        progress("sigterm_sent", pids=candidate_pids, groups=sorted(candidate_groups))
 
-        deadline = time.time() + wait_seconds
-        while time.time() < deadline:
-            if not any(self._pid_alive(pid) for pid in candidate_pids):
-                break
-            time.sleep(0.25)
-
-        still_alive = [pid for pid in candidate_pids if self._pid_alive(pid)]
+        still_alive = wait_for_pids_exit(candidate_pids, wait_seconds)
         if still_alive and force:
+            progress("sigkill_sent", pids=still_alive)
             for group_id in list(candidate_groups):
                 self._signal_pgid(group_id, signal.SIGKILL)
             for pid in still_alive:
                 self._signal_pid(pid, signal.SIGKILL)
-            time.sleep(0.2)
-            still_alive = [pid for pid in candidate_pids if self._pid_alive(pid)]
+            still_alive = wait_for_pids_exit(still_alive, 2.0)
+        progress("stopped" if not still_alive else "still_alive", pids=still_alive)
 
         return {
             "ok": len(still_alive) == 0,
@@ -2846,10 +5215,32 @@ class RunController:
             "control_status": self.status_payload(),
         }
 
-    def restart_run(self, request: dict[str, Any] | None = None) -> dict[str, Any]:
+    def current_launch_request(self) -> dict[str, Any]:
+        """start_run parameters that reproduce the managed run's settings, including its repo selection."""
+        settings = self._load_managed_state().get("settings")
+        settings = settings if isinstance(settings, dict) else {}
+        request: dict[str, Any] = {
+            key: settings[key] for key in ("parallel_repos", "max_cycles", "tasks_per_repo", "model") if settings.get(key)
+        }
+        repos_file = str(settings.get("repos_file") or "")
+        if repos_file.endswith("-repos.json"):
+            try:
+                selected = json.loads(Path(repos_file).read_text(encoding="utf-8")).get("repos")
+            except (OSError, json.JSONDecodeError, AttributeError):
+                selected = None
+            if isinstance(selected, list) and selected:
+                request["repos"] = selected
+        return request
+
+    def restart_run(
+        self, request: dict[str, Any] | None = None, progress: Callable[..., None] | None = None
+    ) -> dict[str, Any]:
         request = request or {}
-        stop_payload = self.stop_run({"force": True, "wait_seconds": request.get("wait_seconds", 12)})
+        progress = progress or (lambda stage, **detail: None)
+        stop_payload = self.stop_run({"force": True, "wait_seconds": request.get("wait_seconds", 12)}, progress=progress)
+        progress("starting")
         start_payload = self.start_run(request)
+        progress("started_run" if start_payload.get("ok") else "start_failed")
         return {
             "ok": bool(start_payload.get("ok")),
             "stop": stop_payload,
@@ -2857,8 +5248,11 @@ class RunController:
             "control_status": self.status_payload(),
         }
 
-    def normalize_loops(self, request: dict[str, Any] | None = None) -> dict[str, Any]:
+    def normalize_loops(
+        self, request: dict[str, Any] | None = None, progress: Callable[..., None] | None = None
+    ) -> dict[str, Any]:
         request = request or {}
+        progress = progress or (lambda stage, **detail: None)
         force = self._to_bool(request.get("force", True))
         wait_seconds = max(2, min(safe_int(request.get("wait_seconds"), 8), 30))
         explicit_keep_pgid = safe_int(request.get("keep_pgid"), 0)
@@ -2913,28 +5307,26 @@ class RunController:
             if not self._signal_pgid(pgid, signal.SIGTERM):
                 for pid in groups.get(pgid, []):
                     self._signal_pid(pid, signal.SIGTERM)
+        progress("sigterm_sent", groups=groups_to_stop, kept_group=keep_pgid)
 
-        deadline = time.time() + wait_seconds
-        while time.time() < deadline:
-            current = self._all_loop_processes()
-            alive_groups = {safe_int(item.get("pgid"), 0) for item in current if safe_int(item.get("pgid"), 0) > 0}
-            if not any(pgid in alive_groups for pgid in groups_to_stop):
-                break
-            time.sleep(0.2)
-
-        current = self._all_loop_processes()
+        # Wait on the loop pids we saw, then re-scan once in case a group forked new ones meanwhile.
+        wait_for_pids_exit([pid for pgid in groups_to_stop for pid in groups.get(pgid, [])], wait_seconds)
+        current = self._all_loop_processes(max_age=0)
         alive_groups = {safe_int(item.get("pgid"), 0) for item in current if safe_int(item.get("pgid"), 0) > 0}
         still_alive_groups = [pgid for pgid in groups_to_stop if pgid in alive_groups]
 
         if still_alive_groups and force:
+            progress("sigkill_sent", groups=still_alive_groups)
             for pgid in still_alive_groups:
                 if not self._signal_pgid(pgid, signal.SIGKILL):
                     for pid in groups.get(pgid, []):
                         self._signal_pid(pid, signal.SIGKILL)
-            time.sleep(0.25)
-            current = self._all_loop_processes()
+            alive_pids = [safe_int(item.get("pid"), 0) for item in current if safe_int(item.get("pgid"), 0) in still_alive_groups]
+            wait_for_pids_exit(alive_pids, 2.0)
+            current = self._all_loop_processes(max_age=0)
             alive_groups = {safe_int(item.get("pgid"), 0) for item in current if safe_int(item.get("pgid"), 0) > 0}
             still_alive_groups = [pgid for pgid in groups_to_stop if pgid in alive_groups]
+        progress("normalized" if not still_alive_groups else "still_alive", groups=still_alive_groups)
 
         return {
             "ok": len(still_alive_groups) == 0,
@@ -2946,6 +5338,549 @@ class RunController:
         }
 
 
+class ResourceSampler:
+    """Periodic CPU/RSS/I/O samples of each live run worker's process tree, plus host load.
+
+    Samples land in per-worker ring buffers for the last RESOURCE_RUNS_KEEP runs. I/O
+    counters add up per-pid deltas so a worker's totals keep growing after its child
+    processes exit; CPU time includes reaped children through cutime/cstime.
+    """
+
+    def __init__(
+        self,
+        controller: RunController,
+        interval_seconds: float = RESOURCE_SAMPLE_SECONDS,
+        max_samples: int = RESOURCE_SAMPLES_PER_WORKER,
+        proc_root: Path = Path("/proc"),
+    ):
+        self.controller = controller
+        self.interval_seconds = interval_seconds
+        self.max_samples = max_samples
+        self.proc_root = proc_root
+        self.available = (proc_root / "self" / "stat").exists()
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self._clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._lock = threading.Lock()
+        self._runs: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._host: deque[dict[str, Any]] = deque(maxlen=RESOURCE_HOST_SAMPLES)
+        self._host_cpu: tuple[int, int] | None = None
+        self._pid_io: dict[int, tuple[int, int]] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stats = {"samples": 0, "worker_samples": 0, "errors": 0}
+
+    def start(self) -> None:
+        if not self.available or self.interval_seconds <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="clone-resource-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.sample_once()
+            except Exception:  # noqa: BLE001 - a bad read must not stop sampling.
+                with self._lock:
+                    self._stats["errors"] += 1
+
+    def sample_once(self) -> None:
+        now = time.monotonic()
+        at = iso_utc(utc_now())
+        host = self._sample_host(at)
+        run_id = str((self.controller.monitor.latest_run() or {}).get("run_id") or "")
+        workers = [item for item in self.controller._run_worker_statuses(run_id) if item.get("pid_alive")] if run_id else []
+        children: dict[int, list[int]] = {}
+        if workers:
+            for info in PROCESS_TABLE.processes(max_age=0).values():
+                children.setdefault(info.ppid, []).append(info.pid)
+
+        seen_io: dict[int, tuple[int, int]] = {}
+        readings: list[tuple[dict[str, Any], dict[str, Any]]] = []
+        for worker in workers:
+            usage = {"processes": 0, "cpu_seconds": 0.0, "rss_bytes": 0, "read_delta": 0, "write_delta": 0}
+            for pid in self._process_tree(safe_int(worker.get("pid"), 0), children):
+                reading = self._read_pid(pid)
+                if reading is None:
+                    continue
+                cpu_seconds, rss_bytes, io = reading
+                usage["processes"] += 1
+                usage["cpu_seconds"] += cpu_seconds
+                usage["rss_bytes"] += rss_bytes
+                if io is not None:
+                    previous = self._pid_io.get(pid, (0, 0))
+                    usage["read_delta"] += io[0] - previous[0] if io[0] >= previous[0] else io[0]
+                    usage["write_delta"] += io[1] - previous[1] if io[1] >= previous[1] else io[1]
+                    seen_io[pid] = io
+            readings.append((worker, usage))
+
+        with self._lock:
+            self._pid_io = seen_io
+            if host is not None:
+                self._host.append(host)
+            self._stats["samples"] += 1
+            if not readings:
+                return
+            run = self._runs.get(run_id)
+            if run is None:
+                run = {"workers": {}, "repos": {}}
+                self._runs[run_id] = run
+                while len(self._runs) > RESOURCE_RUNS_KEEP:
+                    self._runs.popitem(last=False)
+            self._runs.move_to_end(run_id)
+            for worker, usage in readings:
+                self._record_worker(run, worker, usage, at, now)
+
+    def _record_worker(self, run: dict[str, Any], worker: dict[str, Any], usage: dict[str, Any], at: str, now: float) -> None:
+        key = Path(str(worker.get("file") or "")).stem or f"pid-{worker.get('pid')}"
+        repo = str(worker.get("repo") or "")
+        state = run["workers"].get(key)
+        if state is None or state["pid"] != safe_int(worker.get("pid"), 0):
+            state = {
+                "worker": key,
+                "pid": safe_int(worker.get("pid"), 0),
+                "cpu_seconds": 0.0,
+                "read_bytes": 0,
+                "write_bytes": 0,
+                "peak_rss_bytes": 0,
+                "sampled_at": 0.0,
+                "samples": deque(maxlen=self.max_samples),
+            }
+            run["workers"][key] = state
+        # Tree CPU can dip when a child exits before its parent reaps it; keep the counter monotonic.
+        cpu_total = max(state["cpu_seconds"], usage["cpu_seconds"])
+        cpu_delta = cpu_total - state["cpu_seconds"] if state["samples"] else 0.0
+        elapsed = now - state["sampled_at"] if state["samples"] else 0.0
+        state["cpu_seconds"] = cpu_total
+        state["read_bytes"] += usage["read_delta"]
+        state["write_bytes"] += usage["write_delta"]
+        state["peak_rss_bytes"] = max(state["peak_rss_bytes"], usage["rss_bytes"])
+        state["sampled_at"] = now
+        state["repo"] = repo
+        state["state"] = str(worker.get("state") or "")
+        state["samples"].append(
+            {
+                "at": at,
+                "repo": repo,
+                "state": state["state"],
+                "processes": usage["processes"],
+                "cpu_seconds": round(cpu_total, 2),
+                "cpu_percent": round(min(cpu_delta / elapsed, os.cpu_count() or 1) * 100.0, 1) if elapsed > 0 else 0.0,
+                "rss_bytes": usage["rss_bytes"],
+                "read_bytes": state["read_bytes"],
+                "write_bytes": state["write_bytes"],
+            }
+        )
+        totals = run["repos"].setdefault(
+            repo, {"repo": repo, "cpu_seconds": 0.0, "read_bytes": 0, "write_bytes": 0, "peak_rss_bytes": 0, "worker_samples": 0}
+        )
+        totals["cpu_seconds"] += cpu_delta
+        totals["read_bytes"] += usage["read_delta"]
+        totals["write_bytes"] += usage["write_delta"]
+        totals["peak_rss_bytes"] = max(totals["peak_rss_bytes"], usage["rss_bytes"])
+        totals["worker_samples"] += 1
+        self._stats["worker_samples"] += 1
+
+    def _process_tree(self, root_pid: int, children: dict[int, list[int]]) -> list[int]:
+        if root_pid <= 0:
+            return []
+        pids = [root_pid]
+        index = 0
+        while index < len(pids):
+            pids.extend(children.get(pids[index], []))
+            index += 1
+        return pids
+
+    def _read_pid(self, pid: int) -> tuple[float, int, tuple[int, int] | None] | None:
+        base = self.proc_root / str(pid)
+        try:
+            stat_text = (base / "stat").read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return None
+        fields = stat_text[stat_text.rfind(")") + 2 :].split()
+        if len(fields) < 22:
+            return None
+        # utime, stime, cutime, cstime follow the fault counters; rss is in pages.
+        ticks = sum(safe_int(value, 0) for value in fields[11:15])
+        rss_bytes = safe_int(fields[21], 0) * self._page_size
+        io: tuple[int, int] | None = None
+        try:
+            counters = dict(line.split(": ", 1) for line in (base / "io").read_text().splitlines() if ": " in line)
+            io = (safe_int(counters.get("read_bytes"), 0), safe_int(counters.get("write_bytes"), 0))
+        except OSError:
+            pass
+        return ticks / max(1, self._clock_ticks), rss_bytes, io
+
+    def _sample_host(self, at: str) -> dict[str, Any] | None:
+        try:
+            load = (self.proc_root / "loadavg").read_text().split()
+            cpu_line = (self.proc_root / "stat").read_text().splitlines()[0].split()
+            meminfo = {
+                line.split(":", 1)[0]: safe_int(line.split(":", 1)[1].split()[0], 0) * 1024
+                for line in (self.proc_root / "meminfo").read_text().splitlines()
+                if ":" in line and line.split(":", 1)[1].split()
+            }
+        except (OSError, IndexError):
+            return None
+        ticks = [safe_int(value, 0) for value in cpu_line[1:9]]
+        total = sum(ticks)
+        busy = total - ticks[3] - (ticks[4] if len(ticks) > 4 else 0)
+        busy_percent = None
+        if self._host_cpu is not None and total > self._host_cpu[1]:
+            busy_percent = round((busy - self._host_cpu[0]) * 100.0 / (total - self._host_cpu[1]), 1)
+        self._host_cpu = (busy, total)
+        return {
+            "at": at,
+            "cpu_count": os.cpu_count() or 1,
+            "cpu_busy_percent": busy_percent,
+            "load1": float(load[0]),
+            "load5": float(load[1]),
+            "load15": float(load[2]),
+            "mem_total_bytes": meminfo.get("MemTotal", 0),
+            "mem_available_bytes": meminfo.get("MemAvailable", 0),
+        }
+
+    def worker_averages(self) -> dict[str, Any]:
+        """Mean CPU percent and RSS per worker sample in the most recently sampled run."""
+        with self._lock:
+            if not self._runs:
+                return {}
+            run_id, run = next(reversed(self._runs.items()))
+            samples = [sample for state in run["workers"].values() for sample in state["samples"]]
+            latest_at = max((state["sampled_at"] for state in run["workers"].values()), default=0.0)
+            live = sum(1 for state in run["workers"].values() if state["sampled_at"] >= latest_at)
+        if not samples:
+            return {}
+        return {
+            "run_id": run_id,
+            "samples": len(samples),
+            "live_workers": live,
+            "avg_cpu_percent": round(sum(sample["cpu_percent"] for sample in samples) / len(samples), 1),
+            "avg_rss_bytes": int(sum(sample["rss_bytes"] for sample in samples) / len(samples)),
+        }
+
+    def host_samples(self, limit: int = RESOURCE_HOST_SAMPLES) -> list[dict[str, Any]]:
+        with self._lock:
+            return list(self._host)[-max(0, limit) :] if limit > 0 else []
+
+    def run_resources(self, run_id: str, limit: int = 120) -> dict[str, Any]:
+        """Per-worker series (last `limit` samples each) and per-repo totals for one run."""
+        with self._lock:
+            run = self._runs.get(run_id)
+            host = self._host[-1] if self._host else None
+            workers: list[dict[str, Any]] = []
+            repos: list[dict[str, Any]] = []
+            if run is not None:
+                latest_at = max((state["sampled_at"] for state in run["workers"].values()), default=0.0)
+                current: dict[str, dict[str, float]] = {}
+                for state in run["workers"].values():
+                    samples = list(state["samples"])
+                    live = state["sampled_at"] >= latest_at
+                    if live and samples:
+                        usage = current.setdefault(state["repo"], {"cpu_percent": 0.0, "rss_bytes": 0, "workers": 0})
+                        usage["cpu_percent"] += samples[-1]["cpu_percent"]
+                        usage["rss_bytes"] += samples[-1]["rss_bytes"]
+                        usage["workers"] += 1
+                    workers.append(
+                        {
+                            "worker": state["worker"],
+                            "pid": state["pid"],
+                            "repo": state["repo"],
+                            "state": state["state"],
+                            "live": live,
+                            "cpu_seconds": round(state["cpu_seconds"], 2),
+                            "read_bytes": state["read_bytes"],
+                            "write_bytes": state["write_bytes"],
+                            "peak_rss_bytes": state["peak_rss_bytes"],
+                            "latest": samples[-1] if samples else None,
+                            "samples": samples[-limit:] if limit > 0 else [],
+                        }
+                    )
+                for totals in run["repos"].values():
+                    usage = current.get(totals["repo"], {})
+                    repos.append(
+                        {
+                            **totals,
+                            "cpu_seconds": round(totals["cpu_seconds"], 2),
+                            "cpu_percent": round(usage.get("cpu_percent", 0.0), 1),
+                            "rss_bytes": int(usage.get("rss_bytes", 0)),
+                            "live_workers": int(usage.get("workers", 0)),
+                        }
+                    )
+        workers.sort(key=lambda item: item["worker"])
+        repos.sort(key=lambda item: item["cpu_seconds"], reverse=True)
+        return {
+            "run_id": run_id,
+            "available": self.available and self.interval_seconds > 0,
+            "interval_seconds": self.interval_seconds,
+            "sampled": run is not None,
+            "host": host,
+            "workers": workers,
+            "repos": repos,
+        }
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "available": self.available,
+                "interval_seconds": self.interval_seconds,
+                "running": self._thread is not None and not self._stop.is_set(),
+                "runs": len(self._runs),
+                "host_samples": len(self._host),
+                **self._stats,
+            }
+
+
+def fit_usl(points: list[tuple[float, float, float]]) -> tuple[float, float, float] | None:
+    """Weighted least-squares fit of X(p) = a*p / (1 + s*(p-1) + k*p*(p-1)) over (p, X, weight).
+
+    Returns (a, s, k). s (contention) and k (coherency) are grid-searched; a has a
+    closed form for each pair.
+    """
+    if len(points) < 3:
+        return None
+    best: tuple[float, float, float, float] | None = None
+    for s_step in range(0, 101, 2):
+        contention = s_step / 100.0
+        for k_step in range(0, 51):
+            coherency = k_step * 0.002
+            shape = [p / (1.0 + contention * (p - 1) + coherency * p * (p - 1)) for p, _, _ in points]
+            denominator = sum(weight * value * value for (_, _, weight), value in zip(points, shape))
+            if denominator <= 0:
+                continue
+            scale = sum(weight * x * value for (_, x, weight), value in zip(points, shape)) / denominator
+            error = sum(weight * (x - scale * value) ** 2 for (_, x, weight), value in zip(points, shape))
+            if best is None or error < best[0]:
+                best = (error, scale, contention, coherency)
+    return best[1:] if best else None
+
+
+class CapacityAdvisor:
+    """Recommends PARALLEL_REPOS from finished runs and sampled host load.
+
+    Throughput (commits per hour, or changed repos per hour when no run logged commits)
+    is grouped by the parallelism each run used and fitted with the Universal
+    Scalability Law. The fitted knee is then adjusted for lock skips, idle cycles,
+    repo count and the CPU/memory headroom measured by the resource sampler.
+    """
+
+    def __init__(
+        self,
+        monitor: CloneMonitor,
+        controller: RunController,
+        sampler: ResourceSampler | None = None,
+        history_runs: int = CAPACITY_HISTORY_RUNS,
+    ):
+        self.monitor = monitor
+        self.controller = controller
+        self.sampler = sampler
+        self.history_runs = history_runs
+        self._lock = threading.Lock()
+        self._commit_counts: dict[str, tuple[tuple[int, int], int]] = {}
+        self._cached: tuple[Any, dict[str, Any]] | None = None
+
+    def recommendation(self) -> dict[str, Any]:
+        entries = self.monitor.run_index.refresh()[: self.history_runs]
+        key = (tuple(entries), int(time.time() // CAPACITY_CACHE_SECONDS))
+        with self._lock:
+            if self._cached is not None and self._cached[0] == key:
+                return self._cached[1]
+        payload = self._compute([run_id for _, run_id in entries])
+        with self._lock:
+            self._cached = (key, payload)
+        return payload
+
+    def _run_commit_count(self, run_id: str) -> int:
+        _, _, run_log_path = self.monitor._run_paths(run_id)
+        stamp = file_stamp(run_log_path)
+        with self._lock:
+            cached = self._commit_counts.get(run_id)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        count = len(self.monitor._extract_run_commit_hashes(run_id))
+        with self._lock:
+            self._commit_counts[run_id] = (stamp, count)
+        return count
+
+    def _levels(self, run_ids: list[str]) -> tuple[list[dict[str, Any]], int, int]:
+        runs: list[tuple[RunSummary, int]] = []
+        repo_count = 0
+        for run_id in run_ids:
+            summary = self.monitor._summarize_run(run_id)
+            repo_count = repo_count or summary.repo_count
+            if run_is_online(summary.state, pid=summary.pid) or summary.parallel_repos <= 0:
+                continue
+            if summary.duration_seconds < CAPACITY_MIN_RUN_SECONDS:
+                continue
+            runs.append((summary, self._run_commit_count(run_id)))
+        use_commits = any(commits for _, commits in runs)
+
+        grouped: dict[int, dict[str, float]] = {}
+        for summary, commits in runs:
+            level = grouped.setdefault(
+                summary.parallel_repos,
+                {"runs": 0, "seconds": 0, "commits": 0, "changed": 0, "spawned": 0, "skipped_lock": 0, "cycles": 0, "no_workers": 0},
+            )
+            level["runs"] += 1
+            level["seconds"] += summary.duration_seconds
+            level["commits"] += commits
+            level["changed"] += summary.repos_changed_est
+            level["spawned"] += summary.spawned_workers
+            level["skipped_lock"] += summary.repos_skipped_lock
+            level["cycles"] += summary.cycles_seen
+            level["no_workers"] += summary.no_workers_events
+
+        rows: list[dict[str, Any]] = []
+        for parallel in sorted(grouped):
+            level = grouped[parallel]
+            hours = level["seconds"] / 3600.0
+            output = level["commits"] if use_commits else level["changed"]
+            rows.append(
+                {
+                    "parallel_repos": parallel,
+                    "runs": int(level["runs"]),
+                    "hours": round(hours, 2),
+                    "throughput_per_hour": round(output / hours, 2),
+                    "commits_per_hour": round(level["commits"] / hours, 2),
+                    "changed_repos_per_hour": round(level["changed"] / hours, 2),
+                    "lock_skip_ratio": round(level["skipped_lock"] / max(1, level["skipped_lock"] + level["spawned"]), 3),
+                    "no_workers_per_cycle": round(level["no_workers"] / max(1, level["cycles"]), 3),
+                    "avg_cycle_seconds": int(level["seconds"] / max(1, level["cycles"])),
+                }
+            )
+        return rows, len(runs), repo_count
+
+    def _host_limits(self) -> dict[str, Any]:
+        if self.sampler is None:
+            return {}
+        host_samples = self.sampler.host_samples()
+        workers = self.sampler.worker_averages()
+        limits: dict[str, Any] = {"workers": workers}
+        if host_samples:
+            latest = host_samples[-1]
+            busy = [sample["cpu_busy_percent"] for sample in host_samples if sample.get("cpu_busy_percent") is not None]
+            limits.update(
+                {
+                    "cpu_count": latest["cpu_count"],
+                    "load1": latest["load1"],
+                    "avg_cpu_busy_percent": round(sum(busy) / len(busy), 1) if busy else None,
+                    "mem_available_bytes": latest["mem_available_bytes"],
+                }
+            )
+            worker_cpu = float(workers.get("avg_cpu_percent") or 0.0)
+            if worker_cpu >= 1.0:
+                limits["cpu_limit"] = max(1, int(latest["cpu_count"] * 100.0 * CAPACITY_CPU_TARGET / worker_cpu))
+            worker_rss = safe_int(workers.get("avg_rss_bytes"), 0)
+            if worker_rss > 0 and latest["mem_available_bytes"] > 0:
+                limits["memory_limit"] = max(
+                    1, safe_int(workers.get("live_workers"), 0) + int(latest["mem_available_bytes"] * 0.8 / worker_rss)
+                )
+        return limits
+
+    def _current_parallel(self, run_ids: list[str]) -> int:
+        settings = self.controller._load_managed_state().get("settings")
+        if isinstance(settings, dict) and safe_int(settings.get("parallel_repos"), 0) > 0:
+            return safe_int(settings.get("parallel_repos"), 0)
+        for run_id in run_ids[:1]:
+            parallel = self.monitor._summarize_run(run_id).parallel_repos
+            if parallel > 0:
+                return parallel
+        return 5
+
+    def _compute(self, run_ids: list[str]) -> dict[str, Any]:
+        rows, runs_considered, repo_count = self._levels(run_ids)
+        current = self._current_parallel(run_ids)
+        host = self._host_limits()
+        reasons: list[str] = []
+        model: dict[str, Any] = {"kind": "usl", "fitted": False}
+        by_level = {row["parallel_repos"]: row for row in rows}
+        max_tried = max(by_level, default=current)
+
+        fit = fit_usl([(row["parallel_repos"], row["throughput_per_hour"], row["hours"]) for row in rows])
+        if fit is not None:
+            scale, contention, coherency = fit
+            peak = (1.0 - contention) / coherency if coherency > 0 else None
+            peak = peak**0.5 if peak is not None else None
+            horizon = max(1, min(64, max_tried + 2, int(peak) if peak else 64))
+
+            def predicted(p: int) -> float:
+                return scale * p / (1.0 + contention * (p - 1) + coherency * p * (p - 1))
+
+            best = max(range(1, horizon + 1), key=predicted)
+            # The knee: the fewest workers that still get 95% of the best predicted throughput.
+            candidate = next(p for p in range(1, best + 1) if predicted(p) >= 0.95 * predicted(best))
+            model.update(
+                {
+                    "fitted": True,
+                    "alpha": round(scale, 3),
+                    "contention": round(contention, 3),
+                    "coherency": round(coherency, 4),
+                    "peak_parallel_repos": round(peak, 1) if peak else None,
+                }
+            )
+            reasons.append(f"Throughput fit over {len(rows)} parallelism levels flattens out at {candidate}.")
+        elif len(rows) == 2:
+            low, high = rows
+            if high["throughput_per_hour"] >= low["throughput_per_hour"] * 1.1:
+                candidate = high["parallel_repos"]
+                reasons.append(f"{candidate} parallel repos produced at least 10% more per hour than {low['parallel_repos']}.")
+            else:
+                candidate = low["parallel_repos"]
+                reasons.append(f"Going from {low['parallel_repos']} to {high['parallel_repos']} did not add 10% throughput.")
+        elif rows:
+            candidate = rows[0]["parallel_repos"]
+            reasons.append(f"Only {candidate} parallel repos has been observed so far.")
+        else:
+            candidate = current
+            reasons.append("No finished runs with a known parallelism yet; keeping the current setting.")
+
+        observed = by_level.get(candidate)
+        if observed and observed["lock_skip_ratio"] >= CAPACITY_LOCK_RATIO_HIGH and candidate > 1:
+            candidate -= 1
+            reasons.append(f"{observed['lock_skip_ratio']:.0%} of repo starts hit an active lock at {observed['parallel_repos']}; stepping down.")
+        elif observed and observed["no_workers_per_cycle"] >= 0.5:
+            reasons.append("Half of the cycles spawned no workers at this level; more parallelism would sit idle.")
+        elif observed and candidate == max_tried and observed["lock_skip_ratio"] < 0.1 and fit is None and rows:
+            busy = host.get("avg_cpu_busy_percent")
+            if busy is not None and busy < 70:
+                candidate += 1
+                reasons.append(f"Low lock contention and {busy:.0f}% host CPU; trying one more parallel repo.")
+
+        for limit_key, label in (("cpu_limit", "CPU"), ("memory_limit", "memory")):
+            limit = safe_int(host.get(limit_key), 0)
+            if limit and candidate > limit:
+                candidate = limit
+                reasons.append(f"Capped at {limit} by sampled worker {label} usage.")
+        if repo_count and candidate > repo_count:
+            candidate = repo_count
+            reasons.append(f"Capped at the {repo_count} repos in the latest run.")
+        busy = host.get("avg_cpu_busy_percent")
+        if busy is not None and busy >= 90 and candidate > current:
+            candidate = current
+            reasons.append(f"Host CPU is {busy:.0f}% busy; not raising parallelism.")
+
+        candidate = max(1, min(candidate, 64))
+        if len(rows) >= 3 and runs_considered >= 6:
+            confidence = "high"
+        elif len(rows) >= 2 or runs_considered >= 3:
+            confidence = "medium"
+        else:
+            confidence = "low"
+        return {
+            "recommended_parallel_repos": candidate,
+            "current_parallel_repos": current,
+            "confidence": confidence,
+            "reasons": reasons,
+            "model": model,
+            "levels": rows,
+            "host": host,
+            "runs_considered": runs_considered,
+            "generated_at": iso_utc(utc_now()),
+        }
+
+
 class NotificationManager:
     def __init__(self, logs_dir: Path):
         self.logs_dir = logs_dir
@@ -3294,6 +6229,10 @@ class AgentManager:
             "interval_seconds": 60,
             "max_restarts_per_hour": 2,
             "max_normalizes_per_hour": 4,
+            "adaptive_parallelism": True,
+            "max_parallelism_changes_per_hour": 1,
+            "min_parallel_repos": 1,
+            "max_parallel_repos": 16,
             "allowed_alert_ids": list(AGENT_ALLOWED_ALERT_IDS),
         }
 
@@ -3343,6 +6282,13 @@ class AgentManager:
         interval_seconds = max(30, min(safe_int(merged.get("interval_seconds", current.get("interval_seconds", 60)), 60), 1800))
         max_restarts_per_hour = max(0, min(safe_int(merged.get("max_restarts_per_hour", current.get("max_restarts_per_hour", 2)), 2), 20))
         max_normalizes_per_hour = max(0, min(safe_int(merged.get("max_normalizes_per_hour", current.get("max_normalizes_per_hour", 4)), 4), 40))
+        max_parallelism_changes_per_hour = max(
+            0, min(safe_int(merged.get("max_parallelism_changes_per_hour", current.get("max_parallelism_changes_per_hour", 1)), 1), 10)
+        )
+        min_parallel_repos = max(1, min(safe_int(merged.get("min_parallel_repos", current.get("min_parallel_repos", 1)), 1), 64))
+        max_parallel_repos = max(
+            min_parallel_repos, min(safe_int(merged.get("max_parallel_repos", current.get("max_parallel_repos", 16)), 16), 64)
+        )
 
         raw_alert_ids = merged.get("allowed_alert_ids", current.get("allowed_alert_ids", AGENT_ALLOWED_ALERT_IDS))
         if isinstance(raw_alert_ids, str):
@@ -3362,6 +6308,10 @@ class AgentManager:
             "interval_seconds": interval_seconds,
             "max_restarts_per_hour": max_restarts_per_hour,
             "max_normalizes_per_hour": max_normalizes_per_hour,
+            "adaptive_parallelism": self._to_bool(merged.get("adaptive_parallelism", current.get("adaptive_parallelism", True))),
+            "max_parallelism_changes_per_hour": max_parallelism_changes_per_hour,
+            "min_parallel_repos": min_parallel_repos,
+            "max_parallel_repos": max_parallel_repos,
             "allowed_alert_ids": allowed_alert_ids,
         }
 
@@ -3494,6 +6444,11 @@ class AgentManager:
                 }
             )
 
+        if self._to_bool(cfg.get("adaptive_parallelism")):
+            parallelism_step = self._parallelism_step(snapshot, cfg)
+            if parallelism_step:
+                steps.append(parallelism_step)
+
         if not steps:
             steps.append(
                 {
@@ -3513,6 +6468,68 @@ class AgentManager:
                 dedup[key] = item
         return list(dedup.values())
 
+    def _owns_active_run(self, control_status: dict[str, Any]) -> bool:
+        # The managed launcher runs in its own session, so its pid is the loop's process group.
+        # Only then do the saved launch settings describe the active run.
+        launcher_pid = safe_int(control_status.get("managed_launcher_pid"), 0)
+        groups = [safe_int(pgid, 0) for pgid in control_status.get("loop_group_ids") or []]
+        return (
+            self._to_bool(control_status.get("active"))
+            and self._to_bool(control_status.get("managed_launcher_alive"))
+            and launcher_pid > 0
+            and groups == [launcher_pid]
+        )
+
+    def _parallelism_step(self, snapshot: dict[str, Any], cfg: dict[str, Any]) -> dict[str, Any] | None:
+        """Restart with fewer repos under sustained lock contention, or more when workers idle on a quiet host."""
+        control_status = snapshot.get("control_status") or {}
+        latest = snapshot.get("latest_run") or {}
+        if not self._owns_active_run(control_status):
+            return None
+        settings = control_status.get("managed_settings") or {}
+        current = safe_int(latest.get("parallel_repos"), 0) or safe_int(settings.get("parallel_repos"), 0)
+        if current <= 0 or safe_int(latest.get("cycles_seen"), 0) < AGENT_PARALLELISM_MIN_CYCLES:
+            return None
+        low = safe_int(cfg.get("min_parallel_repos"), 1)
+        high = safe_int(cfg.get("max_parallel_repos"), 16)
+        step_size = max(1, current // 4)
+
+        queue = latest.get("latest_cycle_queue") or {}
+        cycle_skipped = safe_int(queue.get("skipped_lock"), 0)
+        cycle_ratio = cycle_skipped / max(1, cycle_skipped + safe_int(queue.get("spawned"), 0))
+        run_skipped = safe_int(latest.get("repos_skipped_lock"), 0)
+        run_ratio = run_skipped / max(1, run_skipped + safe_int(latest.get("spawned_workers"), 0))
+
+        if cycle_ratio >= CAPACITY_LOCK_RATIO_HIGH and run_ratio >= CAPACITY_LOCK_RATIO_HIGH and current > low:
+            target = max(low, current - step_size)
+            reason = f"{cycle_ratio:.0%} of the latest cycle's repo starts ({run_ratio:.0%} over the run) hit an active repo lock."
+        else:
+            resources = snapshot.get("resources") or {}
+            busy = (resources.get("host") or {}).get("cpu_busy_percent")
+            live = [item["latest"] for item in resources.get("workers") or [] if item.get("live") and item.get("latest")]
+            if busy is None or not live or current >= high or run_ratio >= 0.1:
+                return None
+            if safe_int(latest.get("repo_count"), 0) <= current:
+                return None
+            worker_cpu = sum(float(item.get("cpu_percent") or 0.0) for item in live) / len(live)
+            if busy >= AGENT_IDLE_HOST_CPU_PERCENT or worker_cpu >= AGENT_IDLE_WORKER_CPU_PERCENT:
+                return None
+            target = min(high, current + step_size)
+            reason = f"Workers average {worker_cpu:.0f}% CPU with the host {busy:.0f}% busy and little lock contention."
+
+        if target == current:
+            return None
+        return {
+            "key": "adjust_parallelism",
+            "action": "restart_with_parallelism",
+            "label": f"{'Lower' if target < current else 'Raise'} parallel repos {current} -> {target}",
+            "reason": reason,
+            "priority": 60,
+            "safe_auto_allowed": True,
+            "parallel_repos": target,
+            "previous_parallel_repos": current,
+        }
+
     def _can_execute_step(
         self, step: dict[str, Any], snapshot: dict[str, Any], config: dict[str, Any], state: dict[str, Any]
     ) -> tuple[bool, str]:
@@ -3531,18 +6548,45 @@ class AgentManager:
             if not self._to_bool(control_status.get("active")):
                 return False, "run_not_active"
             limit = safe_int(config.get("max_restarts_per_hour"), 2)
-            if limit >= 0 and self._action_count_last_hour(state, action) >= limit:
+            restarts = self._action_count_last_hour(state, action) + self._action_count_last_hour(
+                state, "restart_with_parallelism"
+            )
+            if limit >= 0 and restarts >= limit:
+                return False, "restart_rate_limited"
+            return True, "ok"
+
+        if action == "restart_with_parallelism":
+            if not self._to_bool(control_status.get("active")):
+                return False, "run_not_active"
+            if not self._owns_active_run(control_status):
+                return False, "run_not_managed"
+            if not self._to_bool(config.get("adaptive_parallelism")):
+                return False, "adaptive_parallelism_disabled"
+            changes = self._action_count_last_hour(state, action)
+            limit = safe_int(config.get("max_parallelism_changes_per_hour"), 1)
+            if limit >= 0 and changes >= limit:
+                return False, "parallelism_rate_limited"
+            # A parallelism change is also a restart and spends the restart budget.
+            restart_limit = safe_int(config.get("max_restarts_per_hour"), 2)
+            if restart_limit >= 0 and changes + self._action_count_last_hour(state, "restart_run") >= restart_limit:
                 return False, "restart_rate_limited"
             return True, "ok"
 
         return False, "non_executable_action"
 
-    def _execute_step(self, step: dict[str, Any]) -> dict[str, Any]:
+    def _execute_step(self, step: dict[str, Any], progress: Callable[..., None] | None = None) -> dict[str, Any]:
         action = str(step.get("action") or "")
         if action == "normalize_loops":
-            return self.controller.normalize_loops({"force": True, "wait_seconds": 8})
+            return self.controller.normalize_loops({"force": True, "wait_seconds": 8}, progress=progress)
         if action == "restart_run":
-            return self.controller.restart_run({"wait_seconds": 12})
+            return self.controller.restart_run({"wait_seconds": 12}, progress=progress)
+        if action == "restart_with_parallelism":
+            # Re-check at execution time: queued steps can run after the loop changed hands.
+            if not self._owns_active_run(self.controller.status_payload()):
+                return {"ok": False, "error": "run_not_managed"}
+            request = self.controller.current_launch_request()
+            request.update({"parallel_repos": safe_int(step.get("parallel_repos"), 0), "wait_seconds": 12})
+            return self.controller.restart_run(request, progress=progress)
         return {"ok": False, "error": "unsupported_action"}
 
     def _choose_next_step(
@@ -3556,7 +6600,7 @@ class AgentManager:
             can_run, reason = self._can_execute_step(step, snapshot, config, state)
             if can_run:
                 return step, "ok"
-            if reason in {"normalize_rate_limited", "restart_rate_limited"}:
+            if reason in {"normalize_rate_limited", "restart_rate_limited", "parallelism_rate_limited"}:
                 return None, reason
         return None, "no_runnable_step"
 
@@ -3573,7 +6617,18 @@ class AgentManager:
                 "plan": plan,
             }
 
-    def run_next(self, snapshot: dict[str, Any], source: str = "manual") -> dict[str, Any]:
+    def run_next(
+        self,
+        snapshot: dict[str, Any],
+        source: str = "manual",
+        progress: Callable[..., None] | None = None,
+        background: bool = False,
+    ) -> dict[str, Any]:
+        """Pick and execute the next runnable plan step.
+
+        With background=True the step is handed to the control job worker instead of
+        running inline; its event is recorded as "queued" and completed by the job.
+        """
         with self._lock:
             config = self._get_config_unlocked()
             state = self._get_state_unlocked()
@@ -3606,7 +6661,46 @@ class AgentManager:
                     "state": state,
                 }
 
-            result = self._execute_step(step)
+            if background:
+                now_iso = iso_utc(utc_now())
+                state["last_tick_at"] = now_iso
+                state["last_action_at"] = now_iso
+                state["last_action_key"] = str(step.get("key") or step.get("action") or "")
+                action = str(step.get("action") or "")
+                # Filled in before the lock is released, i.e. before the job can look its event up.
+                job_ref: dict[str, str] = {}
+                job = self.controller.jobs.submit(
+                    f"agent_{action}", lambda job_progress: self._run_queued_step(step, job_ref, job_progress)
+                )
+                job_ref["id"] = job["id"]
+                event = {
+                    "ts": now_iso,
+                    "source": source,
+                    "status": "queued",
+                    "action": action,
+                    "label": str(step.get("label") or ""),
+                    "reason": "queued",
+                    "detail": str(step.get("reason") or ""),
+                    "ok": None,
+                    "job_id": job["id"],
+                }
+                self._append_action_event(state, event)
+                self._save_json_file(self.state_path, state)
+                return {
+                    "ok": True,
+                    "executed": True,
+                    "queued": True,
+                    "job": job,
+                    "step": step,
+                    "event": event,
+                    "plan": plan,
+                    "config": config,
+                    "state": state,
+                }
+
+            if progress is not None:
+                progress("executing", action=str(step.get("action") or ""))
+            result = self._execute_step(step, progress=progress)
             ok = self._to_bool(result.get("ok"))
             now_iso = iso_utc(utc_now())
             state["last_tick_at"] = now_iso
@@ -3635,11 +6729,36 @@ class AgentManager:
                 "state": state,
             }
 
-    def run_plan(self, snapshot: dict[str, Any], source: str = "manual", max_steps: int = 2) -> dict[str, Any]:
+    def _run_queued_step(
+        self, step: dict[str, Any], job_ref: dict[str, str], progress: Callable[..., None]
+    ) -> dict[str, Any]:
+        # Runs on the control job worker; the job starts only after run_next saved the queued event.
+        progress("executing", action=str(step.get("action") or ""))
+        result = self._execute_step(step, progress=progress)
+        ok = self._to_bool(result.get("ok"))
+        with self._lock:
+            state = self._get_state_unlocked()
+            for event in reversed(list(state.get("recent_actions") or [])):
+                if event.get("job_id") == job_ref.get("id"):
+                    event["status"] = "sent" if ok else "error"
+                    event["reason"] = "executed" if ok else str(result.get("error") or "action_failed")
+                    event["ok"] = ok
+                    event["finished_at"] = iso_utc(utc_now())
+                    break
+            self._save_json_file(self.state_path, state)
+        return result
+
+    def run_plan(
+        self,
+        snapshot: dict[str, Any],
+        source: str = "manual",
+        max_steps: int = 2,
+        progress: Callable[..., None] | None = None,
+    ) -> dict[str, Any]:
         executed: list[dict[str, Any]] = []
         attempted = max(1, min(max_steps, 8))
         for _ in range(attempted):
-            payload = self.run_next(snapshot=snapshot, source=source)
+            payload = self.run_next(snapshot=snapshot, source=source, progress=progress)
             if not payload.get("executed"):
                 return {
                     "ok": len(executed) > 0 and all(self._to_bool(item.get("ok")) for item in executed),
@@ -3663,7 +6782,9 @@ class AgentManager:
             "last": executed[-1] if executed else {},
         }
 
-    def tick(self, snapshot: dict[str, Any]) -> dict[str, Any]:
+    def tick(
+        self, snapshot: dict[str, Any], progress: Callable[..., None] | None = None, background: bool = False
+    ) -> dict[str, Any]:
         with self._lock:
             config = self._get_config_unlocked()
             state = self._get_state_unlocked()
@@ -3677,7 +6798,555 @@ class AgentManager:
                 return {"ok": True, "executed": False, "reason": "interval_not_reached"}
 
         # run_next acquires the lock internally; keep this outside to avoid nested locking.
-        return self.run_next(snapshot=snapshot, source="autopilot")
+        return self.run_next(snapshot=snapshot, source="autopilot", progress=progress, background=background)
+
+
+SNAPSHOT_KEYED_LISTS: dict[str, Callable[[dict[str, Any]], str]] = {
+    "run_history": lambda item: str(item.get("run_id") or ""),
+    "recent_commits": lambda item: f"{item.get('repo') or ''}:{item.get('hash') or ''}",
+    "run_commits": lambda item: str(item.get("hash") or ""),
+    "alerts": lambda item: str(item.get("id") or ""),
+    "control_jobs": lambda item: str(item.get("id") or ""),
+}
+
+
+def _diff_keyed_list(
+    previous: list[Any], current: list[Any], key_fn: Callable[[dict[str, Any]], str]
+) -> dict[str, Any] | None:
+    if not all(isinstance(item, dict) for item in previous) or not all(isinstance(item, dict) for item in current):
+        return None
+    previous_by_key = {key_fn(item): item for item in previous}
+    current_keys = [key_fn(item) for item in current]
+    if len(set(current_keys)) != len(current_keys):
+        return None
+    upsert = [item for key, item in zip(current_keys, current) if previous_by_key.get(key) != item]
+    current_key_set = set(current_keys)
+    removed = [key for key in previous_by_key if key not in current_key_set]
+    order_changed = [key_fn(item) for item in previous if key_fn(item) in current_key_set] != [
+        key for key in current_keys if key in previous_by_key
+    ]
+    if not upsert and not removed and not order_changed:
+        return {}
+    return {"upsert": upsert, "removed": removed, "order": current_keys}
+
+
+def _diff_appended_events(previous: list[Any], current: list[Any]) -> dict[str, Any] | None:
+    if not previous or not current:
+        return None
+    # The events window slides: find where the new window starts inside the old one.
+    for drop in range(len(previous)):
+        if previous[drop] != current[0]:
+            continue
+        overlap = len(previous) - drop
+        if overlap <= len(current) and previous[drop:] == current[:overlap]:
+            if drop == 0 and overlap == len(current):
+                return {}
+            return {"drop": drop, "append": current[overlap:]}
+    return None
+
+
+def snapshot_delta(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    delta: dict[str, Any] = {"set": {}, "unset": [key for key in previous if key not in current], "lists": {}}
+    for key, value in current.items():
+        old_value = previous.get(key)
+        if key not in previous:
+            delta["set"][key] = value
+            continue
+        if isinstance(old_value, list) and isinstance(value, list):
+            if key == "latest_events":
+                events_diff = _diff_appended_events(old_value, value)
+                if events_diff is not None:
+                    if events_diff:
+                        delta["events"] = events_diff
+                    continue
+            elif key in SNAPSHOT_KEYED_LISTS:
+                list_diff = _diff_keyed_list(old_value, value, SNAPSHOT_KEYED_LISTS[key])
+                if list_diff is not None:
+                    if list_diff:
+                        delta["lists"][key] = list_diff
+                    continue
+        if old_value != value:
+            delta["set"][key] = value
+    return delta
+
+
+class SnapshotFrame:
+    def __init__(self, cursor: int, base_cursor: int, payload: dict[str, Any], delta_frame: bytes | None):
+        self.cursor = cursor
+        self.base_cursor = base_cursor
+        self.payload = payload
+        self.delta_frame = delta_frame
+        self._full_frame: bytes | None = None
+        self._lock = threading.Lock()
+
+    def full_frame(self) -> bytes:
+        # Serialized lazily: only new viewers and viewers that missed a delta need the full payload.
+        with self._lock:
+            if self._full_frame is None:
+                self._full_frame = encode_stream_envelope("snapshot", self.cursor, self.payload)
+            return self._full_frame
+
+
+def encode_stream_envelope(
+    frame_type: str,
+    cursor: int,
+    payload: dict[str, Any],
+    base_cursor: int | None = None,
+    topic: str = "system",
+) -> bytes:
+    envelope: dict[str, Any] = {
+        "topic": topic,
+        "type": frame_type,
+        "ts": iso_utc(utc_now()),
+        "cursor": str(cursor),
+    }
+    if base_cursor is not None:
+        envelope["base_cursor"] = str(base_cursor)
+    envelope["payload"] = payload
+    return f"id: {cursor}\ndata: {json.dumps(envelope, separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+class SnapshotDeltaStream:
+    HISTORY_FRAMES = 240
+
+    def __init__(self, build_payload: Callable[[], dict[str, Any]]):
+        self._build_payload = build_payload
+        self._lock = threading.Lock()
+        self._latest: SnapshotFrame | None = None
+        # (cursor, base_cursor, delta frame) kept for Last-Event-ID resumes.
+        self._history: deque[tuple[int, int, bytes]] = deque(maxlen=self.HISTORY_FRAMES)
+        self._cursor = 0
+
+    def __call__(self, _sequence: int) -> SnapshotFrame:
+        payload = self._build_payload()
+        with self._lock:
+            previous = self._latest
+            # Millisecond-seeded cursors keep ids from a previous server process from matching.
+            cursor = max(self._cursor + 1, int(time.time() * 1000))
+            self._cursor = cursor
+            delta_frame = None
+            base_cursor = 0
+            if previous is not None:
+                base_cursor = previous.cursor
+                delta_frame = encode_stream_envelope(
+                    "delta", cursor, snapshot_delta(previous.payload, payload), base_cursor=base_cursor
+                )
+                self._history.append((cursor, base_cursor, delta_frame))
+            frame = SnapshotFrame(cursor, base_cursor, payload, delta_frame)
+            self._latest = frame
+        return frame
+
+    def deltas_since(self, cursor: int) -> list[tuple[int, bytes]] | None:
+        with self._lock:
+            history = list(self._history)
+            latest_cursor = self._latest.cursor if self._latest else 0
+        if cursor and cursor == latest_cursor:
+            return []
+        for idx, (frame_cursor, base_cursor, _) in enumerate(history):
+            if base_cursor == cursor:
+                return [(item[0], item[2]) for item in history[idx:]]
+            if frame_cursor > cursor:
+                break
+        return None
+
+
+class BroadcastSubscription:
+    def __init__(self, key: tuple[Any, ...]):
+        self.key = key
+        self.source: Any = None
+        # Holds at most one frame: slow clients skip stale frames instead of buffering them.
+        self._frames: queue.Queue[Any] = queue.Queue(maxsize=1)
+
+    def offer(self, frame: Any) -> None:
+        while True:
+            try:
+                self._frames.put_nowait(frame)
+                return
+            except queue.Full:
+                try:
+                    self._frames.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def next_frame(self, timeout: float) -> Any:
+        try:
+            return self._frames.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class _BroadcastTopic:
+    def __init__(
+        self,
+        key: tuple[Any, ...],
+        poll: float,
+        build: Callable[[int], Any],
+        fingerprint: Callable[[], Any] | None,
+    ):
+        self.key = key
+        self.poll = poll
+        self.build = build
+        self.fingerprint = fingerprint
+        self.last_fingerprint: Any = None
+        self.sequence = 0
+        self.latest: Any = None
+        self.subscribers: set[BroadcastSubscription] = set()
+        self.wake = threading.Event()
+
+
+class SnapshotBroadcaster:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._topics: dict[tuple[Any, ...], _BroadcastTopic] = {}
+        self.frames_built = 0
+        self.frames_skipped = 0
+        self.build_errors = 0
+
+    def subscribe(
+        self,
+        key: tuple[Any, ...],
+        poll: float,
+        build: Callable[[int], Any],
+        fingerprint: Callable[[], Any] | None = None,
+    ) -> BroadcastSubscription:
+        subscription = BroadcastSubscription(key)
+        with self._lock:
+            topic = self._topics.get(key)
+            if topic is None:
+                topic = _BroadcastTopic(key, poll, build, fingerprint)
+                self._topics[key] = topic
+                subscription.source = topic.build
+                thread = threading.Thread(target=self._run_topic, args=(topic,), name="clone-sse-producer", daemon=True)
+                topic.subscribers.add(subscription)
+                thread.start()
+            else:
+                subscription.source = topic.build
+                topic.subscribers.add(subscription)
+                if topic.latest is not None:
+                    subscription.offer(topic.latest)
+        return subscription
+
+    def wake(self, kind: str) -> None:
+        """Run producers whose key starts with kind now instead of at their next poll."""
+        with self._lock:
+            topics = [topic for key, topic in self._topics.items() if key and key[0] == kind]
+        for topic in topics:
+            topic.wake.set()
+
+    def unsubscribe(self, subscription: BroadcastSubscription) -> None:
+        with self._lock:
+            topic = self._topics.get(subscription.key)
+            if topic is not None:
+                topic.subscribers.discard(subscription)
+                if not topic.subscribers:
+                    topic.wake.set()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "topics": len(self._topics),
+                "subscribers": sum(len(topic.subscribers) for topic in self._topics.values()),
+                "frames_built": self.frames_built,
+                "frames_skipped": self.frames_skipped,
+                "build_errors": self.build_errors,
+            }
+
+    def _run_topic(self, topic: _BroadcastTopic) -> None:
+        while True:
+            with self._lock:
+                if not topic.subscribers:
+                    if self._topics.get(topic.key) is topic:
+                        self._topics.pop(topic.key, None)
+                    return
+            frame: Any = None
+            try:
+                fingerprint = topic.fingerprint() if topic.fingerprint else None
+                if topic.latest is not None and fingerprint is not None and fingerprint == topic.last_fingerprint:
+                    # Nothing changed on disk: viewers keep their last frame and get keepalives instead.
+                    with self._lock:
+                        self.frames_skipped += 1
+                else:
+                    topic.sequence += 1
+                    frame = topic.build(topic.sequence)
+                    topic.last_fingerprint = fingerprint
+            except Exception as exc:  # noqa: BLE001 - keep the producer alive for remaining viewers.
+                with self._lock:
+                    self.build_errors += 1
+                if os.environ.get("CLONE_CONTROL_PLANE_DEBUG"):
+                    print(f"stream producer error for {topic.key!r}: {exc}", file=sys.stderr)
+            if frame is not None:
+                with self._lock:
+                    self.frames_built += 1
+                    topic.latest = frame
+                    subscribers = list(topic.subscribers)
+                for subscription in subscribers:
+                    subscription.offer(frame)
+            topic.wake.wait(topic.poll)
+            topic.wake.clear()
+
+
+class FileWatcher:
+    """Directory change notifications via Linux inotify (ctypes), else stat polling.
+
+    Watches are directories, each with one or more (tag, names) specs; names=None
+    means any entry. Events are debounced and delivered to callback as a list of
+    (tag, name) pairs on the watcher thread. name "" means "something in this
+    directory changed" (queue overflow, or a directory mtime change when polling).
+    Specs whose tag is in recursive_tags also cover every subdirectory; new ones
+    are picked up as they are created.
+    """
+
+    IN_MODIFY = 0x2
+    IN_ATTRIB = 0x4
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_FROM = 0x40
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(
+        self, callback: Callable[[list[tuple[str, str]]], None], recursive_tags: frozenset[str] = frozenset()
+    ):
+        self.callback = callback
+        self.recursive_tags = recursive_tags
+        self._lock = threading.Lock()
+        self._specs: dict[str, list[tuple[str, frozenset[str] | None]]] = {}
+        self._wds: dict[int, str] = {}
+        self._dir_wds: dict[str, int] = {}
+        self._poll_stamps: dict[tuple[str, str], tuple[int, int]] = {}
+        self._stats = {"events": 0, "batches": 0, "watch_errors": 0}
+        self._libc: Any = None
+        self._fd = -1
+        self.backend = "off"
+        if str(os.environ.get("CLONE_FS_WATCH", "1")).strip().lower() in {"0", "false", "off"}:
+            return
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        except (OSError, AttributeError):
+            fd = -1
+        if fd >= 0:
+            self._libc = libc
+            self._fd = fd
+            self.backend = "inotify"
+        else:
+            self.backend = "poll"
+
+    def set_watches(self, watches: dict[Path, list[tuple[str, frozenset[str] | None]]]) -> None:
+        """Replace the watched directories (missing directories are skipped)."""
+        specs = {str(path): list(items) for path, items in watches.items() if path.is_dir()}
+        with self._lock:
+            self._specs = specs
+            for directory, items in list(specs.items()):
+                self._adopt_subdirs(directory, items)
+            if self.backend == "inotify":
+                for directory in list(self._dir_wds):
+                    if directory not in specs:
+                        wd = self._dir_wds.pop(directory)
+                        self._wds.pop(wd, None)
+                        self._libc.inotify_rm_watch(self._fd, wd)
+                for directory in specs:
+                    self._add_watch(directory)
+            elif self.backend == "poll":
+                self._poll_stamps = {key: stamp for key, stamp in self._poll_stamps.items() if key[0] in specs}
+
+    def _add_watch(self, directory: str) -> None:
+        # Caller holds self._lock.
+        if self.backend != "inotify" or directory in self._dir_wds:
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd < 0:
+            self._stats["watch_errors"] += 1
+            return
+        self._dir_wds[directory] = wd
+        self._wds[wd] = directory
+
+    def _adopt_subdirs(self, directory: str, items: list[tuple[str, frozenset[str] | None]]) -> None:
+        # Caller holds self._lock. Extends the recursive specs of directory to its subdirectories.
+        recursive = [item for item in items if item[0] in self.recursive_tags]
+        if not recursive:
+            return
+        for dirpath, _, _ in os.walk(directory):
+            self._specs.setdefault(dirpath, list(recursive))
+            self._add_watch(dirpath)
+
+    def start(self) -> None:
+        if self.backend == "off":
+            return
+        target = self._run_inotify if self.backend == "inotify" else self._run_poll
+        threading.Thread(target=target, name="clone-fs-watch", daemon=True).start()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"backend": self.backend, "directories": len(self._specs), **self._stats}
+
+    def _match(self, directory: str, name: str) -> list[tuple[str, str]]:
+        # Caller holds self._lock.
+        return [
+            (tag, name)
+            for tag, names in self._specs.get(directory, [])
+            if names is None or not name or name in names
+        ]
+
+    def _dispatch(self, events: list[tuple[str, str]]) -> None:
+        if not events:
+            return
+        with self._lock:
+            self._stats["batches"] += 1
+        try:
+            self.callback(sorted(set(events)))
+        except Exception as exc:  # noqa: BLE001 - a bad batch must not stop the watcher.
+            if os.environ.get("CLONE_CONTROL_PLANE_DEBUG"):
+                print(f"fs watch callback error: {exc}", file=sys.stderr)
+
+    def _run_inotify(self) -> None:
+        pending: list[tuple[str, str]] = []
+        deadline: float | None = None
+        while True:
+            timeout = 1.0 if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                ready, _, _ = select.select([self._fd], [], [], timeout)
+            except (OSError, ValueError):
+                return
+            if ready:
+                try:
+                    data = os.read(self._fd, 64 * 1024)
+                except BlockingIOError:
+                    data = b""
+                except OSError:
+                    return
+                offset = 0
+                with self._lock:
+                    while offset + 16 <= len(data):
+                        wd, mask, _cookie, length = struct.unpack_from("iIII", data, offset)
+                        name = data[offset + 16 : offset + 16 + length].split(b"\0", 1)[0].decode("utf-8", "replace")
+                        offset += 16 + length
+                        self._stats["events"] += 1
+                        if mask & self.IN_Q_OVERFLOW:
+                            pending.extend((tag, "") for items in self._specs.values() for tag, _ in items)
+                            continue
+                        directory = self._wds.get(wd)
+                        if directory is None:
+                            continue
+                        if mask & self.IN_IGNORED:
+                            self._wds.pop(wd, None)
+                            self._dir_wds.pop(directory, None)
+                            pending.extend(self._match(directory, ""))
+                            continue
+                        if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                            self._adopt_subdirs(os.path.join(directory, name), self._specs.get(directory, []))
+                        pending.extend(self._match(directory, name))
+                if pending and deadline is None:
+                    deadline = time.monotonic() + FS_WATCH_DEBOUNCE_SECONDS
+            if deadline is not None and time.monotonic() >= deadline:
+                batch, pending, deadline = pending, [], None
+                self._dispatch(batch)
+
+    def _run_poll(self) -> None:
+        while True:
+            events: list[tuple[str, str]] = []
+            with self._lock:
+                specs = {directory: list(items) for directory, items in self._specs.items()}
+            for directory, items in specs.items():
+                keys = [(directory, "")]
+                for _tag, names in items:
+                    keys.extend((directory, name) for name in sorted(names or ()))
+                for key in keys:
+                    stamp = file_stamp(Path(key[0]) / key[1]) if key[1] else file_stamp(Path(key[0]))
+                    previous = self._poll_stamps.get(key)
+                    self._poll_stamps[key] = stamp
+                    if previous is not None and previous != stamp:
+                        with self._lock:
+                            self._stats["events"] += 1
+                            events.extend(self._match(directory, key[1]))
+                            if not key[1] and directory in self._specs:
+                                self._adopt_subdirs(directory, self._specs[directory])
+            self._dispatch(events)
+            time.sleep(FS_WATCH_POLL_SECONDS)
+
+
+def start_change_watcher(
+    monitor: CloneMonitor,
+    task_queue: TaskQueueStore,
+    broadcaster: SnapshotBroadcaster,
+    extra_files: list[Path] | None = None,
+) -> FileWatcher:
+    """Invalidate monitor caches and wake SSE producers as soon as their inputs change on disk."""
+    state_names = frozenset(path.name for path in extra_files or [] if path.parent == monitor.logs_dir)
+
+    def watches() -> dict[Path, list[tuple[str, frozenset[str] | None]]]:
+        specs: dict[Path, list[tuple[str, frozenset[str] | None]]] = {}
+        specs.setdefault(monitor.logs_dir, []).append(("logs", None))
+        specs.setdefault(monitor.repos_file.parent, []).append(("repos", frozenset({monitor.repos_file.name})))
+        specs.setdefault(task_queue.queue_file.parent, []).append(("tasks", frozenset({task_queue.queue_file.name})))
+        for path in extra_files or []:
+            if path.parent != monitor.logs_dir:
+                specs.setdefault(path.parent, []).append(("state", frozenset({path.name})))
+        for entry in monitor.repos_catalog():
+            git_dirs = resolve_git_dirs(Path(str(entry.get("path") or "")).expanduser())
+            if git_dirs is None:
+                continue
+            git_dir, common_dir = git_dirs
+            specs.setdefault(git_dir, []).append(("git", frozenset({"HEAD", "packed-refs"})))
+            if common_dir != git_dir:
+                # Linked worktrees share packed-refs with the main repository (see git_refs_stamp).
+                specs.setdefault(common_dir, []).append(("git", frozenset({"packed-refs"})))
+            # "refs" is recursive, so branches like feature/x are seen too.
+            specs.setdefault(common_dir / "refs" / "heads", []).append(("refs", None))
+        return specs
+
+    def on_change(events: list[tuple[str, str]]) -> None:
+        wake_snapshot = wake_tasks = refs_changed = repos_changed = False
+        for tag, name in events:
+            if tag == "logs":
+                match = RUN_FILE_PATTERN.match(name)
+                if match:
+                    # Run log and events-log appends only invalidate that run; the producers pick
+                    # them up on their poll. Status writes (a new run starts with one) wake them.
+                    monitor.run_index.note_change(match.group(1))
+                    if name.endswith("-status.txt"):
+                        wake_snapshot = True
+                elif not name:
+                    monitor.run_index.note_change(None)
+                    wake_snapshot = True
+                elif name in state_names:
+                    wake_snapshot = True
+            elif tag == "repos":
+                repos_changed = True
+            elif tag == "tasks":
+                wake_tasks = True
+            elif tag == "state":
+                wake_snapshot = True
+            elif tag in {"git", "refs"}:
+                refs_changed = True
+        if repos_changed:
+            with monitor._cache_lock:
+                monitor._repos_cache = None
+            watcher.set_watches(watches())
+        if repos_changed or refs_changed:
+            monitor._commit_cache.clear()
+            monitor.change_generation += 1
+            wake_snapshot = True
+        if wake_tasks:
+            broadcaster.wake("tasks")
+            wake_snapshot = True
+        if wake_snapshot:
+            broadcaster.wake("v1")
+            broadcaster.wake("legacy")
+
+    watcher = FileWatcher(on_change, recursive_tags=frozenset({"refs"}))
+    if watcher.backend == "off":
+        return watcher
+    watcher.set_watches(watches())
+    monitor.run_index.watched = watcher.backend == "inotify"
+    watcher.start()
+    return watcher
 
 
 class APIHandler(SimpleHTTPRequestHandler):
@@ -3687,6 +7356,10 @@ class APIHandler(SimpleHTTPRequestHandler):
     agent: AgentManager
     task_queue: TaskQueueStore
     preset_store: LaunchPresetStore
+    broadcaster: SnapshotBroadcaster
+    watcher: FileWatcher | None = None
+    resource_sampler: ResourceSampler | None = None
+    capacity_advisor: CapacityAdvisor
     static_dir: Path
     launch_info: dict[str, Any]
 
@@ -3744,6 +7417,14 @@ class APIHandler(SimpleHTTPRequestHandler):
             },
             "control_status": status,
             "latest_run": latest_run,
+            "streams": self.broadcaster.stats(),
+            "git": GIT_EXECUTOR.stats(),
+            "caches": self.monitor.cache_stats(),
+            "single_flight": self.monitor.single_flight.stats(),
+            "processes": PROCESS_TABLE.stats(),
+            "control_jobs": self.controller.jobs.stats(),
+            "resources": self.resource_sampler.stats() if self.resource_sampler else {"available": False},
+            "fs_watch": self.watcher.stats() if self.watcher else {"backend": "off"},
             "recent_log_errors": error_lines[-20:],
         }
 
@@ -3818,10 +7499,22 @@ class APIHandler(SimpleHTTPRequestHandler):
 
     def _v1_runs_payload(self, query: dict[str, list[str]]) -> dict[str, Any]:
         limit = max(1, min(safe_int(query.get("limit", ["60"])[0], 60), 500))
-        runs = self.monitor.list_runs(limit=limit)
+        states = {
+            part.strip().lower()
+            for raw in query.get("state", [])
+            for part in str(raw or "").split(",")
+            if part.strip()
+        }
+        page = self.monitor.query_runs(
+            limit=limit,
+            cursor=str(query.get("cursor", [""])[0] or "").strip(),
+            states=states or None,
+            repo=str(query.get("repo", [""])[0] or ""),
+            since=parse_iso(str(query.get("since", [""])[0] or "")),
+            until=parse_iso(str(query.get("until", [""])[0] or "")),
+        )
         items: list[dict[str, Any]] = []
-        for item in runs:
-            run = with_effective_run_fields(item) or item
+        for run in page["items"]:
             started_at = str(run.get("started_at") or run.get("run_started_at") or run.get("first_ts") or "")
             repo_count = safe_int(run.get("repo_count"), 0)
             if repo_count <= 0:
@@ -3841,12 +7534,19 @@ class APIHandler(SimpleHTTPRequestHandler):
                     "ended_at": str(run.get("ended_at") or ""),
                     "duration_seconds": safe_int(run.get("duration_seconds"), 0),
                     "repo_count": repo_count,
+                    "parallel_repos": safe_int(run.get("parallel_repos"), 0),
                     "repos_changed": safe_int(run.get("repos_changed_est"), 0),
                     "repos_no_change": safe_int(run.get("repos_no_change"), 0),
                     "run_online": bool(run.get("run_online")),
                 }
             )
-        return {"items": items, "limit": limit, "generated_at": iso_utc(utc_now())}
+        return {
+            "items": items,
+            "limit": limit,
+            "next_cursor": page["next_cursor"],
+            "total_runs": page["total_runs"],
+            "generated_at": iso_utc(utc_now()),
+        }
 
     def _v1_repo_diagnostics_payload(self, query: dict[str, list[str]]) -> dict[str, Any]:
         code_root_raw = str(query.get("code_root", [""])[0] or "").strip()
@@ -3935,6 +7635,7 @@ class APIHandler(SimpleHTTPRequestHandler):
                 "ended_at": str(latest.get("ended_at") or ""),
                 "duration_seconds": safe_int(latest.get("duration_seconds"), 0),
                 "repo_count": repo_count,
+                "parallel_repos": safe_int(latest.get("parallel_repos"), 0),
                 "repos_changed": safe_int(latest.get("repos_changed_est"), 0),
                 "repos_no_change": safe_int(latest.get("repos_no_change"), 0),
                 "run_online": bool(status.get("active")),
@@ -3953,52 +7654,198 @@ class APIHandler(SimpleHTTPRequestHandler):
         status = str(query.get("status", [""])[0] or "")
         repo = str(query.get("repo", [""])[0] or "")
         limit = max(1, min(safe_int(query.get("limit", ["200"])[0], 200), 1000))
-        return {
-            "items": self.task_queue.list_tasks(status=status, repo=repo, limit=limit),
-            "summary": self.task_queue.summary(limit=20),
+        since_raw = str(query.get("since_version", [""])[0] or "").strip()
+        if since_raw:
+            changes = self.task_queue.changes_since(safe_int(since_raw, 0), status=status, repo=repo, limit=limit)
+            if not changes["reset"]:
+                return {**changes, "generated_at": iso_utc(utc_now())}
+        summary = self.task_queue.summary(limit=20)
+        include_archived = to_bool(query.get("include_archived", ["0"])[0])
+        payload = {
+            "items": self.task_queue.list_tasks(
+                status=status, repo=repo, limit=limit, include_archived=include_archived
+            ),
+            "summary": summary,
+            "version": summary.get("version", 0),
             "generated_at": iso_utc(utc_now()),
         }
+        if since_raw:
+            payload["reset"] = True
+        return payload
+
+    def _send_tasks_sse(self, query: dict[str, list[str]]) -> None:
+        poll = max(1.0, min(float(safe_int(query.get("poll", ["2"])[0], 2)), 60.0))
+        status = str(query.get("status", [""])[0] or "")
+        repo = str(query.get("repo", [""])[0] or "")
+        limit = max(1, min(safe_int(query.get("limit", ["200"])[0], 200), 1000))
+        last_version = safe_int(self.headers.get("Last-Event-ID") or query.get("since_version", ["0"])[0], 0)
+
+        def snapshot_frame() -> bytes:
+            nonlocal last_version
+            summary = self.task_queue.summary(limit=20)
+            items = self.task_queue.list_tasks(status=status, repo=repo, limit=limit)
+            last_version = safe_int(summary.get("version"), 0)
+            return encode_stream_envelope(
+                "tasks.snapshot", last_version, {"items": items, "summary": summary}, topic="tasks"
+            )
+
+        def changes_frames() -> bytes | None:
+            nonlocal last_version
+            frames: list[bytes] = []
+            while True:
+                changes = self.task_queue.changes_since(last_version, status=status, repo=repo, limit=limit)
+                if changes["reset"]:
+                    return snapshot_frame()
+                base_version = last_version
+                last_version = changes["version"]
+                if changes["items"] or changes["removed"]:
+                    payload = {"items": changes["items"], "removed": changes["removed"]}
+                    frames.append(
+                        encode_stream_envelope("tasks.changes", last_version, payload, base_cursor=base_version, topic="tasks")
+                    )
+                if not changes["has_more"]:
+                    break
+            return b"".join(frames) or None
+
+        def resume(_subscription: BroadcastSubscription) -> bytes:
+            if last_version <= 0:
+                return snapshot_frame()
+            return changes_frames() or b""
+
+        def render(version: int) -> bytes | None:
+            if version <= last_version:
+                return None
+            return changes_frames()
+
+        self._stream_frames(
+            ("tasks", poll),
+            poll,
+            lambda _sequence: self.task_queue.current_version(),
+            render=render,
+            resume=resume,
+            fingerprint=self.task_queue.current_version,
+        )
 
     def _send_v1_sse(self, parsed_query: dict[str, list[str]]) -> None:
         poll = float(parsed_query.get("poll", ["5"])[0])
         poll = max(1.0, min(poll, 60.0))
-        cursor = 0
+        params = (
+            safe_int(parsed_query.get("history_limit", ["25"])[0], 25),
+            safe_int(parsed_query.get("commit_hours", ["2"])[0], 2),
+            safe_int(parsed_query.get("commit_limit", ["180"])[0], 180),
+            safe_int(parsed_query.get("event_limit", ["240"])[0], 240),
+        )
+        full_only = str(parsed_query.get("mode", ["delta"])[0] or "delta").strip().lower() == "full"
+        last_cursor = safe_int(self.headers.get("Last-Event-ID") or parsed_query.get("last_event_id", ["0"])[0], 0)
+
+        def resume(subscription: BroadcastSubscription) -> bytes:
+            nonlocal last_cursor
+            if full_only or not last_cursor or not isinstance(subscription.source, SnapshotDeltaStream):
+                last_cursor = 0
+                return b""
+            missed = subscription.source.deltas_since(last_cursor)
+            if missed is None:
+                # Cursor is unknown or already evicted: the next frame goes out as a full snapshot.
+                last_cursor = 0
+                return b""
+            if missed:
+                last_cursor = missed[-1][0]
+            return b"".join(frame for _, frame in missed)
+
+        def render(frame: SnapshotFrame) -> bytes | None:
+            nonlocal last_cursor
+            if frame.cursor <= last_cursor:
+                return None
+            if not full_only and last_cursor and frame.base_cursor == last_cursor and frame.delta_frame is not None:
+                data = frame.delta_frame
+            else:
+                data = frame.full_frame()
+            last_cursor = frame.cursor
+            return data
+
+        build = SnapshotDeltaStream(functools.partial(type(self)._build_v1_snapshot_payload, params))
+        self._stream_frames(("v1", poll, params), poll, build, render=render, resume=resume)
+
+    @classmethod
+    def _stream_fingerprint(cls) -> tuple[Any, ...]:
+        monitor_state = cls.monitor.change_fingerprint()
+        # Age-based alerts and sliding commit windows still need periodic rebuilds without file changes.
+        refresh_seconds = STREAM_REFRESH_ONLINE_SECONDS if monitor_state["run_online"] else STREAM_REFRESH_IDLE_SECONDS
+        return (
+            monitor_state["stamp"],
+            file_identity_stamp(cls.task_queue.queue_file),
+            file_stamp(cls.controller.managed_state_path),
+            cls.controller.jobs.version,
+            file_stamp(cls.notifier.config_path),
+            file_stamp(cls.agent.config_path),
+            tuple(cls.controller._all_loop_pids()),
+            int(time.time() // refresh_seconds),
+        )
+
+    @classmethod
+    def _legacy_stream_fingerprint(cls) -> tuple[Any, ...]:
+        # The legacy producer also runs alert notifications and the autopilot tick; rebuild at
+        # least once per agent interval so they keep their cadence while no run is online.
+        interval = max(30, safe_int(cls.agent.get_config().get("interval_seconds"), 60))
+        return (*cls._stream_fingerprint(), int(time.time() // interval))
+
+    @classmethod
+    def _build_v1_snapshot_payload(cls, params: tuple[int, int, int, int]) -> dict[str, Any]:
+        history_limit, commit_hours, commit_limit, event_limit = params
+        snapshot = cls.monitor.snapshot(
+            history_limit=history_limit,
+            commit_hours=commit_hours,
+            commit_limit=commit_limit,
+            event_limit=event_limit,
+        )
+        return cls._attach_runtime_payload(snapshot, send_notifications=False)
 
+    def _stream_frames(
+        self,
+        key: tuple[Any, ...],
+        poll: float,
+        build: Callable[[int], Any],
+        render: Callable[[Any], bytes | None] | None = None,
+        resume: Callable[[BroadcastSubscription], bytes] | None = None,
+        fingerprint: Callable[[], Any] | None = None,
+    ) -> None:
         self.send_response(200)
         self.send_header("Content-Type", "text/event-stream; charset=utf-8")
         self.send_header("Cache-Control", "no-cache")
         self.send_header("Connection", "keep-alive")
         self.end_headers()
 
-        while True:
-            snapshot = self.monitor.snapshot(
-                history_limit=safe_int(parsed_query.get("history_limit", ["25"])[0], 25),
-                commit_hours=safe_int(parsed_query.get("commit_hours", ["2"])[0], 2),
-                commit_limit=safe_int(parsed_query.get("commit_limit", ["180"])[0], 180),
-                event_limit=safe_int(parsed_query.get("event_limit", ["240"])[0], 240),
-            )
-            snapshot = self._attach_runtime_payload(snapshot, send_notifications=False)
-            cursor += 1
-            envelope = {
-                "topic": "system",
-                "type": "snapshot",
-                "ts": iso_utc(utc_now()),
-                "cursor": str(cursor),
-                "payload": snapshot,
-            }
-            frame = f"data: {json.dumps(envelope, separators=(',', ':'))}\n\n".encode("utf-8")
-            try:
-                self.wfile.write(frame)
-                self.wfile.flush()
-            except (BrokenPipeError, ConnectionResetError):
-                break
-            time.sleep(poll)
+        subscription = self.broadcaster.subscribe(key, poll, build, fingerprint=fingerprint or type(self)._stream_fingerprint)
+        try:
+            pending = resume(subscription) if resume else b""
+            if pending:
+                try:
+                    self.wfile.write(pending)
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+            while True:
+                frame = subscription.next_frame(timeout=max(15.0, poll * 2))
+                if frame is not None and render is not None:
+                    frame = render(frame)
+                    if frame is None:
+                        continue
+                if frame is None:
+                    # Comment frames keep proxies from timing out and surface disconnects.
+                    frame = b": keepalive\n\n"
+                try:
+                    self.wfile.write(frame)
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    break
+        finally:
+            self.broadcaster.unsubscribe(subscription)
 
-    def _read_json_body(self) -> dict[str, Any]:
+    def _read_json_body(self, max_bytes: int = 1024 * 1024) -> dict[str, Any]:
         raw_len = safe_int(self.headers.get("Content-Length"), 0)
         if raw_len <= 0:
             return {}
-        raw_len = min(raw_len, 1024 * 1024)
+        raw_len = min(raw_len, max_bytes)
         body = self.rfile.read(raw_len).decode("utf-8", errors="replace")
         if not body.strip():
             return {}
@@ -4010,10 +7857,25 @@ class APIHandler(SimpleHTTPRequestHandler):
             return payload
         return {}
 
-    def _attach_runtime_payload(self, payload: dict[str, Any], send_notifications: bool) -> dict[str, Any]:
-        control_status = self.controller.status_payload(payload.get("latest_run"))
+    def _submit_control_job(
+        self, parsed: Any, request: dict[str, Any], kind: str, fn: Callable[[Callable[..., None]], dict[str, Any]]
+    ) -> bool:
+        """Queue fn as a control job and answer 202 when the caller asked for async (body or ?async=1)."""
+        flag = request.get("async", parse_qs(parsed.query).get("async", [""])[0])
+        if not self.controller._to_bool(flag):
+            return False
+        job = self.controller.jobs.submit(kind, fn)
+        self._send_json({"ok": True, "async": True, "job": job, "job_url": f"/api/v1/jobs/{job['id']}"}, status=202)
+        return True
+
+    @classmethod
+    def _attach_runtime_payload(cls, payload: dict[str, Any], send_notifications: bool) -> dict[str, Any]:
+        control_status = cls.controller.status_payload(payload.get("latest_run"))
         payload["control_status"] = control_status
-        payload["task_queue"] = self.task_queue.summary(limit=12)
+        payload["control_jobs"] = cls.controller.jobs.recent(limit=10)
+        if cls.resource_sampler is not None:
+            payload["resources"] = cls.resource_sampler.run_resources(str(control_status.get("run_id") or ""), limit=0)
+        payload["task_queue"] = cls.task_queue.summary(limit=12)
         alerts = list(payload.get("alerts") or [])
 
         if bool(control_status.get("multiple_loops_detected")):
@@ -4033,7 +7895,7 @@ class APIHandler(SimpleHTTPRequestHandler):
 
         payload["alerts"] = alerts
         if send_notifications:
-            delivery = self.notifier.process_alerts(
+            delivery = cls.notifier.process_alerts(
                 alerts=alerts,
                 context={
                     "latest_run": payload.get("latest_run"),
@@ -4041,44 +7903,39 @@ class APIHandler(SimpleHTTPRequestHandler):
                 },
             )
             payload["notification_delivery"] = delivery
-        payload["notification_status"] = self.notifier.status_payload()
+        payload["notification_status"] = cls.notifier.status_payload()
         if send_notifications:
-            payload["agent_tick"] = self.agent.tick(payload)
-        payload["agent_status"] = self.agent.status_payload(payload)
+            # Stream producers must not block on restarts: executable steps go to the job worker.
+            payload["agent_tick"] = cls.agent.tick(payload, background=True)
+        payload["agent_status"] = cls.agent.status_payload(payload)
         return payload
 
     def _send_sse(self, parsed_query: dict[str, list[str]]) -> None:
         poll = float(parsed_query.get("poll", ["5"])[0])
         poll = max(1.0, min(poll, 60.0))
-        commit_hours = safe_int(parsed_query.get("commit_hours", ["2"])[0], 2)
-        alert_stall_minutes = safe_int(parsed_query.get("alert_stall_minutes", ["15"])[0], 15)
-        alert_no_commit_minutes = safe_int(parsed_query.get("alert_no_commit_minutes", ["60"])[0], 60)
-        alert_lock_skip_threshold = safe_int(parsed_query.get("alert_lock_skip_threshold", ["25"])[0], 25)
-
-        self.send_response(200)
-        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
-        self.send_header("Cache-Control", "no-cache")
-        self.send_header("Connection", "keep-alive")
-        self.end_headers()
-
-        while True:
-            payload = self.monitor.snapshot(
-                history_limit=25,
-                commit_hours=commit_hours,
-                commit_limit=150,
-                event_limit=220,
-                alert_stall_minutes=alert_stall_minutes,
-                alert_no_commit_minutes=alert_no_commit_minutes,
-                alert_lock_skip_threshold=alert_lock_skip_threshold,
-            )
-            payload = self._attach_runtime_payload(payload, send_notifications=True)
-            frame = f"data: {json.dumps(payload, separators=(',', ':'))}\n\n".encode("utf-8")
-            try:
-                self.wfile.write(frame)
-                self.wfile.flush()
-            except (BrokenPipeError, ConnectionResetError):
-                break
-            time.sleep(poll)
+        params = (
+            safe_int(parsed_query.get("commit_hours", ["2"])[0], 2),
+            safe_int(parsed_query.get("alert_stall_minutes", ["15"])[0], 15),
+            safe_int(parsed_query.get("alert_no_commit_minutes", ["60"])[0], 60),
+            safe_int(parsed_query.get("alert_lock_skip_threshold", ["25"])[0], 25),
+        )
+        build = functools.partial(type(self)._build_sse_frame, params)
+        self._stream_frames(("legacy", poll, params), poll, build, fingerprint=type(self)._legacy_stream_fingerprint)
+
+    @classmethod
+    def _build_sse_frame(cls, params: tuple[int, int, int, int], _sequence: int) -> bytes:
+        commit_hours, alert_stall_minutes, alert_no_commit_minutes, alert_lock_skip_threshold = params
+        payload = cls.monitor.snapshot(
+            history_limit=25,
+            commit_hours=commit_hours,
+            commit_limit=150,
+            event_limit=220,
+            alert_stall_minutes=alert_stall_minutes,
+            alert_no_commit_minutes=alert_no_commit_minutes,
+            alert_lock_skip_threshold=alert_lock_skip_threshold,
+        )
+        payload = cls._attach_runtime_payload(payload, send_notifications=True)
+        return f"data: {json.dumps(payload, separators=(',', ':'))}\n\n".encode("utf-8")
 
     def do_GET(self) -> None:  # noqa: N802
         parsed = urlparse(self.path)
@@ -4114,12 +7971,26 @@ class APIHandler(SimpleHTTPRequestHandler):
             self._send_json(self._v1_runs_payload(query))
             return
 
+        if normalized_path == "/api/v1/capacity/recommendation":
+            self._send_json(self.capacity_advisor.recommendation())
+            return
+
         if normalized_path == "/api/v1/runs/active":
             self._send_json(self._v1_active_run_payload())
             return
 
         if normalized_path.startswith("/api/v1/runs/"):
             segments = [segment for segment in normalized_path.split("/") if segment]
+            if len(segments) == 5 and segments[4] == "resources":
+                run_id = segments[3].strip()
+                limit = max(0, min(safe_int(query.get("limit", ["120"])[0], 120), RESOURCE_SAMPLES_PER_WORKER))
+                if self.resource_sampler is None:
+                    self._send_json({"run_id": run_id, "available": False, "sampled": False, "workers": [], "repos": []})
+                    return
+                payload = self.resource_sampler.run_resources(run_id, limit=limit)
+                payload["generated_at"] = iso_utc(utc_now())
+                self._send_json(payload)
+                return
             if len(segments) == 4:
                 run_id = segments[3].strip()
                 if not run_id:
@@ -4140,10 +8011,28 @@ class APIHandler(SimpleHTTPRequestHandler):
                 self._send_json(payload)
                 return
 
+        if normalized_path == "/api/v1/jobs":
+            limit = max(1, min(safe_int(query.get("limit", ["20"])[0], 20), CONTROL_JOBS_KEEP))
+            self._send_json({"generated_at": iso_utc(utc_now()), "jobs": self.controller.jobs.recent(limit=limit)})
+            return
+
+        if normalized_path.startswith("/api/v1/jobs/"):
+            job_id = normalized_path[len("/api/v1/jobs/") :].strip()
+            job = self.controller.jobs.get(job_id)
+            if job is None:
+                self._send_json({"error": f"job not found: {job_id}"}, status=404)
+                return
+            self._send_json(job)
+            return
+
         if normalized_path == "/api/v1/tasks":
             self._send_json(self._v1_tasks_payload(query))
             return
 
+        if normalized_path == "/api/v1/tasks/stream":
+            self._send_tasks_sse(query)
+            return
+
         if normalized_path == "/api/v1/stream":
             self._send_v1_sse(query)
             return
@@ -4355,10 +8244,35 @@ class APIHandler(SimpleHTTPRequestHandler):
                 return
         self._send_json({"error": "not found"}, status=404)
 
+    def _handle_task_bulk(self, parsed_path: str, request: dict[str, Any]) -> None:
+        adding = parsed_path in {"/api/v1/tasks/bulk", "/api/task_queue/add_bulk"}
+        key = "tasks" if adding else "updates"
+        items = request.get(key)
+        if not isinstance(items, list) or not items:
+            self._send_json({"ok": False, "error": f"{key} must be a non-empty array"}, status=400)
+            return
+        if len(items) > TASK_BULK_MAX_ITEMS:
+            self._send_json({"ok": False, "error": f"at most {TASK_BULK_MAX_ITEMS} {key} per request"}, status=400)
+            return
+        atomic = to_bool(request.get("atomic"))
+        if adding:
+            default_source = "api_v1" if parsed_path.startswith("/api/v1/") else "control_plane"
+            payload = self.task_queue.add_tasks(items, atomic=atomic, source=default_source)
+        else:
+            payload = self.task_queue.update_tasks(items, atomic=atomic)
+        payload["ok"] = payload["failed"] == 0
+        payload["summary"] = self.task_queue.summary(limit=20)
+        payload["generated_at"] = iso_utc(utc_now())
+        self._send_json(payload, status=200 if payload["committed"] and len(items) > payload["failed"] else 400)
+
     def do_POST(self) -> None:  # noqa: N802
         parsed = urlparse(self.path)
         parsed_path = parsed.path if parsed.path == "/" else parsed.path.rstrip("/")
-        request = self._read_json_body()
+        request = self._read_json_body(TASK_BULK_MAX_BODY_BYTES if parsed_path in TASK_BULK_PATHS else 1024 * 1024)
+
+        if parsed_path in TASK_BULK_PATHS:
+            self._handle_task_bulk(parsed_path, request)
+            return
 
         if parsed_path == "/api/v1/runs":
             payload = self.controller.start_run(request)
@@ -4386,29 +8300,33 @@ class APIHandler(SimpleHTTPRequestHandler):
             if len(segments) == 5:
                 run_id = segments[3].strip()
                 action = segments[4].strip().lower()
-                if action == "stop":
-                    payload = self.controller.stop_run({"force": False, "wait_seconds": request.get("wait_seconds", 12)})
-                    if not payload.get("ok") and str(payload.get("error") or "").startswith("no active run loop process found"):
-                        payload = {
-                            "ok": True,
-                            "already_stopped": True,
-                            "run_id": run_id,
-                            "control_status": self.controller.status_payload(),
-                        }
-                    self._send_json(payload, status=200 if payload.get("ok") else 409)
-                    return
-                if action == "force-stop":
-                    payload = self.controller.stop_run({"force": True, "wait_seconds": request.get("wait_seconds", 20)})
-                    if not payload.get("ok") and str(payload.get("error") or "").startswith("no active run loop process found"):
-                        payload = {
-                            "ok": True,
-                            "already_stopped": True,
-                            "run_id": run_id,
-                            "control_status": self.controller.status_payload(),
-                        }
+                if action in {"stop", "force-stop"}:
+                    force = action == "force-stop"
+
+                    def stop(progress: Callable[..., None] | None = None) -> dict[str, Any]:
+                        payload = self.controller.stop_run(
+                            {"force": force, "wait_seconds": request.get("wait_seconds", 20 if force else 12)},
+                            progress=progress,
+                        )
+                        if not payload.get("ok") and str(payload.get("error") or "").startswith("no active run loop process found"):
+                            payload = {
+                                "ok": True,
+                                "already_stopped": True,
+                                "run_id": run_id,
+                                "control_status": self.controller.status_payload(),
+                            }
+                        return payload
+
+                    if self._submit_control_job(parsed, request, f"run_{action.replace('-', '_')}", stop):
+                        return
+                    payload = stop()
                     self._send_json(payload, status=200 if payload.get("ok") else 409)
                     return
                 if action == "restart":
+                    if self._submit_control_job(
+                        parsed, request, "run_restart", lambda progress: self.controller.restart_run(request, progress=progress)
+                    ):
+                        return
                     payload = self.controller.restart_run(request)
                     self._send_json(payload, status=200 if payload.get("ok") else 409)
                     return
@@ -4435,6 +8353,48 @@ class APIHandler(SimpleHTTPRequestHandler):
             self._send_json({"ok": True, "item": task, "summary": self.task_queue.summary(limit=20)}, status=201)
             return
 
+        if parsed_path == "/api/v1/tasks/claim":
+            payload = self.task_queue.claim(
+                repo=str(request.get("repo") or ""),
+                repo_path=str(request.get("repo_path") or ""),
+                limit=safe_int(request.get("limit"), 1),
+                lease_seconds=safe_int(request.get("lease_seconds"), TASK_LEASE_DEFAULT_SECONDS),
+                run_id=str(request.get("run_id") or ""),
+                pass_label=str(request.get("pass") or ""),
+                owner=str(request.get("owner") or ""),
+            )
+            payload["ok"] = True
+            payload["generated_at"] = iso_utc(utc_now())
+            self._send_json(payload, status=200)
+            return
+
+        if parsed_path == "/api/v1/tasks/archive":
+            older_than = request.get("older_than_days")
+            payload = self.task_queue.archive_finished(
+                None if older_than is None else max(0, safe_int(older_than, 0)) * 86400
+            )
+            payload["ok"] = True
+            payload["generated_at"] = iso_utc(utc_now())
+            self._send_json(payload, status=200)
+            return
+
+        if parsed_path == "/api/v1/tasks/heartbeat":
+            raw_ids = request.get("ids")
+            if not isinstance(raw_ids, list):
+                raw_ids = [request.get("id")] if request.get("id") else []
+            if not raw_ids:
+                self._send_json({"ok": False, "error": "ids is required"}, status=400)
+                return
+            payload = self.task_queue.heartbeat(
+                [str(task_id or "") for task_id in raw_ids],
+                lease_seconds=safe_int(request.get("lease_seconds"), TASK_LEASE_DEFAULT_SECONDS),
+                run_id=str(request.get("run_id") or ""),
+            )
+            payload["ok"] = not payload["missing"]
+            payload["generated_at"] = iso_utc(utc_now())
+            self._send_json(payload, status=200 if payload["renewed"] or not payload["missing"] else 409)
+            return
+
         if parsed_path == "/api/v1/presets":
             try:
                 preset = self.preset_store.upsert_preset(request)
@@ -4455,22 +8415,40 @@ class APIHandler(SimpleHTTPRequestHandler):
                 self._send_json({"ok": True, "deleted_id": preset_id, "generated_at": iso_utc(utc_now())}, status=200)
                 return
 
+        if parsed_path in {"/api/v1/repos/local/refresh", "/api/local_repos/refresh"}:
+            payload = self.controller.refresh_local_repos(request)
+            payload["generated_at"] = iso_utc(utc_now())
+            self._send_json(payload, status=200 if payload.get("ok") else 400)
+            return
+
         if parsed_path == "/api/control/start":
             payload = self.controller.start_run(request)
             self._send_json(payload, status=200 if payload.get("ok") else 409)
             return
 
         if parsed_path == "/api/control/stop":
+            if self._submit_control_job(
+                parsed, request, "control_stop", lambda progress: self.controller.stop_run(request, progress=progress)
+            ):
+                return
             payload = self.controller.stop_run(request)
             self._send_json(payload, status=200 if payload.get("ok") else 409)
             return
 
         if parsed_path == "/api/control/restart":
+            if self._submit_control_job(
+                parsed, request, "control_restart", lambda progress: self.controller.restart_run(request, progress=progress)
+            ):
+                return
             payload = self.controller.restart_run(request)
             self._send_json(payload, status=200 if payload.get("ok") else 409)
             return
 
         if parsed_path == "/api/control/normalize":
+            if self._submit_control_job(
+                parsed, request, "control_normalize", lambda progress: self.controller.normalize_loops(request, progress=progress)
+            ):
+                return
             payload = self.controller.normalize_loops(request)
             self._send_json(payload, status=200 if payload.get("ok") else 409)
             return
@@ -4546,55 +8524,38 @@ class APIHandler(SimpleHTTPRequestHandler):
             self._send_json({"ok": True, "config": updated, "status": self.agent.status_payload()})
             return
 
-        if parsed_path == "/api/agent/run_next":
-            snapshot = self.monitor.snapshot(
-                history_limit=25,
-                commit_hours=2,
-                commit_limit=180,
-                event_limit=240,
-                alert_stall_minutes=safe_int(request.get("alert_stall_minutes"), 15),
-                alert_no_commit_minutes=safe_int(request.get("alert_no_commit_minutes"), 60),
-                alert_lock_skip_threshold=safe_int(request.get("alert_lock_skip_threshold"), 25),
-            )
-            snapshot = self._attach_runtime_payload(snapshot, send_notifications=False)
-            payload = self.agent.run_next(snapshot=snapshot, source=str(request.get("source") or "manual"))
-            payload["agent_status"] = self.agent.status_payload(snapshot)
-            self._send_json(payload, status=200 if payload.get("ok") else 409)
-            return
-
-        if parsed_path == "/api/agent/run_plan":
-            snapshot = self.monitor.snapshot(
-                history_limit=25,
-                commit_hours=2,
-                commit_limit=180,
-                event_limit=240,
-                alert_stall_minutes=safe_int(request.get("alert_stall_minutes"), 15),
-                alert_no_commit_minutes=safe_int(request.get("alert_no_commit_minutes"), 60),
-                alert_lock_skip_threshold=safe_int(request.get("alert_lock_skip_threshold"), 25),
-            )
-            snapshot = self._attach_runtime_payload(snapshot, send_notifications=False)
-            payload = self.agent.run_plan(
-                snapshot=snapshot,
-                source=str(request.get("source") or "manual"),
-                max_steps=safe_int(request.get("max_steps"), 2),
-            )
-            payload["agent_status"] = self.agent.status_payload(snapshot)
-            self._send_json(payload, status=200 if payload.get("ok") else 409)
-            return
+        if parsed_path in {"/api/agent/run_next", "/api/agent/run_plan", "/api/agent/tick"}:
+            agent_action = parsed_path.rsplit("/", 1)[-1]
+
+            def run_agent(progress: Callable[..., None] | None = None) -> dict[str, Any]:
+                snapshot = self.monitor.snapshot(
+                    history_limit=25,
+                    commit_hours=2,
+                    commit_limit=180,
+                    event_limit=240,
+                    alert_stall_minutes=safe_int(request.get("alert_stall_minutes"), 15),
+                    alert_no_commit_minutes=safe_int(request.get("alert_no_commit_minutes"), 60),
+                    alert_lock_skip_threshold=safe_int(request.get("alert_lock_skip_threshold"), 25),
+                )
+                snapshot = self._attach_runtime_payload(snapshot, send_notifications=False)
+                source = str(request.get("source") or "manual")
+                if agent_action == "run_next":
+                    payload = self.agent.run_next(snapshot=snapshot, source=source, progress=progress)
+                elif agent_action == "run_plan":
+                    payload = self.agent.run_plan(
+                        snapshot=snapshot,
+                        source=source,
+                        max_steps=safe_int(request.get("max_steps"), 2),
+                        progress=progress,
+                    )
+                else:
+                    payload = self.agent.tick(snapshot, progress=progress)
+                payload["agent_status"] = self.agent.status_payload(snapshot)
+                return payload
 
-        if parsed_path == "/api/agent/tick":
-            snapshot = self.monitor.snapshot(
-                history_limit=25,
-                commit_hours=2,
-                commit_limit=180,
-                event_limit=240,
-                alert_stall_minutes=safe_int(request.get("alert_stall_minutes"), 15),
-                alert_no_commit_minutes=safe_int(request.get("alert_no_commit_minutes"), 60),
-                alert_lock_skip_threshold=safe_int(request.get("alert_lock_skip_threshold"), 25),
-            )
-            snapshot = self._attach_runtime_payload(snapshot, send_notifications=False)
-            payload = self.agent.tick(snapshot)
-            payload["agent_status"] = self.agent.status_payload(snapshot)
+            if self._submit_control_job(parsed, request, f"agent_{agent_action}", run_agent):
+                return
+            payload = run_agent()
             self._send_json(payload, status=200 if payload.get("ok") else 409)
             return
 
@@ -4620,6 +8581,10 @@ def make_handler(
     BoundHandler.agent = agent
     BoundHandler.task_queue = task_queue
     BoundHandler.preset_store = preset_store
+    BoundHandler.broadcaster = SnapshotBroadcaster()
+    BoundHandler.capacity_advisor = CapacityAdvisor(monitor, controller)
+    task_queue.add_listener(lambda _version: BoundHandler.broadcaster.wake("tasks"))
+    controller.jobs.on_change = lambda: (BoundHandler.broadcaster.wake("v1"), BoundHandler.broadcaster.wake("legacy"))
     BoundHandler.static_dir = static_dir
     BoundHandler.launch_info = dict(launch_info or {})
     return BoundHandler
@@ -4650,6 +8615,18 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=os.environ.get("TASK_QUEUE_FILE", "logs/task_queue.json"),
         help="Task queue file path (absolute or relative to clone root)",
     )
+    parser.add_argument(
+        "--task-archive-days",
+        type=int,
+        default=safe_int(os.environ.get("CLONE_TASK_ARCHIVE_DAYS"), TASK_ARCHIVE_DEFAULT_DAYS),
+        help="Archive DONE/CANCELED tasks finished more than this many days ago (0 disables)",
+    )
+    parser.add_argument(
+        "--resource-sample-seconds",
+        type=float,
+        default=safe_float(os.environ.get("CLONE_RESOURCE_SAMPLE_SECONDS"), RESOURCE_SAMPLE_SECONDS),
+        help="Seconds between worker CPU/RSS/I/O samples (0 disables)",
+    )
     return parser
 
 
@@ -4681,8 +8658,15 @@ def main() -> int:
     controller = RunController(clone_root=clone_root, logs_dir=logs_dir, monitor=monitor)
     notifier = NotificationManager(logs_dir=logs_dir)
     agent = AgentManager(logs_dir=logs_dir, controller=controller)
-    task_queue = TaskQueueStore(queue_file=task_queue_file)
+    task_queue = TaskQueueStore(
+        queue_file=task_queue_file, archive_after_seconds=max(0, args.task_archive_days) * 86400
+    )
     preset_store = LaunchPresetStore(preset_file=logs_dir / "launch-presets.json")
+    claim_host = "127.0.0.1" if args.host in {"", "0.0.0.0", "::"} else str(args.host)
+    if ":" in claim_host:
+        claim_host = f"[{claim_host}]"
+    controller.task_queue_file = task_queue_file
+    controller.task_claim_url = f"http://{claim_host}:{args.port}/api/v1/tasks/claim"
     launch_info = {
         "started_at": iso_utc(utc_now()),
         "host": str(args.host),
@@ -4691,6 +8675,15 @@ def main() -> int:
         "pid_file": str(logs_dir / f"control-plane-ui-{args.port}.pid"),
     }
     handler = make_handler(monitor, controller, notifier, agent, task_queue, preset_store, static_dir, launch_info=launch_info)
+    handler.watcher = start_change_watcher(
+        monitor,
+        task_queue,
+        handler.broadcaster,
+        extra_files=[controller.managed_state_path, notifier.config_path, agent.config_path],
+    )
+    handler.resource_sampler = ResourceSampler(controller, interval_seconds=max(0.0, args.resource_sample_seconds))
+    handler.resource_sampler.start()
+    handler.capacity_advisor.sampler = handler.resource_sampler
 
     server = ThreadingHTTPServer((args.host, args.port), handler)
     print(f"Clone Control Plane listening on http://{args.host}:{args.port}")
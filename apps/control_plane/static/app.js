@@ -86,6 +86,8 @@ const elements = {
   startRunCancelBtn: document.getElementById("startRunCancelBtn"),
   startRunConfirmBtn: document.getElementById("startRunConfirmBtn"),
   startRunParallelRepos: document.getElementById("startRunParallelRepos"),
+  startRunCapacityHint: document.getElementById("startRunCapacityHint"),
+  startRunCapacityApplyBtn: document.getElementById("startRunCapacityApplyBtn"),
   startRunMaxCycles: document.getElementById("startRunMaxCycles"),
   startRunTasksPerRepo: document.getElementById("startRunTasksPerRepo"),
   startRunMaxCyclesPerRepo: document.getElementById("startRunMaxCyclesPerRepo"),
@@ -4753,6 +4755,27 @@ async function loadStartRunPrefsFromServer(force = false) {
   }
 }
 
+async function loadStartRunCapacityHint() {
+  elements.startRunCapacityHint.textContent = "";
+  elements.startRunCapacityApplyBtn.classList.add("hidden");
+  try {
+    const response = await fetch("/api/v1/capacity/recommendation");
+    if (!response.ok) return;
+    const payload = await response.json();
+    const recommended = clampInt(payload?.recommended_parallel_repos, 0, 0, 64);
+    if (!recommended) return;
+    const reasons = Array.isArray(payload?.reasons) ? payload.reasons : [];
+    elements.startRunCapacityHint.textContent = `Suggested parallel: ${recommended} (${payload.confidence || "low"} confidence, ${clampInt(payload.runs_considered, 0, 0, 100000)} runs). ${reasons.join(" ")}`;
+    elements.startRunCapacityApplyBtn.dataset.value = String(recommended);
+    elements.startRunCapacityApplyBtn.classList.toggle(
+      "hidden",
+      clampInt(elements.startRunParallelRepos.value, 5, 1, 64) === recommended,
+    );
+  } catch {
+    // The launcher works without a suggestion.
+  }
+}
+
 async function saveStartRunPrefsToServer(payload) {
   if (!payload || typeof payload !== "object") return;
   try {
@@ -5606,6 +5629,7 @@ async function openStartRunModal(action = "start") {
   elements.startRunMaxCommitsPerRepo.value = "0";
   setStartRunMode("auto");
   applyStartRunPrefsInputs(savedPrefs);
+  loadStartRunCapacityHint();
   state.startRunSearch = "";
   state.githubSearch = "";
   elements.startRunSearch.value = "";
@@ -6718,6 +6742,11 @@ if (elements.launchDiagRefreshBtn) {
   });
 }
 
+elements.startRunCapacityApplyBtn.addEventListener("click", () => {
+  elements.startRunParallelRepos.value = String(clampInt(elements.startRunCapacityApplyBtn.dataset.value, 5, 1, 64));
+  elements.startRunCapacityApplyBtn.classList.add("hidden");
+});
+
 elements.startRunCloseBtn.addEventListener("click", () => {
   closeStartRunModal();
 });
@@ -82,6 +82,7 @@ type StreamEnvelope = {
   type: string;
   ts: string;
   cursor: string;
+  base_cursor?: string;
   payload: Record<string, unknown>;
 };
 
@@ -83,6 +83,12 @@ fi
 
 mkdir -p "$(dirname "$TASK_QUEUE_FILE")"
 
+# Hold the queue lock until exit; the control plane and run loop take it around their writes.
+if command -v flock >/dev/null 2>&1; then
+  exec 9>>"${TASK_QUEUE_FILE}.lock"
+  flock -x 9
+fi
+
 if [[ ! -f "$TASK_QUEUE_FILE" ]]; then
   cat >"$TASK_QUEUE_FILE" <<EOF
 {
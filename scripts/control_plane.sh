@@ -426,6 +426,14 @@ cleanup_artifacts() {
     removed=$((removed + 1))
   done < <(find "$LOGS_DIR" -maxdepth 1 -type f -name "*.tmp" -mtime +"$CLEANUP_STALE_DAYS" 2>/dev/null || true)
 
+  while IFS= read -r path; do
+    [[ -n "$path" ]] || continue
+    [[ -f "${path%-summary.json}-status.txt" ]] && continue
+    rm -f "$path"
+    echo "Removed orphaned run summary: $path"
+    removed=$((removed + 1))
+  done < <(find "$LOGS_DIR" -maxdepth 1 -type f -name "run-*-summary.json" 2>/dev/null || true)
+
   for pattern in "run-*-workers" "run-*-repo-locks" "run-*-repo-progress"; do
     while IFS= read -r path; do
       [[ -n "$path" ]] || continue
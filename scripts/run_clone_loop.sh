@@ -54,6 +54,7 @@ TASK_QUEUE_FILE="${TASK_QUEUE_FILE:-logs/task_queue.json}"
 TASK_QUEUE_MAX_ITEMS_PER_REPO="${TASK_QUEUE_MAX_ITEMS_PER_REPO:-5}"
 TASK_QUEUE_AUTO_CREATE="${TASK_QUEUE_AUTO_CREATE:-1}"
 TASK_QUEUE_CLAIM_TTL_MINUTES="${TASK_QUEUE_CLAIM_TTL_MINUTES:-240}"
+TASK_QUEUE_CLAIM_URL="${TASK_QUEUE_CLAIM_URL:-}"
 SPARK_MAX_CLAIM_TASKS="${SPARK_MAX_CLAIM_TASKS:-3}"
 SPARK_MAX_TOUCHED_FILES="${SPARK_MAX_TOUCHED_FILES:-4}"
 SPARK_MAX_LINE_DELTA="${SPARK_MAX_LINE_DELTA:-240}"
@@ -733,6 +734,7 @@ log_event INFO "Task queue file: $TASK_QUEUE_FILE"
 log_event INFO "Task queue max items per repo: $TASK_QUEUE_MAX_ITEMS_PER_REPO"
 log_event INFO "Task queue auto create: $TASK_QUEUE_AUTO_CREATE"
 log_event INFO "Task queue claim TTL minutes: $TASK_QUEUE_CLAIM_TTL_MINUTES"
+log_event INFO "Task queue claim URL: ${TASK_QUEUE_CLAIM_URL:-<file>}"
 log_event INFO "Queue preemption enabled: $QUEUE_PREEMPT_ENABLED"
 log_event INFO "Queue preemption poll seconds: $QUEUE_PREEMPT_POLL_SECONDS"
 log_event INFO "Queue preemption interrupt return code: $QUEUE_PREEMPT_INTERRUPT_RC"
@@ -919,6 +921,22 @@ EOF
   state_db_sync_task_queue_snapshot
 }
 
+# Every read-modify-mv of the queue file runs under an flock on "$TASK_QUEUE_FILE.lock";
+# the control plane holds the same lock from re-import to export.
+with_task_queue_lock() {
+  local status=0
+  if ! command -v flock >/dev/null 2>&1; then
+    "$@" || status=$?
+    return "$status"
+  fi
+  mkdir -p "$(dirname "$TASK_QUEUE_FILE")"
+  exec 9>>"${TASK_QUEUE_FILE}.lock"
+  flock -x 9
+  "$@" || status=$?
+  exec 9>&-
+  return "$status"
+}
+
 queue_lines_to_json_array() {
   local raw="${1:-}"
   printf '%s\n' "$raw" | sed '/^[[:space:]]*$/d' | jq -R -s -c 'split("\n") | map(select(length > 0))'
@@ -1054,6 +1072,10 @@ evaluate_queue_route_for_spark() {
 }
 
 annotate_claimed_task_route() {
+  with_task_queue_lock annotate_claimed_task_route_unlocked "$@"
+}
+
+annotate_claimed_task_route_unlocked() {
   local repo_name="$1"
   local pass_label="$2"
   local route_model="$3"
@@ -1111,6 +1133,10 @@ annotate_claimed_task_route() {
 }
 
 requeue_stale_claimed_tasks() {
+  with_task_queue_lock requeue_stale_claimed_tasks_unlocked "$@"
+}
+
+requeue_stale_claimed_tasks_unlocked() {
   local stale_before_epoch stale_count tmp now
   ensure_task_queue_file
   if [[ ! -f "$TASK_QUEUE_FILE" ]]; then
@@ -1162,14 +1188,61 @@ requeue_stale_claimed_tasks() {
   log_event INFO "TASK_QUEUE stale_claims_requeued=$stale_count file=$TASK_QUEUE_FILE"
 }
 
+claim_queue_tasks_via_control_plane() {
+  local repo_name="$1"
+  local repo_path="$2"
+  local pass_label="$3"
+  local body
+
+  body="$(
+    jq -cn \
+      --arg repo "$repo_name" \
+      --arg repo_path "$repo_path" \
+      --arg run_id "$RUN_ID" \
+      --arg pass "$pass_label" \
+      --argjson limit "$TASK_QUEUE_MAX_ITEMS_PER_REPO" \
+      --argjson lease_seconds "$(( TASK_QUEUE_CLAIM_TTL_MINUTES * 60 ))" \
+      '{repo: $repo, repo_path: $repo_path, run_id: $run_id, pass: $pass, limit: $limit, lease_seconds: $lease_seconds}'
+  )"
+  curl -fsS --max-time 10 -X POST -H "Content-Type: application/json" --data "$body" "$TASK_QUEUE_CLAIM_URL" 2>/dev/null \
+    | jq -ce 'select(.ok == true) | (.items // [])' 2>/dev/null
+}
+
 claim_queue_tasks_for_repo() {
   local repo_name="$1"
   local repo_path="$2"
   local pass_label="$3"
-  local claim_json claim_ids_json claim_count tmp now
+  local claim_json claim_count
 
   LAST_CLAIMED_TASKS_JSON="[]"
   LAST_CLAIMED_TASKS_COUNT=0
+
+  # The control plane claims atomically under a lease; fall back to editing the file.
+  if [[ -n "$TASK_QUEUE_CLAIM_URL" ]] \
+    && claim_json="$(claim_queue_tasks_via_control_plane "$repo_name" "$repo_path" "$pass_label")" \
+    && [[ -n "$claim_json" ]]; then
+    claim_count="$(jq -r 'length' <<<"$claim_json" 2>/dev/null || echo 0)"
+    if [[ "$claim_count" =~ ^[0-9]+$ ]] && (( claim_count > 0 )); then
+      state_db_sync_task_queue_snapshot
+      LAST_CLAIMED_TASKS_JSON="$claim_json"
+      LAST_CLAIMED_TASKS_COUNT="$claim_count"
+      jq -r '
+        .[]
+        | "- [\(.id)] P\(.priority // 3) \(.title // .task // "Untitled task")\n  Details: \((.details // .description // "No details provided.") | tostring | gsub("[\r\n]+"; " "))"
+      ' <<<"$claim_json"
+    fi
+    return 0
+  fi
+
+  with_task_queue_lock claim_queue_tasks_from_file_unlocked "$repo_name" "$repo_path" "$pass_label"
+}
+
+claim_queue_tasks_from_file_unlocked() {
+  local repo_name="$1"
+  local repo_path="$2"
+  local pass_label="$3"
+  local claim_json claim_ids_json claim_count tmp now
+
   ensure_task_queue_file
   if [[ ! -f "$TASK_QUEUE_FILE" ]]; then
     return 0
@@ -1244,6 +1317,10 @@ claim_queue_tasks_for_repo() {
 }
 
 finalize_queue_tasks_for_repo() {
+  with_task_queue_lock finalize_queue_tasks_for_repo_unlocked "$@"
+}
+
+finalize_queue_tasks_for_repo_unlocked() {
   local pass_label="$1"
   local last_message_file="$2"
   local done_ids_lines blocked_ids_lines done_ids_json blocked_ids_json